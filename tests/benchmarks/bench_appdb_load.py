@@ -0,0 +1,154 @@
+"""Benchmark loading a generated database of 1,000 devices and 60,000 attributes.
+
+Cached attributes are loaded both by `PersistingListener.load`, which groups the rows
+by cluster in the database thread, and by the previous row by row approach.
+Run with `python -m tests.benchmarks.bench_appdb_load`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+import pathlib
+import sqlite3
+import tempfile
+import time
+
+import zigpy.appdb
+import zigpy.appdb_schemas
+import zigpy.device
+import zigpy.endpoint
+from zigpy.profiles import zha
+from zigpy.zcl import ClusterType
+
+from tests.conftest import make_app
+
+NUM_DEVICES = 1_000
+CLUSTERS = (0x0000, 0x0006, 0x0008, 0x0702, 0x0B04)
+ATTRIBUTES_PER_CLUSTER = 12
+DB_V = zigpy.appdb.DB_V
+
+
+def make_database(path: pathlib.Path) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript(zigpy.appdb_schemas.SCHEMAS[zigpy.appdb.DB_VERSION])
+    now = time.time()
+
+    devices = []
+    endpoints = []
+    clusters = []
+    attributes = []
+
+    for i in range(NUM_DEVICES):
+        ieee = ":".join(f"{b:02x}" for b in i.to_bytes(8, "big"))
+        devices.append((ieee, i + 1, zigpy.device.Status.ENDPOINTS_INIT, now))
+        endpoints.append(
+            (
+                ieee,
+                1,
+                zha.PROFILE_ID,
+                zha.DeviceType.SMART_PLUG,
+                zigpy.endpoint.Status.ZDO_INIT,
+            )
+        )
+
+        for cluster_id in CLUSTERS:
+            clusters.append((ieee, 1, ClusterType.Server, cluster_id))
+
+            for attr_id in range(ATTRIBUTES_PER_CLUSTER):
+                value = f"Device {i}" if cluster_id == 0x0000 else attr_id * i
+                attributes.append(
+                    (ieee, 1, ClusterType.Server, cluster_id, attr_id, value, now)
+                )
+
+    conn.executemany(f"INSERT INTO devices{DB_V} VALUES (?, ?, ?, ?)", devices)
+    conn.executemany(f"INSERT INTO endpoints{DB_V} VALUES (?, ?, ?, ?, ?)", endpoints)
+    conn.executemany(f"INSERT INTO clusters{DB_V} VALUES (?, ?, ?, ?)", clusters)
+    conn.executemany(
+        f"INSERT INTO attributes_cache{DB_V} VALUES (?, ?, ?, ?, ?, ?, ?)", attributes
+    )
+    conn.commit()
+    conn.close()
+
+
+async def load_attributes_per_row(listener: zigpy.appdb.PersistingListener) -> None:
+    async with listener.execute(f"SELECT * FROM attributes_cache{DB_V}") as cursor:
+        async for (
+            ieee,
+            endpoint_id,
+            cluster_type,
+            cluster_id,
+            attr_id,
+            value,
+            last_updated,
+        ) in cursor:
+            dev = listener._application.get_device(ieee)
+
+            if endpoint_id not in dev.endpoints:
+                continue
+
+            ep = dev.endpoints[endpoint_id]
+            clusters = (
+                ep.in_clusters
+                if cluster_type == ClusterType.Server
+                else ep.out_clusters
+            )
+
+            if cluster_id not in clusters:
+                continue
+
+            clusters[cluster_id]._attr_cache[attr_id] = value
+            clusters[cluster_id]._attr_last_updated[attr_id] = datetime.fromtimestamp(
+                last_updated, timezone.utc
+            )
+
+            zigpy.appdb.LOGGER.debug(
+                "[0x%04x:%s:0x%04x] Attribute id: %s value: %s",
+                dev.nwk,
+                endpoint_id,
+                cluster_id,
+                attr_id,
+                value,
+            )
+
+
+async def bench(path: pathlib.Path) -> None:
+    app = make_app({})
+    listener = await zigpy.appdb.PersistingListener.new(str(path), app)
+
+    start = time.perf_counter()
+    await listener.load()
+    total = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await listener._load_attributes()
+    grouped = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await load_attributes_per_row(listener)
+    per_row = time.perf_counter() - start
+
+    num_attributes = sum(
+        len(cluster._attr_cache)
+        for device in app.devices.values()
+        for endpoint in device.non_zdo_endpoints
+        for cluster in endpoint.in_clusters.values()
+    )
+
+    print(f"{len(app.devices)} devices, {num_attributes} cached attributes")
+    print(f"load()                 {total * 1000:8.1f}ms")
+    print(f"attributes, grouped    {grouped * 1000:8.1f}ms")
+    print(f"attributes, row by row {per_row * 1000:8.1f}ms")
+
+    await listener.shutdown()
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = pathlib.Path(directory) / "zigbee.db"
+        make_database(path)
+        asyncio.run(bench(path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark `Struct` construction and `KwargTypeMeta` subscripting.
+
+Both are compared against the `inspect.Signature` based binding they used to do.
+Run with `python -m tests.benchmarks.bench_construct`.
+"""
+
+from __future__ import annotations
+
+import inspect
+import timeit
+
+import zigpy.types as t
+import zigpy.zcl.foundation as foundation
+
+
+def inspect_bind(cls: type[t.Struct], *args, **kwargs) -> dict:
+    """Previous argument binding of `Struct.__new__`."""
+    signature = inspect.Signature(
+        parameters=[
+            inspect.Parameter(
+                name=f.name,
+                kind=inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                default=None,
+                annotation=f.type,
+            )
+            for f in cls.fields
+        ]
+    )
+
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+
+    return bound.arguments
+
+
+def inspect_getitem(cls: type, key: tuple) -> type:
+    """Previous key expansion of `KwargTypeMeta.__getitem__`."""
+    signature = inspect.Signature(
+        parameters=[
+            inspect.Parameter(
+                name=k,
+                kind=inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                default=v if v is not None else inspect.Parameter.empty,
+            )
+            for k, v in cls._getitem_kwargs.items()
+        ]
+    )
+
+    bound = signature.bind(*key)
+    bound.apply_defaults()
+
+    return cls._anonymous_classes[cls, tuple(bound.arguments.values())]
+
+
+def bench(name: str, stmt, number: int = 10_000) -> None:
+    duration = min(timeit.repeat(stmt, number=number, repeat=5))
+    print(f"{name:<45} {duration / number * 1e6:7.2f}us")
+
+
+def main() -> None:
+    schema = foundation.GENERAL_COMMANDS[
+        foundation.GeneralCommand.Read_Attributes
+    ].schema
+    t.LVList[t.uint16_t]
+
+    bench(
+        "ZCLHeader.general()",
+        lambda: foundation.ZCLHeader.general(tsn=1, command_id=0x00),
+    )
+    bench("Read_Attributes schema(...)", lambda: schema(attribute_ids=[0x0000]))
+    bench(
+        "Read_Attributes binding (inspect)",
+        lambda: inspect_bind(schema, attribute_ids=[0x0000]),
+    )
+    bench(
+        "Read_Attributes binding (cached)",
+        lambda: schema._bind_fields((), {"attribute_ids": [0x0000]}),
+    )
+    bench(
+        "LVList[uint16_t] (inspect)", lambda: inspect_getitem(t.LVList, (t.uint16_t,))
+    )
+    bench("LVList[uint16_t] (cached)", lambda: t.LVList[t.uint16_t])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark memory use and dictionary lookups of 10,000 EUI64 keys.
+
+The compact `bytes` based `EUI64` is compared with the previous `FixedList` based one.
+Run with `python -m tests.benchmarks.bench_eui64`.
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+import tracemalloc
+
+import zigpy.types as t
+
+NUM_DEVICES = 10_000
+
+
+class LegacyEUI64(t.FixedList, item_type=t.uint8_t, length=8):
+    def __repr__(self) -> str:
+        return ":".join(f"{i:02x}" for i in self[::-1])
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        return hash(repr(self))
+
+
+def build(eui64_type: type, raw: list[bytes]) -> dict:
+    return {eui64_type.deserialize(r)[0]: index for index, r in enumerate(raw)}
+
+
+def bench(name: str, eui64_type: type, raw: list[bytes]) -> None:
+    tracemalloc.start()
+    devices = build(eui64_type, raw)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Lookups use freshly deserialized keys, like addresses parsed from packets
+    keys = [eui64_type.deserialize(r)[0] for r in raw]
+    number = 10
+    lookup = min(
+        timeit.repeat(lambda: [devices[k] for k in keys], number=number, repeat=5)
+    )
+    deserialize = min(
+        timeit.repeat(
+            lambda: [eui64_type.deserialize(r) for r in raw], number=number, repeat=5
+        )
+    )
+
+    print(
+        f"{name:<8} memory {size / 1024:8.1f} KiB"
+        f"  lookup {lookup / number / len(keys) * 1e9:7.1f}ns/key"
+        f"  deserialize {deserialize / number / len(keys) * 1e9:7.1f}ns/key"
+    )
+
+
+def main() -> None:
+    rng = random.Random(0)
+    raw = [rng.getrandbits(64).to_bytes(8, "little") for _ in range(NUM_DEVICES)]
+
+    bench("legacy", LegacyEUI64, raw)
+    bench("compact", t.EUI64, raw)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark compiled `Struct` codecs against the generic code path.
+
+Run with `python -m tests.benchmarks.bench_struct`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import timeit
+
+import zigpy.types as t
+import zigpy.zcl.foundation as foundation
+
+ZCL_HEADER = foundation.ZCLHeader.general(
+    tsn=0x12, command_id=foundation.GeneralCommand.Read_Attributes_rsp
+).serialize()
+
+READ_ATTRIBUTES_RSP = (
+    foundation.GENERAL_COMMANDS[foundation.GeneralCommand.Read_Attributes_rsp]
+    .schema(
+        status_records=[
+            foundation.ReadAttributeRecord(
+                attrid=attrid,
+                status=foundation.Status.SUCCESS,
+                value=foundation.TypeValue(
+                    type=foundation.DATA_TYPES.pytype_to_datatype_id(t.uint16_t),
+                    value=t.uint16_t(attrid),
+                ),
+            )
+            for attrid in range(10)
+        ]
+        + [
+            foundation.ReadAttributeRecord(
+                attrid=0x1000, status=foundation.Status.UNSUPPORTED_ATTRIBUTE
+            )
+        ]
+    )
+    .serialize()
+)
+
+
+def _all_structs(cls=t.Struct):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _all_structs(subclass)
+
+
+@contextlib.contextmanager
+def generic_codecs():
+    """Temporarily disable compiled codecs for every struct."""
+    structs = list(_all_structs())
+    codecs = [s.__dict__.get("_codec") for s in structs]
+
+    for s in structs:
+        s._codec = None
+
+    try:
+        yield
+    finally:
+        for s, codec in zip(structs, codecs):
+            s._codec = codec
+
+
+def bench(name: str, stmt, number: int = 2_000) -> None:
+    with generic_codecs():
+        generic = min(timeit.repeat(stmt, number=number, repeat=5))
+
+    compiled = min(timeit.repeat(stmt, number=number, repeat=5))
+
+    print(
+        f"{name:<35} generic {generic / number * 1e6:7.2f}us"
+        f"  compiled {compiled / number * 1e6:7.2f}us"
+        f"  speedup {generic / compiled:5.2f}x"
+    )
+
+
+def main() -> None:
+    schema = foundation.GENERAL_COMMANDS[
+        foundation.GeneralCommand.Read_Attributes_rsp
+    ].schema
+    hdr, _ = foundation.ZCLHeader.deserialize(ZCL_HEADER)
+    rsp, _ = schema.deserialize(READ_ATTRIBUTES_RSP)
+
+    bench("ZCLHeader.deserialize", lambda: foundation.ZCLHeader.deserialize(ZCL_HEADER))
+    bench("ZCLHeader.serialize", hdr.serialize)
+    bench(
+        "Read_Attributes_rsp.deserialize",
+        lambda: schema.deserialize(READ_ATTRIBUTES_RSP),
+    )
+    bench("Read_Attributes_rsp.serialize", rsp.serialize)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ from unittest.mock import Mock
 import pytest
 
 import zigpy.application
+import zigpy.datastructures
 from zigpy.config import (
     CONF_DATABASE,
     CONF_DEVICE,
@@ -267,6 +268,24 @@ def make_route(
     )
 
 
+@pytest.fixture(autouse=True)
+def close_timer_service(
+    event_loop: asyncio.AbstractEventLoop,
+) -> typing.Generator[None, None, None]:
+    """Tear down the timer service shared within the test's event loop."""
+    yield
+
+    timers = zigpy.datastructures._TIMER_SERVICES.pop(event_loop, None)
+
+    if timers is None:
+        return
+
+    if len(timers):
+        _LOGGER.warning("Lingering coarse timers after test %r", timers)
+
+    timers.close()
+
+
 # Taken from Home Assistant's `conftest.py`
 @pytest.fixture(autouse=True)
 def verify_cleanup(
@@ -1,6 +1,7 @@
 import asyncio
 import contextlib
 from datetime import datetime, timedelta, timezone
+import logging
 import pathlib
 import sqlite3
 import sys
@@ -22,7 +23,8 @@ import zigpy.ota
 from zigpy.quirks import CustomDevice
 import zigpy.types as t
 import zigpy.zcl
-from zigpy.zcl.clusters.general import Basic
+from zigpy.zcl.clusters.general import Basic, LevelControl, OnOff
+from zigpy.zcl.clusters.smartenergy import Metering
 from zigpy.zcl.foundation import Status as ZCLStatus
 from zigpy.zdo import types as zdo_t
 
@@ -51,11 +53,11 @@ def auto_kill_aiosqlite():
         thread._running = False
 
 
-async def make_app_with_db(database_file):
+async def make_app_with_db(database_file, config=None):
     if isinstance(database_file, pathlib.Path):
         database_file = str(database_file)
 
-    app = make_app({conf.CONF_DATABASE: database_file})
+    app = make_app({conf.CONF_DATABASE: database_file, **(config or {})})
     await app._load_db()
 
     return app
@@ -750,6 +752,7 @@ async def test_appdb_worker_exception(tmp_path):
     """Exceptions should not kill the appdb worker."""
 
     app_mock = MagicMock(name="ControllerApplication")
+    app_mock.config = conf.ZIGPY_SCHEMA({})
 
     db = tmp_path / "test.db"
 
@@ -1177,3 +1180,503 @@ async def test_appdb_attribute_clear(tmp_path):
     dev3 = app3.get_device(ieee=dev.ieee)
     assert Basic.AttributeDefs.zcl_version.id not in dev3.endpoints[1].basic._attr_cache
     await app3.shutdown()
+
+
+async def test_appdb_group_commit(tmp_path):
+    """Queued events are handled in order within a single transaction."""
+
+    db = tmp_path / "test.db"
+    app = await make_app_with_db(db)
+
+    dev = app.add_device(nwk=0x1234, ieee=make_ieee(1))
+    dev.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.Router)
+
+    ep = dev.add_endpoint(1)
+    ep.status = zigpy.endpoint.Status.ZDO_INIT
+    ep.profile_id = 260
+    ep.device_type = profiles.zha.DeviceType.PUMP
+
+    basic = ep.add_input_cluster(Basic.cluster_id)
+    app.device_initialized(dev)
+
+    # Let the device be saved on its own
+    await asyncio.sleep(0.1)
+
+    listener = app._dblistener
+
+    with patch.object(
+        listener._db, "commit", wraps=listener._db.commit
+    ) as commit_mock, patch.object(
+        listener._db, "executemany", wraps=listener._db.executemany
+    ) as executemany_mock:
+        for value in range(100):
+            basic.update_attribute(Basic.AttributeDefs.zcl_version.id, value)
+
+        basic.update_attribute(Basic.AttributeDefs.app_version.id, 1)
+        basic.update_attribute(Basic.AttributeDefs.app_version.id, None)
+        basic.update_attribute(Basic.AttributeDefs.stack_version.id, 2)
+
+        await listener._callback_handlers.join()
+
+    assert commit_mock.call_count == 1
+    assert executemany_mock.call_count == 1
+    assert len(executemany_mock.mock_calls[0].args[1]) == 101
+
+    await app.shutdown()
+
+    app2 = await make_app_with_db(db)
+    basic = app2.get_device(ieee=dev.ieee).endpoints[1].basic
+    assert basic._attr_cache[Basic.AttributeDefs.zcl_version.id] == 99
+    assert Basic.AttributeDefs.app_version.id not in basic._attr_cache
+    assert basic._attr_cache[Basic.AttributeDefs.stack_version.id] == 2
+    await app2.shutdown()
+
+
+async def test_appdb_group_commit_failure(tmp_path):
+    """A failing event is rolled back without affecting the rest of its batch."""
+
+    db = tmp_path / "test.db"
+    app = await make_app_with_db(db)
+
+    dev = app.add_device(nwk=0x1234, ieee=make_ieee(1))
+    dev.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.Router)
+
+    ep = dev.add_endpoint(1)
+    ep.status = zigpy.endpoint.Status.ZDO_INIT
+    ep.profile_id = 260
+    ep.device_type = profiles.zha.DeviceType.PUMP
+
+    basic = ep.add_input_cluster(Basic.cluster_id)
+    app.device_initialized(dev)
+    await asyncio.sleep(0.1)
+
+    listener = app._dblistener
+    save_device = listener._save_device
+
+    async def failing_save_device(device):
+        await save_device(device)
+        raise sqlite3.OperationalError("Failure")
+
+    basic.update_attribute(Basic.AttributeDefs.zcl_version.id, 1)
+
+    with patch.object(listener, "_save_device", side_effect=failing_save_device):
+        dev.nwk = 0x5678
+        app.device_initialized(dev)
+        basic.update_attribute(Basic.AttributeDefs.app_version.id, 2)
+        await listener._callback_handlers.join()
+
+    await app.shutdown()
+
+    app2 = await make_app_with_db(db)
+    dev2 = app2.get_device(ieee=dev.ieee)
+    assert dev2.nwk == 0x1234
+    assert dev2.endpoints[1].basic._attr_cache[Basic.AttributeDefs.zcl_version.id] == 1
+    assert dev2.endpoints[1].basic._attr_cache[Basic.AttributeDefs.app_version.id] == 2
+    await app2.shutdown()
+
+
+async def test_appdb_group_commit_retry(tmp_path):
+    """Events of a batch that cannot be committed are retried individually."""
+
+    db = tmp_path / "test.db"
+    app = await make_app_with_db(db)
+
+    dev = app.add_device(nwk=0x1234, ieee=make_ieee(1))
+    dev.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.Router)
+
+    ep = dev.add_endpoint(1)
+    ep.status = zigpy.endpoint.Status.ZDO_INIT
+    ep.profile_id = 260
+    ep.device_type = profiles.zha.DeviceType.PUMP
+
+    basic = ep.add_input_cluster(Basic.cluster_id)
+    app.device_initialized(dev)
+    await asyncio.sleep(0.1)
+
+    listener = app._dblistener
+    commit = listener._db.commit
+    failures = [sqlite3.OperationalError("database is locked")]
+
+    def flaky_commit():
+        if failures:
+            raise failures.pop()
+
+        return commit()
+
+    with patch.object(listener._db, "commit", side_effect=flaky_commit):
+        basic.update_attribute(Basic.AttributeDefs.zcl_version.id, 1)
+        basic.update_attribute(Basic.AttributeDefs.app_version.id, 2)
+        basic.update_attribute(Basic.AttributeDefs.stack_version.id, 3)
+        await listener._callback_handlers.join()
+
+    counters = app.state.counters[zigpy.appdb.COUNTERS_DATABASE]
+    assert counters["events_retried"].value == 3
+    assert counters["events_dropped"].value == 0
+
+    await app.shutdown()
+
+    app2 = await make_app_with_db(db)
+    basic = app2.get_device(ieee=dev.ieee).endpoints[1].basic
+    assert basic._attr_cache[Basic.AttributeDefs.zcl_version.id] == 1
+    assert basic._attr_cache[Basic.AttributeDefs.app_version.id] == 2
+    assert basic._attr_cache[Basic.AttributeDefs.stack_version.id] == 3
+    await app2.shutdown()
+
+
+async def test_appdb_attribute_write_coalescing(tmp_path):
+    """Only the latest value of a frequently updated attribute is written."""
+
+    db = tmp_path / "test.db"
+    app = await make_app_with_db(db, {conf.CONF_ATTRIBUTE_WRITE_INTERVAL: 0.1})
+
+    dev = app.add_device(nwk=0x1234, ieee=make_ieee(1))
+    dev.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.Router)
+
+    ep = dev.add_endpoint(1)
+    ep.status = zigpy.endpoint.Status.ZDO_INIT
+    ep.profile_id = 260
+    ep.device_type = profiles.zha.DeviceType.PUMP
+
+    basic = ep.add_input_cluster(Basic.cluster_id)
+    basic.update_attribute(Basic.AttributeDefs.app_version.id, 1)
+    app.device_initialized(dev)
+    await asyncio.sleep(0.2)
+
+    listener = app._dblistener
+
+    with patch.object(listener, "enqueue", wraps=listener.enqueue) as enqueue_mock:
+        for value in range(100):
+            basic.update_attribute(Basic.AttributeDefs.zcl_version.id, value)
+
+        # The value changes and changes back within the interval
+        basic.update_attribute(Basic.AttributeDefs.app_version.id, 2)
+        basic.update_attribute(Basic.AttributeDefs.app_version.id, 1)
+
+        # The value does not change
+        basic.update_attribute(Basic.AttributeDefs.hw_version.id, 4)
+        basic.update_attribute(Basic.AttributeDefs.hw_version.id, 4)
+
+        # A pending update is dropped when the attribute is cleared
+        basic.update_attribute(Basic.AttributeDefs.stack_version.id, 3)
+        basic.update_attribute(Basic.AttributeDefs.stack_version.id, None)
+
+        assert [c.args[0] for c in enqueue_mock.mock_calls] == ["_clear_attribute"]
+        enqueue_mock.reset_mock()
+
+        await asyncio.sleep(0.2)
+        await listener._callback_handlers.join()
+
+    # Everything was written at once
+    assert [c.args[0] for c in enqueue_mock.mock_calls] == ["_save_attribute"] * 3
+    assert [c.args[-1] for c in enqueue_mock.mock_calls] == [
+        0,
+        0,
+        zigpy.appdb.MIN_UPDATE_DELTA,
+    ]
+
+    counters = app.state.counters[zigpy.appdb.COUNTERS_DATABASE]
+    assert counters["attribute_updates"] == 106
+    assert counters["attribute_writes"] == 4
+
+    await app.shutdown()
+
+    app2 = await make_app_with_db(db)
+    basic = app2.get_device(ieee=dev.ieee).endpoints[1].basic
+    assert basic._attr_cache[Basic.AttributeDefs.zcl_version.id] == 99
+    assert basic._attr_cache[Basic.AttributeDefs.app_version.id] == 1
+    assert basic._attr_cache[Basic.AttributeDefs.hw_version.id] == 4
+    assert Basic.AttributeDefs.stack_version.id not in basic._attr_cache
+    await app2.shutdown()
+
+
+async def test_appdb_attribute_write_cancelled(tmp_path):
+    """The delayed write is cancelled once no attribute updates are pending."""
+
+    db = tmp_path / "test.db"
+    app = await make_app_with_db(db, {conf.CONF_ATTRIBUTE_WRITE_INTERVAL: 60})
+
+    dev = app.add_device(nwk=0x1234, ieee=make_ieee(1))
+    dev.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.Router)
+
+    ep = dev.add_endpoint(1)
+    ep.status = zigpy.endpoint.Status.ZDO_INIT
+    ep.profile_id = 260
+    ep.device_type = profiles.zha.DeviceType.PUMP
+
+    basic = ep.add_input_cluster(Basic.cluster_id)
+    app.device_initialized(dev)
+
+    listener = app._dblistener
+    await listener._callback_handlers.join()
+
+    basic.update_attribute(Basic.AttributeDefs.app_version.id, 1)
+    assert listener._attribute_write_handle is not None
+
+    basic.update_attribute(Basic.AttributeDefs.app_version.id, None)
+    assert listener._attribute_write_handle is None
+
+    basic.update_attribute(Basic.AttributeDefs.app_version.id, 2)
+    assert listener._attribute_write_handle is not None
+
+    listener.device_removed(dev)
+    assert listener._attribute_write_handle is None
+    assert not listener._pending_attributes
+
+    await app.shutdown()
+
+
+async def test_appdb_queue_overflow(tmp_path):
+    """Events updating the same row are merged once the queue is too long."""
+
+    db = tmp_path / "test.db"
+    app = await make_app_with_db(
+        db,
+        {
+            conf.CONF_DATABASE_QUEUE_HIGH_WATERMARK: 3,
+            conf.CONF_DATABASE_QUEUE_LOW_WATERMARK: 1,
+        },
+    )
+
+    dev1 = app.add_device(nwk=0x1234, ieee=make_ieee(1))
+    dev2 = app.add_device(nwk=0x5678, ieee=make_ieee(2))
+    app.device_initialized(dev1)
+    app.device_initialized(dev2)
+
+    listener = app._dblistener
+    await listener._callback_handlers.join()
+
+    start = datetime.now(timezone.utc)
+
+    # The worker does not run until the queue is awaited
+    for dev in (dev1, dev2, dev1):
+        listener.enqueue("_save_device_last_seen", dev.ieee, start)
+
+    assert not listener._overflowing
+
+    for seconds in range(60, 300, 60):
+        listener.enqueue(
+            "_save_device_last_seen", dev1.ieee, start + timedelta(seconds=seconds)
+        )
+
+    assert listener._overflowing
+    assert listener.queue_depth == 4
+
+    # Other events are queued, held back events of other devices stay merged
+    listener.enqueue("_update_device_nwk", dev2.ieee, 0x9999)
+
+    assert listener.queue_depth == 5
+    assert listener._callback_handlers.qsize() == 4
+
+    listener.enqueue("_save_device_last_seen", dev2.ieee, start + timedelta(seconds=60))
+    listener.enqueue("_save_device_last_seen", dev2.ieee, start + timedelta(seconds=90))
+
+    assert listener.queue_depth == 6
+
+    # Held back events of a device are written before its other events
+    listener.enqueue("_update_device_nwk", dev1.ieee, 0x1235)
+
+    assert listener.queue_depth == 7
+    assert listener._callback_handlers.qsize() == 6
+
+    counters = app.state.counters[zigpy.appdb.COUNTERS_DATABASE]
+    assert counters["queue_depth"].value == 7
+
+    await listener._callback_handlers.join()
+    assert not listener._overflowing
+    assert listener.queue_depth == 0
+
+    assert counters["events_merged"] == 4
+    assert counters["events_overflowed"] == 2
+    assert counters["events_handled"].value == counters["events_queued"].value - 4
+    assert counters["max_queue_depth"].value >= 7
+    assert counters["queue_depth"].value == 0
+    assert 0 < counters["commits"].value < counters["events_committed"].value
+
+    await app.shutdown()
+
+    app2 = await make_app_with_db(db)
+    dev1 = app2.get_device(ieee=dev1.ieee)
+    dev2 = app2.get_device(ieee=dev2.ieee)
+    assert dev1.last_seen == (start + timedelta(seconds=240)).timestamp()
+    assert dev2.last_seen == (start + timedelta(seconds=90)).timestamp()
+    assert dev1.nwk == 0x1235
+    assert dev2.nwk == 0x9999
+    await app2.shutdown()
+
+
+async def test_appdb_queue_full(tmp_path):
+    """The oldest events are dropped once the queue is full."""
+
+    app = await make_app_with_db(
+        tmp_path / "test.db", {conf.CONF_DATABASE_QUEUE_MAX_SIZE: 3}
+    )
+
+    dev = app.add_device(nwk=0x1234, ieee=make_ieee(1))
+    app.device_initialized(dev)
+
+    listener = app._dblistener
+    await listener._callback_handlers.join()
+
+    for nwk in range(0x1000, 0x1005):
+        listener.enqueue("_update_device_nwk", dev.ieee, nwk)
+
+    assert listener.queue_depth == 3
+
+    counters = app.state.counters[zigpy.appdb.COUNTERS_DATABASE]
+    assert counters["events_dropped"] == 2
+
+    await app.shutdown()
+
+    app2 = await make_app_with_db(tmp_path / "test.db")
+    assert app2.get_device(ieee=dev.ieee).nwk == 0x1004
+    await app2.shutdown()
+
+
+async def test_appdb_shutdown_timeout(tmp_path, caplog):
+    """Events that are not written before the shutdown timeout are logged."""
+
+    app = await make_app_with_db(
+        tmp_path / "test.db", {conf.CONF_DATABASE_SHUTDOWN_TIMEOUT: 0.01}
+    )
+
+    dev = app.add_device(nwk=0x1234, ieee=make_ieee(1))
+    app.device_initialized(dev)
+
+    listener = app._dblistener
+    await listener._callback_handlers.join()
+
+    stalled = asyncio.Event()
+
+    async def stall(*args):
+        await stalled.wait()
+
+    with patch.object(listener, "_update_device_nwk", stall):
+        listener.enqueue("_update_device_nwk", dev.ieee, 0x1235)
+        await asyncio.sleep(0)
+        listener.enqueue("_save_device_last_seen", dev.ieee, datetime.now(timezone.utc))
+
+        with caplog.at_level(logging.WARNING):
+            await app.shutdown()
+
+    assert "1 events were not written: _save_device_last_seen (1)" in caplog.text
+
+    counters = app.state.counters[zigpy.appdb.COUNTERS_DATABASE]
+    assert counters["events_unflushed"] == 1
+
+
+async def test_appdb_lazy_attribute_cache(tmp_path, caplog):
+    """Cached attributes are loaded from the database when a cluster is first used."""
+
+    db = tmp_path / "test.db"
+    app = await make_app_with_db(db)
+
+    dev = app.add_device(nwk=0x1234, ieee=make_ieee(1))
+    dev.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.Router)
+
+    ep = dev.add_endpoint(1)
+    ep.status = zigpy.endpoint.Status.ZDO_INIT
+    ep.profile_id = 260
+    ep.device_type = profiles.zha.DeviceType.PUMP
+
+    basic = ep.add_input_cluster(Basic.cluster_id)
+    on_off = ep.add_input_cluster(OnOff.cluster_id)
+    level = ep.add_input_cluster(LevelControl.cluster_id)
+    metering = ep.add_input_cluster(Metering.cluster_id)
+
+    basic.update_attribute(Basic.AttributeDefs.manufacturer.id, "Manufacturer")
+    basic.update_attribute(Basic.AttributeDefs.model.id, "Model")
+    basic.update_attribute(Basic.AttributeDefs.zcl_version.id, 3)
+    on_off.update_attribute(OnOff.AttributeDefs.on_off.id, t.Bool.true)
+    level.update_attribute(LevelControl.AttributeDefs.current_level.id, 100)
+    metering.update_attribute(Metering.AttributeDefs.current_summ_delivered.id, 1234)
+    app.device_initialized(dev)
+    await app.shutdown()
+
+    app2 = await make_app_with_db(
+        db,
+        {
+            conf.CONF_LAZY_ATTRIBUTE_CACHE: True,
+            conf.CONF_LAZY_ATTRIBUTE_CACHE_PRELOAD: [OnOff.cluster_id],
+        },
+    )
+    dev2 = app2.get_device(ieee=dev.ieee)
+    basic, on_off, level, metering = dev2.endpoints[1].in_clusters.values()
+
+    # Only the manufacturer, model and preloaded clusters are loaded
+    assert dev2.manufacturer == "Manufacturer"
+    assert dev2.model == "Model"
+    assert basic._attr_cache == {
+        Basic.AttributeDefs.manufacturer.id: "Manufacturer",
+        Basic.AttributeDefs.model.id: "Model",
+    }
+    assert on_off._attr_cache == {OnOff.AttributeDefs.on_off.id: t.Bool.true}
+    assert on_off._attr_cache_loader is None
+    assert not level._attr_cache
+    assert not metering._attr_cache
+
+    # Clusters are loaded in the background on first use
+    assert basic.get(Basic.AttributeDefs.zcl_version.id) is None
+    await basic._wait_attr_cache()
+    assert basic.get(Basic.AttributeDefs.zcl_version.id) == 3
+    assert basic._attr_cache_loader is None
+
+    success, _ = await level.read_attributes(
+        [LevelControl.AttributeDefs.current_level.id], allow_cache=True
+    )
+    assert success == {LevelControl.AttributeDefs.current_level.id: 100}
+
+    counters = app2.state.counters[zigpy.appdb.COUNTERS_DATABASE]
+    assert counters["lazy_loads"].value == 2
+
+    # An update is not overwritten by the older cached value
+    metering.update_attribute(Metering.AttributeDefs.current_summ_delivered.id, 5678)
+    assert metering[Metering.AttributeDefs.current_summ_delivered.id] == 5678
+    await metering._wait_attr_cache()
+    assert metering[Metering.AttributeDefs.current_summ_delivered.id] == 5678
+
+    await app2.shutdown()
+
+    app3 = await make_app_with_db(db, {conf.CONF_LAZY_ATTRIBUTE_CACHE: True})
+    dev3 = app3.get_device(ieee=dev.ieee)
+    clusters = list(dev3.endpoints[1].in_clusters.values())
+
+    assert all(c._attr_cache_loader is not None for c in clusters)
+
+    # A value cleared before the cache is loaded is not restored
+    clusters[2].update_attribute(LevelControl.AttributeDefs.current_level.id, None)
+
+    await app3.prefetch_attribute_cache()
+
+    assert all(c._attr_cache_loader is None for c in clusters)
+    assert clusters[3]._attr_cache == {
+        Metering.AttributeDefs.current_summ_delivered.id: 5678
+    }
+    assert not clusters[2]._attr_cache
+
+    await app3.shutdown()
+
+    app4 = await make_app_with_db(db, {conf.CONF_LAZY_ATTRIBUTE_CACHE: True})
+    dev4 = app4.get_device(ieee=dev.ieee)
+    basic = dev4.endpoints[1].in_clusters[Basic.cluster_id]
+    level = dev4.endpoints[1].in_clusters[LevelControl.cluster_id]
+
+    # A failed load is logged and tried again on next use
+    with caplog.at_level(logging.WARNING), patch.object(
+        app4._dblistener,
+        "_fetchall",
+        side_effect=sqlite3.OperationalError("database is locked"),
+    ):
+        await basic._wait_attr_cache()
+
+    assert "Failed to load the attribute cache" in caplog.text
+    assert basic._attr_cache_loader is not None
+
+    await basic._wait_attr_cache()
+    assert basic.get(Basic.AttributeDefs.zcl_version.id) == 3
+
+    # Nothing is loaded once the database is closed
+    await app4.shutdown()
+
+    await level._wait_attr_cache()
+    assert level.get(LevelControl.AttributeDefs.current_level.id) is None
+    assert level._attr_cache_loader is not None
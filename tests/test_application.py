@@ -9,6 +9,7 @@ import voluptuous as vol
 
 import zigpy.application
 import zigpy.config as conf
+import zigpy.device
 from zigpy.exceptions import (
     DeliveryError,
     NetworkNotFormed,
@@ -18,6 +19,7 @@ from zigpy.exceptions import (
 import zigpy.ota
 import zigpy.quirks
 import zigpy.types as t
+import zigpy.util
 from zigpy.zcl import clusters, foundation
 import zigpy.zdo.types as zdo_t
 
@@ -175,6 +177,35 @@ async def test_remove_without_node_desc(app, ieee):
         assert remove_device.await_count == 1
 
 
+@pytest.mark.parametrize("event", ["remove", "leave", "shutdown"])
+async def test_deferred_requests_cancelled(app, ieee, event):
+    """Test requests held for a sleepy device failing once it will not wake up."""
+
+    app.config[conf.CONF_SLEEPY_DEVICE_QUEUE] = True
+    app.send_packet = AsyncMock()
+
+    dev = app.add_device(ieee, 0x1234)
+    dev.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.EndDevice)
+
+    request = asyncio.create_task(dev.request(260, 0x0006, 1, 1, 1, b"\x01\x01\x01"))
+    await asyncio.sleep(0)
+    assert len(dev._deferred_requests) == 1
+
+    if event == "remove":
+        with patch.object(app, "_remove_device", AsyncMock()):
+            await app.remove(ieee)
+    elif event == "leave":
+        app.handle_leave(0x1234, ieee)
+    else:
+        await app.shutdown()
+
+    with pytest.raises(DeliveryError):
+        await request
+
+    assert len(dev._deferred_requests) == 0
+    assert app.send_packet.await_count == 0
+
+
 def test_add_device(app, ieee):
     app.add_device(ieee, 8)
     app.add_device(ieee, 9)
@@ -319,6 +350,137 @@ async def test_handle_message_uninitialized_dev(is_init_mock, app, ieee):
     assert zigpy.quirks.handle_message_from_uninitialized_sender.call_count == 2
 
 
+@patch("zigpy.device.Device.is_initialized", new_callable=PropertyMock)
+async def test_packet_received_batch(is_init_mock, app, ieee, caplog):
+    is_init_mock.return_value = True
+
+    dev1 = app.add_device(ieee, 0x1234)
+    dev2 = app.add_device(t.EUI64.convert("aa:bb:cc:dd:11:22:33:44"), 0x5678)
+
+    events = []
+    dev1.packet_received = MagicMock(
+        side_effect=lambda packet: events.append(("packet", packet))
+    )
+    dev2.packet_received = MagicMock(
+        side_effect=lambda packet: events.append(("packet", packet))
+    )
+
+    def make_packet(nwk: int, data: bytes) -> t.ZigbeePacket:
+        return t.ZigbeePacket(
+            profile_id=260,
+            cluster_id=0x0006,
+            src_ep=1,
+            dst_ep=1,
+            data=t.SerializableBytes(data),
+            src=t.AddrModeAddress(addr_mode=t.AddrMode.NWK, address=nwk),
+            dst=t.AddrModeAddress(addr_mode=t.AddrMode.NWK, address=0x0000),
+        )
+
+    packets = [
+        make_packet(0x1234, b"1"),
+        make_packet(0x5678, b"2"),
+        make_packet(0xAAAA, b"unknown"),
+        make_packet(0x1234, b"3"),
+        make_packet(0x5678, b"4"),
+    ]
+
+    class Listener:
+        def handle_message(self, device, profile, cluster, src_ep, dst_ep, data):
+            events.append(("message", device, data))
+
+    class BatchListener:
+        def handle_message(self, *args):
+            events.append(("unexpected", args))
+
+        def handle_message_batch(self, messages):
+            events.append(("batch", [(m[0], m[-1]) for m in messages]))
+
+    app.add_listener(Listener())
+    app.add_listener(BatchListener())
+
+    with patch.object(app, "_discover_unknown_device", AsyncMock()):
+        app.packet_received_batch(packets)
+
+    assert "Unknown device" in caplog.text
+
+    # Every packet is handled completely before the next one. Listeners that opt
+    # into batched events receive them once the whole batch has been handled.
+    assert events == [
+        ("message", dev1, b"1"),
+        ("packet", packets[0]),
+        ("message", dev2, b"2"),
+        ("packet", packets[1]),
+        ("message", dev1, b"3"),
+        ("packet", packets[3]),
+        ("message", dev2, b"4"),
+        ("packet", packets[4]),
+        ("batch", [(dev1, b"1"), (dev2, b"2"), (dev1, b"3"), (dev2, b"4")]),
+    ]
+
+    # Single packets emit regular events to every listener
+    events.clear()
+    app.packet_received(packets[0])
+
+    assert events == [
+        ("message", dev1, b"1"),
+        ("unexpected", (dev1, 260, 0x0006, 1, 1, b"1")),
+        ("packet", packets[0]),
+    ]
+
+
+@pytest.mark.parametrize("batch", [False, True])
+@patch("zigpy.device.Device.is_initialized", new_callable=PropertyMock)
+async def test_packet_received_error(is_init_mock, batch, app, ieee):
+    is_init_mock.return_value = True
+
+    dev = app.add_device(ieee, 0x1234)
+    dev.packet_received = MagicMock(side_effect=[None, RuntimeError("Uh oh"), None])
+
+    handle_message_batch = MagicMock()
+
+    class BatchListener:
+        def handle_message_batch(self, messages):
+            handle_message_batch(messages)
+
+    app.add_listener(BatchListener())
+
+    packets = [
+        t.ZigbeePacket(
+            profile_id=260,
+            cluster_id=0x0006,
+            src_ep=1,
+            dst_ep=1,
+            data=t.SerializableBytes(data),
+            src=t.AddrModeAddress(addr_mode=t.AddrMode.NWK, address=0x1234),
+            dst=t.AddrModeAddress(addr_mode=t.AddrMode.NWK, address=0x0000),
+        )
+        for data in (b"1", b"2", b"3")
+    ]
+
+    # Exceptions propagate the same way with and without batching
+    with pytest.raises(RuntimeError, match="Uh oh"):
+        if batch:
+            app.packet_received_batch(packets)
+        else:
+            for packet in packets:
+                app.packet_received(packet)
+
+    assert dev.packet_received.mock_calls == [call(packets[0]), call(packets[1])]
+
+    # Packets handled before the failure are still sent to batch listeners
+    if batch:
+        assert handle_message_batch.mock_calls == [
+            call(
+                [
+                    (dev, 260, 0x0006, 1, 1, b"1"),
+                    (dev, 260, 0x0006, 1, 1, b"2"),
+                ]
+            )
+        ]
+    else:
+        assert handle_message_batch.mock_calls == []
+
+
 def test_get_dst_address(app):
     r = app.get_dst_address(MagicMock())
     assert r.addrmode == 3
@@ -498,6 +660,85 @@ async def test_get_device(app):
     assert app.get_device(nwk=0x0000) is dev_2
 
 
+@patch("zigpy.device.Device.initialize", new_callable=AsyncMock)
+async def test_get_device_nwk_index_nwk_change(init_mock, app, ieee):
+    """Test the NWK index follows NWK address changes."""
+    dev = app.add_device(ieee, 0x1234)
+    assert app.get_device(nwk=0x1234) is dev
+
+    dev.nwk = 0xABCD
+    assert app.get_device(nwk=0xABCD) is dev
+
+    with pytest.raises(KeyError):
+        app.get_device(nwk=0x1234)
+
+    app.handle_join(nwk=0x5678, ieee=ieee, parent_nwk=None)
+    assert app.get_device(nwk=0x5678) is dev
+
+    with pytest.raises(KeyError):
+        app.get_device(nwk=0xABCD)
+
+
+def test_get_device_nwk_index_replacement(app, ieee):
+    """Test the NWK index follows device object replacement and removal."""
+    dev = app.add_device(ieee, 0x1234)
+    new_dev = zigpy.device.Device(app, ieee, 0x1234)
+    app.devices[ieee] = new_dev
+
+    assert app.get_device(nwk=0x1234) is new_dev
+
+    # The old device is no longer registered so it cannot affect the index
+    dev.nwk = 0xABCD
+
+    with pytest.raises(KeyError):
+        app.get_device(nwk=0xABCD)
+
+    assert app.devices.pop(ieee) is new_dev
+
+    with pytest.raises(KeyError):
+        app.get_device(nwk=0x1234)
+
+
+def test_get_device_nwk_index_conflict(app, caplog):
+    """Test the most recent claimant of a duplicate NWK address is returned."""
+    dev1 = app.add_device(t.EUI64.convert("11:11:11:11:22:22:22:22"), 0x1234)
+
+    with caplog.at_level(logging.WARNING):
+        dev2 = app.add_device(t.EUI64.convert("11:11:11:11:22:22:22:33"), 0x1234)
+
+    assert "NWK address conflict" in caplog.text
+    assert app.get_device(nwk=0x1234) is dev2
+
+    dev2.nwk = 0x5678
+    assert app.get_device(nwk=0x1234) is dev1
+    assert app.get_device(nwk=0x5678) is dev2
+
+
+def test_get_device_nwk_index_mapping_methods(app, ieee):
+    """Test the NWK index follows every way of mutating the device registry."""
+    dev = zigpy.device.Device(app, ieee, 0x1234)
+
+    with pytest.raises(TypeError):
+        app.devices.setdefault(ieee)
+
+    assert ieee not in app.devices
+    assert app.devices.setdefault(ieee, dev) is dev
+    assert app.get_device(nwk=0x1234) is dev
+
+    assert app.devices.popitem() == (ieee, dev)
+
+    with pytest.raises(KeyError):
+        app.get_device(nwk=0x1234)
+
+    app.devices |= {ieee: dev}
+    assert app.get_device(nwk=0x1234) is dev
+
+    app.devices.clear()
+
+    with pytest.raises(KeyError):
+        app.get_device(nwk=0x1234)
+
+
 async def test_probe_success():
     config = {"path": "/dev/test"}
 
@@ -771,6 +1012,149 @@ async def test_request_concurrency():
     assert peak_concurrency == 16
 
 
+async def test_request_concurrency_per_destination():
+    sent = []
+    slow_device_blocker = asyncio.Event()
+
+    class SlowApp(App):
+        async def send_packet(self, packet):
+            async with self._limit_concurrency():
+                if packet.dst.address == 0x1111:
+                    await slow_device_blocker.wait()
+
+                sent.append(packet.dst.address)
+
+    app = make_app(
+        {
+            conf.CONF_MAX_CONCURRENT_REQUESTS: 4,
+            conf.CONF_MAX_CONCURRENT_REQUESTS_PER_DESTINATION: 2,
+        },
+        app_base=SlowApp,
+    )
+    slow = app.add_device(t.EUI64.convert("11:11:11:11:11:11:11:11"), 0x1111)
+    fast = app.add_device(t.EUI64.convert("22:22:22:22:22:22:22:22"), 0x2222)
+
+    scheduler = app._concurrent_requests_semaphore
+    slow_requests = [
+        asyncio.create_task(app.request(slow, 0x0104, 0x0006, 1, 1, i, b""))
+        for i in range(5)
+    ]
+    await asyncio.sleep(0)
+
+    # The unreachable device can only take two slots
+    assert scheduler.in_flight(slow.ieee) == 2
+    assert scheduler.queue_depth(slow.ieee) == 3
+
+    counters = app.state.counters[zigpy.application.COUNTERS_REQUEST_SCHEDULER]
+    assert counters["queue_depth_normal"].value == 3
+
+    # Other destinations are not held up, whatever their priority
+    with zigpy.util.request_priority(zigpy.util.RequestPriority.BACKGROUND):
+        await app.request(fast, 0x0104, 0x0006, 1, 1, 5, b"")
+
+    await app.mrequest(0x0001, 0x0104, 0x0006, 1, 6, b"")
+    await app.broadcast(0x0104, 0x0006, 1, 1, 0x0000, 0, 7, b"")
+
+    assert sent == [0x2222, 0x0001, t.BroadcastAddress.RX_ON_WHEN_IDLE]
+
+    slow_device_blocker.set()
+    await asyncio.gather(*slow_requests)
+
+    assert sent.count(0x1111) == 5
+    assert scheduler.value == 4
+    assert scheduler.num_waiting == 0
+
+    assert counters["queue_depth_normal"].value == 0
+    assert counters["requests"].value == 8
+    # Requests sent while others are waiting are queued, even if they run right away
+    assert counters["delayed"].value == 6
+    assert counters["aged"].value == 0
+    assert counters["wait_time_ms"].value >= counters["max_wait_time_ms"].value
+
+
+async def test_request_scheduler_defaults():
+    app = make_app({})
+    scheduler = app._concurrent_requests_semaphore
+
+    # Destinations are not limited and priorities do not age unless configured
+    assert scheduler.per_destination is None
+    assert scheduler.aging_interval is None
+
+
+async def test_request_scheduler_queue_depth_counters():
+    blocker = asyncio.Event()
+
+    class SlowApp(App):
+        async def send_packet(self, packet):
+            async with self._limit_concurrency():
+                await blocker.wait()
+
+    app = make_app({conf.CONF_MAX_CONCURRENT_REQUESTS: 1}, app_base=SlowApp)
+    dev = app.add_device(t.EUI64.convert("11:11:11:11:11:11:11:11"), 0x1111)
+    counters = app.state.counters[zigpy.application.COUNTERS_REQUEST_SCHEDULER]
+
+    requests = [
+        asyncio.create_task(app.request(dev, 0x0104, 0x0006, 1, 1, i, b""))
+        for i in range(3)
+    ]
+
+    with zigpy.util.request_priority(zigpy.util.RequestPriority.BACKGROUND):
+        requests.append(
+            asyncio.create_task(app.request(dev, 0x0104, 0x0006, 1, 1, 3, b""))
+        )
+
+    with zigpy.util.request_priority(5):
+        requests.append(
+            asyncio.create_task(app.request(dev, 0x0104, 0x0006, 1, 1, 4, b""))
+        )
+
+    await asyncio.sleep(0)
+
+    # One request is being sent, the others wait in their priority's queue
+    assert counters["queue_depth_normal"].value == 2
+    assert counters["queue_depth_background"].value == 1
+    assert counters["queue_depth_priority_5"].value == 1
+
+    blocker.set()
+    await asyncio.gather(*requests)
+
+    assert counters["queue_depth_normal"].value == 0
+    assert counters["queue_depth_background"].value == 0
+    assert counters["queue_depth_priority_5"].value == 0
+
+
+async def test_request_concurrency_adaptive():
+    class FlakyApp(App):
+        async def send_packet(self, packet):
+            async with self._limit_concurrency():
+                if packet.tsn % 2:
+                    raise DeliveryError("Failed")
+
+    app = make_app(
+        {
+            conf.CONF_MAX_CONCURRENT_REQUESTS: 8,
+            conf.CONF_MIN_CONCURRENT_REQUESTS: 2,
+            conf.CONF_ADAPTIVE_CONCURRENCY: True,
+        },
+        app_base=FlakyApp,
+    )
+    dev = app.add_device(t.EUI64.convert("11:11:11:11:11:11:11:11"), 0x1111)
+    scheduler = app._concurrent_requests_semaphore
+
+    assert scheduler.max_value == 8
+
+    with pytest.raises(DeliveryError):
+        await app.request(dev, 0x0104, 0x0006, 1, 1, 1, b"")
+
+    assert scheduler.max_value == 4
+
+    for tsn in range(0, 60, 2):
+        await app.request(dev, 0x0104, 0x0006, 1, 1, tsn, b"")
+
+    assert scheduler.max_value == 8
+    assert app._adaptive_concurrency.latency is not None
+
+
 @pytest.fixture
 def device():
     device = MagicMock()
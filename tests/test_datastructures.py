@@ -1,5 +1,7 @@
 import asyncio
-from unittest.mock import Mock, patch
+import gc
+from unittest.mock import Mock, call, patch
+import weakref
 
 import pytest
 
@@ -250,39 +252,429 @@ async def test_priority_lock(event_loop):
     ]
 
 
-async def test_reschedulable_timeout():
+async def test_fair_scheduler_round_robin():
+    """Test destinations taking turns and priorities being served first."""
+
+    sched = datastructures.FairScheduler(1)
+    run_order = []
+
+    async def run(destination: str, item: str, priority: int = 0):
+        async with sched(priority=priority, destination=destination):
+            run_order.append(item)
+
+    async with sched:
+        assert sched.locked()
+
+        tasks = [
+            asyncio.create_task(run("a", "a1")),
+            asyncio.create_task(run("a", "a2")),
+            asyncio.create_task(run("a", "a3")),
+            asyncio.create_task(run("b", "b1")),
+            asyncio.create_task(run("c", "c1", priority=-1)),
+            asyncio.create_task(run("c", "c2", priority=1)),
+        ]
+
+        await asyncio.sleep(0)
+        assert sched.num_waiting == 6
+        assert sched.queue_depth("a") == 3
+        assert sched.queue_depths() == {"a": 3, "b": 1, "c": 2}
+
+    await asyncio.gather(*tasks)
+
+    assert run_order == ["c2", "a1", "b1", "a2", "a3", "c1"]
+    assert sched.num_waiting == 0
+    assert sched.queue_depths() == {}
+    assert sched.num_delayed == 6
+    assert sched.total_wait_time >= sched.max_wait_time > 0
+    assert not sched.locked()
+    assert sched.value == 1
+
+
+async def test_fair_scheduler_aging():
+    """Test long waiting lower priority waiters not being starved."""
+
+    sched = datastructures.FairScheduler(1, aging_interval=0.02)
+    run_order = []
+
+    async def run(destination: str, priority: int = 0):
+        async with sched(priority=priority, destination=destination):
+            run_order.append(destination)
+
+    async with sched:
+        background = asyncio.create_task(run("background", priority=-1))
+        await asyncio.sleep(0.05)
+
+        normal = asyncio.create_task(run("normal"))
+        await asyncio.sleep(0)
+
+    await asyncio.gather(background, normal)
+
+    # The background waiter has gained more than one priority level while waiting
+    assert run_order == ["background", "normal"]
+    assert sched.num_aged == 1
+
+
+async def test_fair_scheduler_per_destination_limit():
+    """Test a busy destination not taking every slot."""
+
+    sched = datastructures.FairScheduler(4, per_destination=2)
+    blocker = asyncio.Event()
+
+    async def run(destination: str | None):
+        async with sched(destination=destination):
+            await blocker.wait()
+
+    tasks = [asyncio.create_task(run("slow")) for _ in range(5)]
+    await asyncio.sleep(0)
+
+    assert sched.in_flight("slow") == 2
+    assert sched.queue_depth("slow") == 3
+    assert not sched.locked()
+
+    # Other destinations can still run, unaddressed requests are not limited
+    tasks += [asyncio.create_task(run("fast")), asyncio.create_task(run(None))]
+    await asyncio.sleep(0)
+
+    assert sched.in_flight("fast") == 1
+    assert sched.in_flight(None) == 1
+    assert sched.locked()
+
+    # Raising the limit lets the slow destination continue, within its own limit
+    sched.max_value = 6
+    assert sched.in_flight("slow") == 2
+    assert sched.value == 2
+
+    sched.per_destination = 3
+    sched.max_value = 6
+    assert sched.in_flight("slow") == 3
+    assert sched.queue_depth("slow") == 2
+
+    blocker.set()
+    await asyncio.gather(*tasks)
+
+    assert sched.value == 6
+    assert sched.num_waiting == 0
+
+    with pytest.raises(ValueError):
+        sched.release("slow")
+
+    with pytest.raises(ValueError):
+        sched.max_value = -1
+
+
+async def test_fair_scheduler_priority_queue_depths():
+    on_queue_change = Mock()
+    sched = datastructures.FairScheduler(1, on_queue_change=on_queue_change)
+
+    await sched.acquire("a")
+    assert sched.priority_queue_depths() == {}
+    assert on_queue_change.mock_calls == []
+
+    tasks = [
+        asyncio.create_task(sched.acquire("a", priority=0)),
+        asyncio.create_task(sched.acquire("b", priority=0)),
+        asyncio.create_task(sched.acquire("c", priority=-1)),
+    ]
+    await asyncio.sleep(0)
+
+    assert sched.priority_queue_depths() == {0: 2, -1: 1}
+    assert len(on_queue_change.mock_calls) == 3
+
+    # Cancelled waiters leave the queue
+    tasks[2].cancel()
+    await asyncio.gather(tasks[2], return_exceptions=True)
+    assert sched.priority_queue_depths() == {0: 2}
+    assert len(on_queue_change.mock_calls) == 4
+
+    sched.release("a")
+    await asyncio.sleep(0)
+    assert sched.priority_queue_depths() == {0: 1}
+    assert len(on_queue_change.mock_calls) == 5
+
+    sched.release("a")
+    await asyncio.sleep(0)
+    assert sched.priority_queue_depths() == {}
+    assert len(on_queue_change.mock_calls) == 6
+
+    sched.release("b")
+    await asyncio.gather(*tasks[:2])
+
+
+async def test_fair_scheduler_cancellation():
+    """Test cancelled waiters leaving the queue without leaking slots."""
+
+    sched = datastructures.FairScheduler(1)
+
+    async def run(destination: str):
+        async with sched(destination=destination):
+            await asyncio.sleep(60)
+
+    await sched.acquire("a")
+
+    task1 = asyncio.create_task(run("a"))
+    task2 = asyncio.create_task(run("b"))
+    await asyncio.sleep(0)
+
+    assert sched.queue_depths() == {"a": 1, "b": 1}
+
+    # A waiting task leaves its queue
+    task1.cancel()
+    await asyncio.sleep(0)
+    assert sched.queue_depths() == {"b": 1}
+
+    # A task cancelled right after being handed a slot releases it
+    sched.release("a")
+    assert sched.in_flight("b") == 1
+    task2.cancel()
+
+    await asyncio.gather(task1, task2, return_exceptions=True)
+
+    assert sched.num_waiting == 0
+    assert sched.value == 1
+    assert "in use:0" in repr(sched)
+
+
+async def test_timer_service():
+    timers = datastructures.TimerService(resolution=0.01)
+    calls = []
+
+    timers.call_later(0.05, calls.append, "b")
+    timer = timers.call_later(0.03, calls.append, "cancelled")
+    timers.call_later(0.02, calls.append, "a")
+    timers.call_later(0.021, calls.append, "a2")
+    assert len(timers) == 4
+
+    timer.cancel()
+    timer.cancel()
+    assert timer.cancelled()
+    assert len(timers) == 3
+
+    await asyncio.sleep(0.035)
+    assert calls == ["a", "a2"]
+
+    await asyncio.sleep(0.03)
+    assert calls == ["a", "a2", "b"]
+    assert len(timers) == 0
+    assert repr(timers) == "<TimerService [timers:0, buckets:0]>"
+
+
+async def test_timer_service_never_early():
+    timers = datastructures.TimerService(resolution=0.05)
+    loop = asyncio.get_running_loop()
+    called_at = []
+
+    start = loop.time()
+    timers.call_at(start + 0.01, lambda: called_at.append(loop.time()))
+
+    await asyncio.sleep(0.12)
+    assert len(called_at) == 1
+    assert start + 0.01 <= called_at[0] <= start + 0.01 + 0.05 + 0.02
+
+
+async def test_timer_service_callback_schedules_earlier():
+    timers = datastructures.TimerService(resolution=0.01)
+    calls = []
+
+    def first():
+        calls.append("first")
+
+        # Schedule a timer that runs after the existing one
+        timers.call_later(0.08, calls.append, "third")
+
+    timers.call_later(0.01, first)
+    timers.call_later(0.04, calls.append, "second")
+
+    await asyncio.sleep(0.06)
+    assert calls == ["first", "second"]
+
+    await asyncio.sleep(0.06)
+    assert calls == ["first", "second", "third"]
+
+
+async def test_timer_service_callback_cancels_timer():
+    timers = datastructures.TimerService(resolution=0.01)
+    calls = []
+
+    def first():
+        calls.append("first")
+        second.cancel()
+
+    timers.call_later(0.01, first)
+    second = timers.call_later(0.01, calls.append, "second")
+
+    await asyncio.sleep(0.03)
+    assert calls == ["first"]
+    assert second.cancelled()
+    assert len(timers) == 0
+
+
+async def test_timer_service_cancel_prunes_buckets():
+    timers = datastructures.TimerService(resolution=0.01)
+    callback = Mock()
+
+    handles = [timers.call_later(1000 + i, callback) for i in range(100)]
+    timers.call_later(0.01, callback)
+
+    for handle in handles:
+        handle.cancel()
+
+    # Far-future buckets are dropped as soon as they are emptied
+    assert len(timers._buckets) == 1
+    assert len(timers._ticks) <= 2 * len(timers._buckets) + 1
+
+    await asyncio.sleep(0.03)
+    assert callback.mock_calls == [call()]
+    assert repr(timers) == "<TimerService [timers:0, buckets:0]>"
+
+
+async def test_timer_service_callback_error(caplog):
+    timers = datastructures.TimerService(resolution=0.01)
+    callback = Mock()
+
+    timers.call_later(0.01, Mock(side_effect=RuntimeError("Uh oh")))
+    timers.call_later(0.01, callback)
+
+    await asyncio.sleep(0.03)
+    assert callback.mock_calls == [call()]
+    assert "Uh oh" in caplog.text
+
+
+async def test_timer_service_sleep():
+    timers = datastructures.get_timer_service()
+    assert datastructures.get_timer_service() is timers
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await timers.sleep(0.02)
+    assert loop.time() - start >= 0.02
+
+    # Cancelled sleeps cancel their timer
+    task = asyncio.create_task(timers.sleep(10))
+    await asyncio.sleep(0)
+    assert len(timers) == 1
+
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert len(timers) == 0
+
+
+class LoopClock:
+    """Event loop clock that only moves forward when advanced."""
+
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    async def advance(self, delay: float) -> None:
+        self.now += delay
+
+        # Let the loop run the timer service and then the timers it fires
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+
+@pytest.fixture
+def loop_clock(event_loop):
+    clock = LoopClock(event_loop.time())
+
+    with patch.object(event_loop, "time", side_effect=clock.time):
+        yield clock
+
+
+async def test_timer_service_runs_early(loop_clock):
+    timers = datastructures.TimerService(resolution=0.01)
+    loop = asyncio.get_running_loop()
+    callback = Mock()
+
+    timer = timers.call_later(0.05, callback)
+    handle = timers._handle
+
+    # The event loop can run a timer handle up to its clock resolution early
+    loop_clock.now = handle.when() - loop._clock_resolution / 2
+    await loop_clock.advance(0)
+
+    assert callback.mock_calls == [call()]
+    assert timer.cancelled()
+    assert timers._handle is None
+
+
+async def test_timer_service_close():
+    timers = datastructures.TimerService(resolution=0.01)
+    callback = Mock()
+
+    timer = timers.call_later(0.01, callback)
+    handle = timers._handle
+
+    timers.close()
+    assert handle.cancelled()
+    assert timer.cancelled()
+    assert len(timers) == 0
+
+    await asyncio.sleep(0.02)
+    assert callback.mock_calls == []
+
+
+def test_timer_service_does_not_keep_loop_alive():
+    loop = asyncio.new_event_loop()
+
+    async def schedule():
+        timers = datastructures.get_timer_service()
+        timers.call_later(0.01, Mock())
+        await asyncio.sleep(0.02)
+
+    loop.run_until_complete(schedule())
+    loop.close()
+
+    loop_ref = weakref.ref(loop)
+    assert loop in datastructures._TIMER_SERVICES
+
+    del loop
+    gc.collect()
+
+    assert loop_ref() is None
+    assert len(datastructures._TIMER_SERVICES) == 0
+
+
+async def test_reschedulable_timeout(loop_clock):
     callback = Mock()
     timeout = datastructures.ReschedulableTimeout(callback)
 
     timeout.reschedule(0.1)
     assert len(callback.mock_calls) == 0
-    await asyncio.sleep(0.09)
+    await loop_clock.advance(0.09)
     assert len(callback.mock_calls) == 0
-    await asyncio.sleep(0.02)
+    await loop_clock.advance(0.02)
     assert len(callback.mock_calls) == 1
 
 
-async def test_reschedulable_timeout_reschedule():
+async def test_reschedulable_timeout_reschedule(loop_clock):
     callback = Mock()
     timeout = datastructures.ReschedulableTimeout(callback)
 
     timeout.reschedule(0.1)
     timeout.reschedule(0.2)
-    await asyncio.sleep(0.19)
+    await loop_clock.advance(0.11)
     assert len(callback.mock_calls) == 0
-    await asyncio.sleep(0.02)
+    await loop_clock.advance(0.08)
+    assert len(callback.mock_calls) == 0
+    await loop_clock.advance(0.02)
     assert len(callback.mock_calls) == 1
 
 
-async def test_reschedulable_timeout_cancel():
+async def test_reschedulable_timeout_cancel(loop_clock):
     callback = Mock()
     timeout = datastructures.ReschedulableTimeout(callback)
 
     timeout.reschedule(0.1)
     assert len(callback.mock_calls) == 0
-    await asyncio.sleep(0.09)
+    await loop_clock.advance(0.09)
     timeout.cancel()
-    await asyncio.sleep(0.02)
+    await loop_clock.advance(0.02)
     assert len(callback.mock_calls) == 0
 
 
@@ -327,6 +719,80 @@ async def test_debouncer():
     assert repr(debouncer) == "<Debouncer [tracked:0]>"
 
 
+async def test_timer_wheel_debouncer():
+    """Test timer wheel debouncer."""
+
+    loop = asyncio.get_running_loop()
+    now = 1000.0
+
+    with patch.object(loop, "time", side_effect=lambda: now):
+        debouncer = datastructures.TimerWheelDebouncer(resolution=1.0)
+        debouncer.clean()
+        assert repr(debouncer) == "<TimerWheelDebouncer [tracked:0]>"
+
+        obj1 = object()
+        assert not debouncer.is_filtered(obj1)
+        assert not debouncer.filter(obj1, expire_in=2)
+        assert debouncer.is_filtered(obj1)
+        assert debouncer.filter(obj1, expire_in=10)
+
+        now = 1001.5
+        obj2 = object()
+        assert not debouncer.filter(obj2, expire_in=0.1)
+        assert debouncer.filter(obj1, expire_in=2)
+        assert debouncer.filter(obj2, expire_in=2)
+        assert repr(debouncer) == "<TimerWheelDebouncer [tracked:2]>"
+
+        # Objects expire at the start of the tick following their expiration time
+        now = 1001.9
+        assert debouncer.is_filtered(obj2)
+
+        now = 1002.0
+        assert debouncer.is_filtered(obj1)
+        assert not debouncer.is_filtered(obj2)
+
+        now = 1003.0
+        assert not debouncer.is_filtered(obj1)
+        assert len(debouncer) == 0
+
+        # Large jumps in time clean up all buckets
+        assert not debouncer.filter(obj1, expire_in=5)
+        assert not debouncer.filter(obj2, expire_in=50)
+
+        now = 2000.0
+        assert not debouncer.is_filtered(obj1)
+        assert not debouncer.is_filtered(obj2)
+        assert not debouncer._buckets
+
+
+async def test_timer_wheel_debouncer_max_size():
+    """Test timer wheel debouncer eviction."""
+
+    loop = asyncio.get_running_loop()
+    now = 1000.0
+
+    with patch.object(loop, "time", side_effect=lambda: now):
+        debouncer = datastructures.TimerWheelDebouncer(resolution=1.0, max_size=2)
+
+        assert not debouncer.filter("a", expire_in=5)
+        assert not debouncer.filter("b", expire_in=1)
+        assert not debouncer.filter("c", expire_in=1)
+        assert len(debouncer) == 2
+
+        # The oldest object was evicted and can be stored again
+        assert not debouncer.filter("a", expire_in=1)
+        assert debouncer.filter("c", expire_in=1)
+
+        # Stale bucket entries do not expire objects stored again later
+        now = 1002.0
+        assert not debouncer.is_filtered("b")
+        assert not debouncer.is_filtered("a")
+        assert not debouncer.filter("b", expire_in=10)
+
+        now = 1006.0
+        assert debouncer.is_filtered("b")
+
+
 async def test_debouncer_low_resolution_clock():
     """Test debouncer with a low resolution clock."""
 
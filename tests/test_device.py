@@ -7,17 +7,19 @@ import pytest
 
 from zigpy import device, endpoint
 import zigpy.application
+import zigpy.config
 import zigpy.exceptions
 import zigpy.ota.image
 from zigpy.profiles import zha
 import zigpy.state
 import zigpy.types as t
 import zigpy.util
-from zigpy.zcl.clusters.general import Basic, Ota
+from zigpy.zcl.clusters.general import Basic, Ota, PollControl
 import zigpy.zcl.foundation as foundation
 from zigpy.zdo import types as zdo_t
 
 from .async_mock import ANY, AsyncMock, MagicMock, int_sentinel, patch, sentinel
+from .conftest import make_node_desc
 
 
 @pytest.fixture
@@ -975,3 +977,161 @@ async def test_debouncing(dev):
             dev.packet_received(new_packet)
 
     assert len(packet_received.mock_calls) == 1
+
+    counters = dev.application.state.device_counters[str(dev.ieee)]
+    assert counters[device.DUPLICATE_PACKETS_COUNTER] == 9
+
+    # Packets with a different payload are not duplicates
+    dev.packet_received(packet.replace(data=t.SerializableBytes(b"\t7\x02\x00")))
+    assert counters[device.DUPLICATE_PACKETS_COUNTER] == 9
+
+
+async def test_debouncing_window(dev):
+    """Test that the deduplication window is configurable."""
+
+    dev._application.config[zigpy.config.CONF_PACKET_DEDUP_WINDOW] = 0
+    dev = device.Device(dev.application, dev.ieee, dev.nwk)
+    dev.add_endpoint(1).add_input_cluster(0x0000)
+
+    packet = t.ZigbeePacket(
+        src=t.AddrModeAddress(addr_mode=t.AddrMode.NWK, address=dev.nwk),
+        src_ep=1,
+        dst=t.AddrModeAddress(addr_mode=t.AddrMode.NWK, address=0x0000),
+        dst_ep=1,
+        tsn=202,
+        profile_id=260,
+        cluster_id=0x0000,
+        data=t.SerializableBytes(b"\x18\xca\x0a\x00\x00\x20\x01"),
+    )
+
+    with patch.object(dev.endpoints[1], "handle_message") as handle_message:
+        dev.packet_received(packet)
+        dev.packet_received(packet)
+
+    assert len(handle_message.mock_calls) == 2
+    assert not dev.application.state.device_counters[str(dev.ieee)]
+
+
+async def test_sleepy_device_deferred_requests(dev):
+    """Test requests to sleepy end devices being held until they wake up."""
+
+    dev._application.config[zigpy.config.CONF_SLEEPY_DEVICE_QUEUE] = True
+    dev.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.EndDevice)
+    dev.add_endpoint(1).add_input_cluster(Basic.cluster_id)
+    dev.application.send_packet = AsyncMock()
+    assert dev.is_sleepy
+
+    def write(tsn: int, attrid: int, value: int) -> bytes:
+        return bytes([0x00, tsn, 0x02, attrid, 0x00, 0x20, value])
+
+    requests = [
+        asyncio.create_task(dev.request(260, 0x0000, 1, 1, 1, write(1, 0x0010, 1))),
+        asyncio.create_task(dev.request(260, 0x0006, 1, 1, 2, b"\x01\x02\x01", False)),
+        asyncio.create_task(dev.request(260, 0x0000, 1, 1, 3, write(3, 0x0010, 2))),
+        asyncio.create_task(dev.request(260, 0x0000, 1, 1, 4, write(4, 0x0011, 3))),
+    ]
+    await asyncio.sleep(0)
+
+    # Nothing is sent while the device sleeps
+    assert len(dev._deferred_requests) == 3
+    assert dev.application.send_packet.call_count == 0
+
+    # Hearing from the device sends the requests, the first write was replaced
+    async def mock_send_packet(packet):
+        if packet.tsn in dev._pending:
+            dev._pending[packet.tsn].result.set_result(packet.tsn)
+
+    dev.application.send_packet.side_effect = mock_send_packet
+    dev.packet_received(
+        t.ZigbeePacket(
+            src=t.AddrModeAddress(addr_mode=t.AddrMode.NWK, address=dev.nwk),
+            src_ep=1,
+            dst=t.AddrModeAddress(addr_mode=t.AddrMode.NWK, address=0x0000),
+            dst_ep=1,
+            tsn=202,
+            profile_id=260,
+            cluster_id=Basic.cluster_id,
+            data=t.SerializableBytes(b"\x18\xca\x0a\x00\x00\x20\x01"),
+        )
+    )
+
+    assert await asyncio.gather(*requests) == [3, None, 3, 4]
+    assert [c.args[0].tsn for c in dev.application.send_packet.mock_calls] == [
+        3,
+        2,
+        4,
+    ]
+    assert len(dev._deferred_requests) == 0
+
+    # The device is still awake
+    await dev.request(260, 0x0006, 1, 1, 5, b"\x01\x05\x01", expect_reply=False)
+    assert dev.application.send_packet.call_count == 4
+
+    # Cancelled requests leave the queue
+    dev.last_seen = datetime(2000, 1, 1, tzinfo=timezone.utc)
+    request = asyncio.create_task(dev.request(260, 0x0006, 1, 1, 6, b"\x01\x06\x01"))
+    await asyncio.sleep(0)
+    assert len(dev._deferred_requests) == 1
+
+    request.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await request
+
+    assert len(dev._deferred_requests) == 0
+
+
+async def test_sleepy_device_deferred_request_timeout(dev):
+    """Test requests not being held for longer than the configured timeout."""
+
+    dev._application.config[zigpy.config.CONF_SLEEPY_DEVICE_QUEUE] = True
+    dev._application.config[zigpy.config.CONF_SLEEPY_DEVICE_QUEUE_TIMEOUT] = 0.05
+    dev.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.EndDevice)
+    dev.application.send_packet = AsyncMock()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await dev.request(260, 0x0006, 1, 1, 1, b"\x01\x01\x01")
+
+    assert len(dev._deferred_requests) == 0
+    assert dev.application.send_packet.call_count == 0
+
+
+async def test_sleepy_device_fast_poll(dev):
+    """Test a Poll Control check-in being used to fast poll until the queue drains."""
+
+    dev._application.config[zigpy.config.CONF_SLEEPY_DEVICE_QUEUE] = True
+    dev._application.config[zigpy.config.CONF_SLEEPY_DEVICE_FAST_POLL] = True
+    dev.node_desc = make_node_desc(logical_type=zdo_t.LogicalType.EndDevice)
+    dev.add_endpoint(1).add_input_cluster(PollControl.cluster_id)
+    dev.application.send_packet = AsyncMock()
+
+    request = asyncio.create_task(
+        dev.request(260, 0x0006, 1, 1, 1, b"\x01\x01\x01", expect_reply=False)
+    )
+    await asyncio.sleep(0)
+    assert dev.application.send_packet.call_count == 0
+
+    dev.packet_received(
+        t.ZigbeePacket(
+            src=t.AddrModeAddress(addr_mode=t.AddrMode.NWK, address=dev.nwk),
+            src_ep=1,
+            dst=t.AddrModeAddress(addr_mode=t.AddrMode.NWK, address=0x0000),
+            dst_ep=1,
+            tsn=0x55,
+            profile_id=260,
+            cluster_id=PollControl.cluster_id,
+            data=t.SerializableBytes(b"\x19\x55\x00"),
+        )
+    )
+
+    await request
+    await dev._deferred_requests._drain_task
+
+    checkin_rsp, sent, fast_poll_stop = [
+        c.args[0] for c in dev.application.send_packet.mock_calls
+    ]
+
+    assert checkin_rsp.cluster_id == PollControl.cluster_id
+    assert checkin_rsp.data.serialize()[1:] == b"\x55\x00\x01\x78\x00"
+    assert sent.tsn == 1
+    assert fast_poll_stop.cluster_id == PollControl.cluster_id
+    assert fast_poll_stop.data.serialize()[2] == 0x01
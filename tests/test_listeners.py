@@ -6,6 +6,7 @@ import pytest
 
 from zigpy import listeners
 from zigpy.zcl import foundation
+import zigpy.zcl
 import zigpy.zcl.clusters.general
 import zigpy.zdo.types as zdo_t
 
@@ -192,3 +193,149 @@ async def test_listener_callback_zdo(caplog):
         assert not listener.resolve(zdo_hdr, zdo_cmd)
 
     assert caplog.text == ""
+
+
+async def test_listener_index():
+    on_off = zigpy.zcl.clusters.general.OnOff.cluster_id
+    ota = zigpy.zcl.clusters.general.Ota.cluster_id
+    default_rsp = foundation.GENERAL_COMMANDS[
+        foundation.GeneralCommand.Default_Response
+    ].schema
+
+    on_listener = listeners.FutureListener(
+        matchers=[on()], future=asyncio.get_running_loop().create_future()
+    )
+    func_listener = listeners.CallbackListener(
+        matchers=[lambda hdr, cmd: True], callback=mock.Mock()
+    )
+    multi_listener = listeners.CallbackListener(
+        matchers=[off(), on()], callback=mock.Mock()
+    )
+    query_listener = listeners.FutureListener(
+        matchers=[query_next_image(manufacturer_code=0x1234)],
+        future=asyncio.get_running_loop().create_future(),
+    )
+    default_rsp_listener = listeners.CallbackListener(
+        matchers=[default_rsp()], callback=mock.Mock()
+    )
+
+    index = listeners.RequestListenerIndex()
+    assert not index
+
+    for listener in (
+        on_listener,
+        func_listener,
+        multi_listener,
+        query_listener,
+        default_rsp_listener,
+    ):
+        index.add(listener)
+
+    assert len(index) == 5
+    assert list(index) == [
+        on_listener,
+        func_listener,
+        multi_listener,
+        query_listener,
+        default_rsp_listener,
+    ]
+
+    with pytest.raises(ValueError):
+        index.add(on_listener)
+
+    # Candidates are returned in registration order. `on` and `query_next_image` have
+    # the same command ID and direction but are defined by different clusters.
+    assert index.candidates(make_hdr(on()), on(), cluster_id=on_off) == [
+        on_listener,
+        func_listener,
+        multi_listener,
+    ]
+    assert index.candidates(
+        make_hdr(query_next_image()), query_next_image(), cluster_id=ota
+    ) == [func_listener, query_listener]
+    assert index.candidates(make_hdr(off()), off(), cluster_id=on_off) == [
+        func_listener,
+        multi_listener,
+    ]
+    assert index.candidates(make_hdr(toggle()), toggle(), cluster_id=on_off) == [
+        func_listener
+    ]
+
+    # General commands can be received on any cluster
+    for cluster_id in (on_off, ota):
+        assert index.candidates(
+            foundation.ZCLHeader.general(
+                tsn=0x12, command_id=foundation.GeneralCommand.Default_Response
+            ),
+            default_rsp(),
+            cluster_id=cluster_id,
+        ) == [func_listener, default_rsp_listener]
+
+    # ZDO commands can only be matched by functions
+    zdo_hdr = zdo_t.ZDOHeader(command_id=zdo_t.ZDOCmd.NWK_addr_req, tsn=0x01)
+    assert index.candidates(zdo_hdr, [0x0000], cluster_id=0x0000) == [func_listener]
+
+    # Unknown ZCL commands are offered to every listener
+    assert index.candidates(make_hdr(on()), b"\x01\x02", cluster_id=on_off) == list(
+        index
+    )
+
+    index.remove(multi_listener)
+    assert multi_listener not in index
+    assert index.candidates(make_hdr(off()), off(), cluster_id=on_off) == [
+        func_listener
+    ]
+    assert index.candidates(make_hdr(on()), on(), cluster_id=on_off) == [
+        on_listener,
+        func_listener,
+    ]
+
+    with pytest.raises(ValueError):
+        index.remove(multi_listener)
+
+    index.remove(func_listener)
+    assert index.candidates(make_hdr(toggle()), toggle(), cluster_id=on_off) == []
+    assert index.candidates(make_hdr(on()), on(), cluster_id=on_off) == [on_listener]
+    assert list(index) == [on_listener, query_listener, default_rsp_listener]
+
+
+def test_command_schema_cluster_ids():
+    assert on.cluster_ids == {zigpy.zcl.clusters.general.OnOff.cluster_id}
+    assert not foundation.GENERAL_COMMANDS[
+        foundation.GeneralCommand.Default_Response
+    ].schema.cluster_ids
+
+    # Schemas inherited by a cluster with another ID are defined by both clusters
+    class TestCluster(zigpy.zcl.Cluster):
+        cluster_id = 0xFC00
+        _skip_registry = True
+
+        class ServerCommandDefs(foundation.BaseCommandDefs):
+            test = foundation.ZCLCommandDef(
+                id=0x00, schema={}, direction=foundation.Direction.Client_to_Server
+            )
+
+    class CustomTestCluster(TestCluster):
+        cluster_id = 0xFC01
+
+    schema = TestCluster.ServerCommandDefs.test.schema
+    assert CustomTestCluster.ServerCommandDefs.test.schema is schema
+    assert schema.cluster_ids == {0xFC00, 0xFC01}
+    assert listeners._command_keys(schema()) == {
+        (0xFC00, 0x00, foundation.Direction.Client_to_Server),
+        (0xFC01, 0x00, foundation.Direction.Client_to_Server),
+    }
+
+    # Clusters without a fixed ID can receive their commands on any cluster ID
+    class RangeCluster(zigpy.zcl.Cluster):
+        cluster_id_range = (0xFC00, 0xFFFF)
+        _skip_registry = True
+
+        class ServerCommandDefs(foundation.BaseCommandDefs):
+            test = foundation.ZCLCommandDef(
+                id=0x00, schema={}, direction=foundation.Direction.Client_to_Server
+            )
+
+    assert listeners._command_keys(RangeCluster.ServerCommandDefs.test.schema()) == {
+        (None, 0x00, foundation.Direction.Client_to_Server)
+    }
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import enum
+import random
 from unittest import mock
 
 import pytest
@@ -955,3 +956,225 @@ def test_frozen_struct():
     assert {frozen, frozen} == {frozen}
     assert frozen == frozen.replace(a=1)
     assert {frozen, frozen, frozen.replace(a=1), frozen.replace(a=2)} == {frozen, frozen.replace(a=2)}
+
+
+def test_deserialize_from(expose_global):
+    @expose_global
+    class Inner(t.Struct):
+        a: t.uint4_t
+        b: t.uint4_t
+        c: t.LVBytes
+
+    class Outer(t.Struct):
+        inner: Inner
+        d: t.uint16_t
+        e: t.uint8_t = t.StructField(optional=True)
+
+    outer = Outer(inner=Inner(a=1, b=2, c=b"xyz"), d=0x1234, e=None)
+    data = b"\xff" + outer.serialize()
+
+    for buffer in (data, memoryview(data)):
+        result, offset = Outer.deserialize_from(buffer, 1)
+        assert result == outer
+        assert offset == len(data)
+
+    assert Outer.deserialize(outer.serialize()) == (outer, b"")
+
+    with pytest.raises(ValueError):
+        Outer.deserialize_from(data[:3], 1)
+
+
+def test_compiled_codec(expose_global):
+    @expose_global
+    class int3s(t.int_t, bits=3):
+        pass
+
+    @expose_global
+    class Flags(t.Struct, t.uint8_t):
+        a: t.uint1_t
+        b: int3s
+        c: t.enum4
+
+    class TestStruct(t.Struct):
+        flags: Flags
+        foo: t.uint16_t
+        bar: t.int24s
+        baz: t.uint16_t_be
+        bits1: t.uint4_t
+        bits2: t.int8s
+        bits3: t.uint4_t
+        extra: t.uint8_t = t.StructField(requires=lambda s: s.foo == 0x1234)
+        data: t.LVBytes
+        tail: t.uint32_t
+        optional: t.uint8_t = t.StructField(optional=True)
+
+    codec = TestStruct._get_codec()
+    assert codec is not None
+
+    s = TestStruct(
+        flags=Flags(a=1, b=-3, c=7),
+        foo=0x1234,
+        bar=-0x123456,
+        baz=0xABCD,
+        bits1=0b1010,
+        bits2=-2,
+        bits3=0b0101,
+        extra=0xAA,
+        data=b"test",
+        tail=0x12345678,
+    )
+
+    data = s.serialize()
+    assert data == s._serialize_generic()
+    assert TestStruct.deserialize(data) == (s, b"")
+    assert TestStruct._deserialize_from_generic(data) == (s, len(data))
+
+    # Optional trailing field
+    s.optional = 0x42
+    data = s.serialize()
+    assert data == s._serialize_generic()
+    assert TestStruct.deserialize(data) == (s, b"")
+
+    # Conditional field
+    s.foo = 0x0000
+    s.extra = None
+    s.optional = None
+    data = s.serialize()
+    assert data == s._serialize_generic()
+    assert TestStruct.deserialize(data) == (s, b"")
+
+    # Errors match the generic code path
+    s.tail = None
+
+    with pytest.raises(ValueError, match="tail"):
+        s.serialize()
+
+    with pytest.raises(ValueError):
+        TestStruct.deserialize(data[:-1])
+
+    with pytest.raises(ValueError):
+        TestStruct._deserialize_from_generic(data[:-1])
+
+
+def test_compiled_codec_fallback(expose_global):
+    class Dynamic(t.Struct):
+        foo: t.uint8_t
+        bar: None = t.StructField(
+            dynamic_type=lambda s: t.uint16_t if s.foo else t.uint8_t
+        )
+
+    assert Dynamic._get_codec() is None
+    assert Dynamic.deserialize(b"\x01\x02\x03\x04") == (
+        Dynamic(foo=1, bar=0x0302),
+        b"\x04",
+    )
+    assert Dynamic(foo=0, bar=5).serialize() == b"\x00\x05"
+
+    @expose_global
+    class OverriddenInt(t.uint8_t):
+        def serialize(self):
+            return b"\xFF"
+
+    class Overridden(t.Struct):
+        foo: OverriddenInt
+        bar: t.uint8_t
+
+    # Integers with custom serialization are not packed
+    assert Overridden(foo=1, bar=2).serialize() == b"\xFF\x02"
+
+
+def test_compiled_codec_zigpy_structs():
+    import zigpy.zcl.foundation as foundation
+    import zigpy.zdo.types as zdo_t
+
+    hdr = foundation.ZCLHeader.general(
+        tsn=0x12, command_id=0x01, manufacturer=0x1234
+    )
+    assert foundation.ZCLHeader.deserialize(hdr.serialize() + b"a") == (hdr, b"a")
+    assert hdr.serialize() == hdr._serialize_generic() == b"\x04\x34\x12\x12\x01"
+
+    node_desc = zdo_t.NodeDescriptor(
+        logical_type=zdo_t.LogicalType.Router,
+        complex_descriptor_available=0,
+        user_descriptor_available=0,
+        reserved=0,
+        aps_flags=0,
+        frequency_band=zdo_t.NodeDescriptor.FrequencyBand.Freq2400MHz,
+        mac_capability_flags=zdo_t.NodeDescriptor.MACCapabilityFlags.AllocateAddress,
+        manufacturer_code=0x1234,
+        maximum_buffer_size=82,
+        maximum_incoming_transfer_size=82,
+        server_mask=0,
+        maximum_outgoing_transfer_size=82,
+        descriptor_capability_field=zdo_t.NodeDescriptor.DescriptorCapability.NONE,
+    )
+
+    data = node_desc.serialize()
+    assert data == node_desc._serialize_generic()
+    assert zdo_t.NodeDescriptor.deserialize(data) == (node_desc, b"")
+
+
+def test_constructor_binding():
+    class TestStruct(t.Struct):
+        foo: t.uint8_t
+        bar: t.uint16_t
+        baz: t.uint8_t
+
+    assert TestStruct(1, 2, 3) == TestStruct(foo=1, bar=2, baz=3)
+    assert TestStruct(1, baz=3) == TestStruct(foo=1, bar=None, baz=3)
+    assert TestStruct().as_dict() == {"foo": None, "bar": None, "baz": None}
+
+    with pytest.raises(TypeError, match="too many positional arguments"):
+        TestStruct(1, 2, 3, 4)
+
+    with pytest.raises(TypeError, match="unexpected keyword argument 'asd'"):
+        TestStruct(asd=1)
+
+    with pytest.raises(TypeError, match="multiple values for argument 'foo'"):
+        TestStruct(1, foo=1)
+
+    # Field names shadowing list methods are still looked up correctly
+    with pytest.raises(TypeError, match="unexpected keyword argument 'append'"):
+        TestStruct(append=1)
+
+
+def test_bitfield_struct_round_trip():
+    rng = random.Random(0)
+    types = [t.uint1_t, t.uint3_t, t.uint4_t, t.uint8_t, t.uint16_t, t.int8s, t.enum2]
+
+    for _ in range(200):
+        annotations = {}
+
+        while not annotations or sum(f._bits for f in annotations.values()) % 8:
+            annotations[f"field{len(annotations)}"] = rng.choice(types)
+
+        TestStruct = type(t.Struct)(
+            "TestStruct", (t.Struct,), {"__annotations__": annotations}
+        )
+
+        values = {
+            name: type_(rng.randint(type_.min_value, type_.max_value))
+            for name, type_ in annotations.items()
+        }
+        s = TestStruct(**values)
+
+        # Compare against the old `Bits` based packing
+        old_chunks = []
+        bitfields = []
+
+        for value in values.values():
+            if not bitfields and value._bits % 8 == 0:
+                old_chunks.append(value.serialize())
+            else:
+                bitfields.append(value)
+
+                if sum(v._bits for v in bitfields) % 8 == 0:
+                    old_chunks.append(t.Bits.from_bitfields(bitfields).serialize())
+                    bitfields = []
+
+        data = b"".join(old_chunks)
+
+        assert s.serialize() == data
+        assert s._serialize_generic() == data
+        assert TestStruct.deserialize(data + b"x") == (s, b"x")
+        assert TestStruct._deserialize_from_generic(data) == (s, len(data))
@@ -1,5 +1,6 @@
 import itertools
 import math
+import random
 import struct
 
 import pytest
@@ -463,6 +464,8 @@ def test_lvlist_types():
     assert anon_lst2._length_type is t.uint8_t
     assert anon_lst2._item_type is t.uint16_t
     assert anon_lst1 is anon_lst2
+    assert t.LVList[t.uint16_t] is anon_lst1
+    assert t.LVList[(t.uint16_t, t.uint8_t)] is anon_lst1
     assert issubclass(t.LVList[t.uint8_t, t.uint16_t], t.LVList[t.uint8_t, t.uint16_t])
     assert not issubclass(
         t.LVList[t.uint16_t, t.uint8_t], t.LVList[t.uint8_t, t.uint16_t]
@@ -614,6 +617,44 @@ def test_eui64_convert():
     assert t.EUI64.convert(None) is None
 
 
+def test_eui64_compat():
+    ieee = t.EUI64.convert("08:07:06:05:04:03:02:01")
+
+    # Compatible with the old list representation
+    assert ieee == [1, 2, 3, 4, 5, 6, 7, 8]
+    assert ieee == t.EUI64([t.uint8_t(i) for i in range(1, 9)])
+    assert ieee != [1, 2, 3, 4, 5, 6, 7, 9]
+    assert ieee != "08:07:06:05:04:03:02:01"
+    assert ieee != (1, 2, 3, 4, 5, 6, 7, 8)
+    assert ieee != b"\x01\x02\x03\x04\x05\x06\x07\x08"
+    assert b"\x01\x02\x03\x04\x05\x06\x07\x08" != ieee
+    assert list(ieee) == [1, 2, 3, 4, 5, 6, 7, 8]
+    assert t.EUI64(ieee) == ieee
+    assert t.ExtendedPanId(ieee) == ieee
+
+    assert repr(ieee) == str(ieee) == f"{ieee}" == "08:07:06:05:04:03:02:01"
+    assert hash(ieee) == hash(t.EUI64(b"\x01\x02\x03\x04\x05\x06\x07\x08"))
+    assert {ieee: 1}[t.EUI64.deserialize(ieee.serialize())[0]] == 1
+    assert type(ieee.serialize()) is bytes
+
+    with pytest.raises(TypeError):
+        ieee[0] = 2
+
+    with pytest.raises(ValueError):
+        t.EUI64([1, 2, 3])
+
+    with pytest.raises(ValueError):
+        t.EUI64.convert("08:07:06:05:04:03:02")
+
+    with pytest.raises(ValueError):
+        t.EUI64.deserialize(b"\x01\x02\x03\x04\x05\x06\x07")
+
+    assert t.EUI64.deserialize_from(memoryview(b"\xAA" + ieee.serialize()), 1) == (
+        ieee,
+        9,
+    )
+
+
 def test_keydata():
     data = b"\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0A\x0B\x0C\x0D\x0E\x0F"
     extra = b"extra"
@@ -828,3 +869,291 @@ def test_serializable_bytes():
 
     with pytest.raises(ValueError):
         t.SerializableBytes([1, 2, 3])
+
+
+def test_serializable_bytes_memoryview():
+    buffer = bytearray(b"\x00test\x00")
+    obj = t.SerializableBytes(memoryview(buffer)[1:5])
+
+    assert obj.serialize() == b"test"
+    assert type(obj.serialize()) is bytes
+
+    # The contents are detached from the original buffer once serialized
+    buffer[1:5] = b"XXXX"
+    assert obj.serialize() == b"test"
+    assert obj == t.SerializableBytes(b"test")
+
+
+@pytest.mark.parametrize(
+    "type_, value",
+    [
+        (t.uint8_t, t.uint8_t(0x12)),
+        (t.int24s, t.int24s(-0x123456)),
+        (t.Single, t.Single(1.5)),
+        (t.LVBytes, t.LVBytes(b"abc")),
+        (t.CharacterString, t.CharacterString("abc")),
+        (t.LVList[t.uint16_t], t.LVList[t.uint16_t]([1, 2, 3])),
+        (t.List[t.uint8_t], t.List[t.uint8_t]([1, 2, 3])),
+        (t.FixedList[t.uint16_t, 2], t.FixedList[t.uint16_t, 2]([1, 2])),
+    ],
+)
+def test_deserialize_from(type_, value):
+    data = b"\xaa\xbb" + value.serialize()
+
+    for buffer in (data, memoryview(data)):
+        result, offset = type_.deserialize_from(buffer, 2)
+        assert result == value
+        assert type(result) is type(value)
+        assert offset == len(data)
+
+        result, offset = t.deserialize_from(type_, buffer, 2)
+        assert result == value
+        assert offset == len(data)
+
+
+def test_deserialize_from_too_short():
+    with pytest.raises(ValueError):
+        t.uint16_t.deserialize_from(b"\x00\x01", 1)
+
+    with pytest.raises(ValueError):
+        t.LVBytes.deserialize_from(memoryview(b"\x00\x05abc"), 1)
+
+
+def test_deserialize_from_legacy_type():
+    class Legacy(t.uint16_t):
+        @classmethod
+        def deserialize(cls, data):
+            assert type(data) is bytes
+            value, data = super().deserialize(data)
+            return cls(value + 1), data
+
+    value, offset = t.deserialize_from(Legacy, memoryview(b"\xaa\x01\x00\xbb"), 1)
+    assert value == 2
+    assert type(value) is Legacy
+    assert offset == 3
+
+    # Subclasses of the legacy type still use its `deserialize` method
+    class SubLegacy(Legacy):
+        pass
+
+    assert t.deserialize_from(SubLegacy, b"\x01\x00", 0) == (2, 2)
+
+
+def test_deserialize_schema_memoryview():
+    data = memoryview(b"\x01\x02\x00\x03abcrest")
+    values, rest = t.deserialize(data, (t.uint8_t, t.uint16_t, t.LVBytes))
+
+    assert values == [1, 2, b"abc"]
+    assert bytes(rest) == b"rest"
+
+
+BITFIELD_TYPES = [
+    t.uint1_t,
+    t.uint2_t,
+    t.uint3_t,
+    t.uint4_t,
+    t.uint5_t,
+    t.uint7_t,
+    t.uint8_t,
+    t.uint16_t,
+    t.int8s,
+    t.enum2,
+    t.bitmap3,
+]
+
+
+def _random_bitfields(rng):
+    """Random sequence of bitfield values ending on a byte boundary."""
+    values = []
+
+    while not values or sum(v._bits for v in values) % 8 != 0:
+        type_ = rng.choice(BITFIELD_TYPES)
+        values.append(type_(rng.randint(type_.min_value, type_.max_value)))
+
+    return values
+
+
+def test_pack_bitfields_compat():
+    rng = random.Random(0)
+
+    for _ in range(1000):
+        values = _random_bitfields(rng)
+        data = t.pack_bitfields(values)
+
+        # Same as the `Bits` based implementation
+        assert data == t.Bits.from_bitfields(values).serialize()
+
+        types = [type(v) for v in values]
+        unpacked = t.unpack_bitfields(types, data)
+        assert unpacked == values
+        assert [type(v) for v in unpacked] == types
+
+        bits, _ = t.Bits.deserialize(data)
+
+        for value in values:
+            expected, bits = type(value).from_bits(bits)
+            assert expected == value
+
+        assert not bits
+
+
+def test_unpack_bitfields_signed():
+    assert t.unpack_bitfields([t.int8s, t.int8s], b"\x80\xFF") == [-1, -128]
+    assert t.pack_bitfields([t.int8s(-1), t.int8s(-128)]) == b"\x80\xFF"
+
+
+def test_bitfields_invalid_length():
+    with pytest.raises(ValueError):
+        t.pack_bitfields([t.uint3_t(0)])
+
+    with pytest.raises(ValueError):
+        t.unpack_bitfields([t.uint3_t], b"\x00")
+
+
+def test_bitfields_custom_bits():
+    class Reversed(t.uint4_t):
+        def bits(self):
+            return super().bits()[::-1]
+
+        @classmethod
+        def from_bits(cls, bits):
+            return super().from_bits(bits[:-4] + bits[-4:][::-1])
+
+    values = [Reversed(0b0001), t.uint4_t(0b0001)]
+    data = t.pack_bitfields(values)
+
+    assert data == t.Bits.from_bitfields(values).serialize() == b"\x18"
+    assert t.unpack_bitfields([Reversed, t.uint4_t], data) == values
+
+
+@pytest.mark.parametrize(
+    "type_",
+    [t.uint8_t, t.int16s, t.uint24_t, t.int32s, t.uint64_t, t.uint16_t_be, t.NWK],
+)
+def test_deserialize_many(type_):
+    rng = random.Random(0)
+    values = [type_(rng.randint(type_.min_value, type_.max_value)) for _ in range(20)]
+    data = b"".join(v.serialize() for v in values)
+
+    result, rest = type_.deserialize_many(data + b"extra", len(values))
+    assert result == values
+    assert all(type(v) is type_ for v in result)
+    assert rest == b"extra"
+
+    assert type_.deserialize_many_from(memoryview(b"x" + data), 5, 1) == (
+        values[:5],
+        1 + 5 * len(values[0].serialize()),
+    )
+
+    with pytest.raises(ValueError):
+        type_.deserialize_many(data[:-1], len(values))
+
+
+def test_deserialize_many_enum():
+    class TestEnum(t.enum8):
+        Member = 0x01
+
+    values, rest = TestEnum.deserialize_many(b"\x01\x02", 2)
+    assert values == [TestEnum.Member, TestEnum(0x02)]
+    assert all(type(v) is TestEnum for v in values)
+    assert rest == b""
+
+    with pytest.raises(TypeError):
+        t.uint4_t.deserialize_many(b"\x00", 2)
+
+
+def test_deserialize_unchecked():
+    n, rest = t.uint16_t.deserialize(b"\xFF\xFFrest")
+    assert n == 0xFFFF
+    assert type(n) is t.uint16_t
+    assert rest == b"rest"
+
+    # Types with their own constructors are still called
+    class CustomInt(t.uint8_t):
+        def __new__(cls, value):
+            return super().__new__(cls, value + 1)
+
+    assert CustomInt.deserialize(b"\x01") == (2, b"")
+
+
+def test_list_deserialize_many():
+    assert t.Relays.deserialize(b"\x02\x34\x12\x78\x56rest") == (
+        [0x1234, 0x5678],
+        b"rest",
+    )
+    assert t.data16.deserialize(b"\x01\x02rest") == ([1, 2], b"rest")
+
+    with pytest.raises(ValueError):
+        t.Relays.deserialize(b"\x02\x34\x12\x78")
+
+
+def _deserialize_items_one_by_one(item_type, data, count=None):
+    """Reference implementation of list decoding, one item at a time."""
+    items = []
+
+    while (count is None and data) or (count is not None and len(items) < count):
+        item, data = item_type.deserialize(data)
+        items.append(item)
+
+    return items, data
+
+
+@pytest.mark.parametrize(
+    "item_type, items",
+    [
+        (t.uint8_t, [0, 1, 255]),
+        (t.int16s, [-32768, 0, 32767]),
+        (t.uint24_t, [0x123456, 0]),
+        (t.uint16_t_be, [0x1234, 0xFFFF]),
+        (t.NWK, [0x0000, 0xFFFD]),
+        (t.Bool, [t.Bool.true, t.Bool.false]),
+        (t.EUI64, [t.EUI64.convert("00:11:22:33:44:55:66:77"), t.EUI64.UNKNOWN]),
+        (t.LVBytes, [b"", b"abc"]),
+        (t.Single, [1.5, -2.0]),
+    ],
+)
+def test_bulk_list_decoding(item_type, items):
+    items = [item_type(i) for i in items]
+    payload = b"".join(i.serialize() for i in items)
+
+    for data in (payload, memoryview(payload)):
+        ref, _ = _deserialize_items_one_by_one(item_type, bytes(data))
+
+        lst, rest = t.List[item_type].deserialize(data)
+        assert lst == ref == items
+        assert [type(i) for i in lst] == [type(i) for i in ref]
+        assert bytes(rest) == b""
+
+        fixed, offset = t.FixedList[item_type, len(items)].deserialize_from(data)
+        assert fixed == ref
+        assert offset == len(payload)
+
+        lv, offset = t.LVList[item_type].deserialize_from(
+            bytes([len(items)]) + bytes(data)
+        )
+        assert lv == ref
+        assert offset == 1 + len(payload)
+
+        assert t.deserialize_many_from(item_type, data, len(items)) == (
+            ref,
+            len(payload),
+        )
+
+    # Truncated data fails the same way
+    if len(items[-1].serialize()) > 1:
+        with pytest.raises(ValueError):
+            t.List[item_type].deserialize(payload[:-1])
+
+    with pytest.raises(ValueError):
+        t.LVList[item_type].deserialize(bytes([len(items)]) + payload[:-1])
+
+
+def test_bulk_list_decoding_overridden():
+    class Legacy(t.uint16_t):
+        @classmethod
+        def deserialize(cls, data):
+            value, data = super().deserialize(data)
+            return cls(value ^ 0xFFFF), data
+
+    assert t.List[Legacy].deserialize(b"\x00\x00\xFF\xFF") == ([0xFFFF, 0x0000], b"")
+    assert t.LVList[Legacy].deserialize(b"\x01\x00\x00") == ([0xFFFF], b"")
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import asyncio
+from datetime import datetime, timezone
+import logging
 from unittest import mock
 
 import pytest
 
 import zigpy.device
 import zigpy.endpoint
+import zigpy.exceptions
 import zigpy.types as t
 import zigpy.zcl as zcl
 import zigpy.zcl.foundation as foundation
@@ -59,6 +62,30 @@ def test_deserialize_cluster_client(endpoint):
     assert hdr.direction == foundation.Direction.Server_to_Client
 
 
+def test_deserialize_decoded_header(endpoint):
+    data = b"\x18\x01\x00\x01\x00"
+    hdr, _ = foundation.ZCLHeader.deserialize(data)
+    assert hdr.direction == foundation.Direction.Server_to_Client
+
+    hdr2, args = endpoint.deserialize(0, data, hdr=hdr)
+    assert list(args) == [[0x0001]]
+
+    # The header passed in is not mutated, a corrected copy is returned instead
+    assert hdr.direction == foundation.Direction.Server_to_Client
+    assert hdr2.direction == foundation.Direction.Client_to_Server
+    assert hdr2.tsn == hdr.tsn
+    assert hdr2.command_id == hdr.command_id
+    assert endpoint.deserialize(0, data) == (hdr2, args)
+
+
+def test_deserialize_decoded_header_manufacturer(endpoint):
+    data = b"\x05\x34\x12\x01\x00xxx"
+    hdr, _ = foundation.ZCLHeader.deserialize(data)
+
+    assert endpoint.deserialize(0, data, hdr=hdr) == endpoint.deserialize(0, data)
+    assert endpoint.deserialize(0, data, hdr=hdr)[0] is hdr
+
+
 def test_deserialize_cluster_unknown(endpoint):
     with pytest.raises(KeyError):
         endpoint.deserialize(0xFF00, b"\x05\x00\x00\x01\x00")
@@ -324,6 +351,70 @@ async def test_read_attributes_default_response(cluster):
     assert failure == {0: 0xC1, 5: 0xC1, 23: 0xC1}
 
 
+async def test_read_attributes_coalesced(cluster):
+    """Concurrent reads are merged into a single request when opted in."""
+
+    async def mockrequest(
+        foundation, command, schema, args, manufacturer=None, **kwargs
+    ):
+        if manufacturer is not None:
+            return [0xC1]
+
+        return [[_mk_rar(attrid, attrid) for attrid in args]]
+
+    cluster.request = AsyncMock(side_effect=mockrequest)
+    cluster.read_attributes_coalesce_window = 0.01
+
+    results = await asyncio.gather(
+        cluster.read_attributes([0, 1]),
+        cluster.read_attributes([1, 2]),
+        cluster.read_attributes([7], manufacturer=0x1234),
+    )
+
+    assert results == [
+        ({0: 0, 1: 1}, {}),
+        ({1: 1, 2: 2}, {}),
+        ({}, {7: 0xC1}),
+    ]
+
+    # One read per manufacturer code, with the union of the attributes
+    assert cluster.request.call_count == 2
+    assert cluster.request.mock_calls[0].args[3] == [0, 1, 2]
+    assert cluster.request.mock_calls[1].args[3] == [7]
+    assert not cluster._coalesced_reads
+
+    # Cancelling one caller does not cancel the shared read
+    read1 = asyncio.create_task(cluster.read_attributes([0]))
+    read2 = asyncio.create_task(cluster.read_attributes([2]))
+    await asyncio.sleep(0)
+    read1.cancel()
+
+    assert await read2 == ({2: 2}, {})
+    assert cluster.request.mock_calls[2].args[3] == [0, 2]
+
+
+async def test_read_attributes_coalesced_response_type(cluster):
+    """Each caller gets a response of the original type with its own records."""
+    schema = zcl.foundation.GENERAL_COMMANDS[
+        zcl.foundation.GeneralCommand.Read_Attributes_rsp
+    ].schema
+
+    cluster.request = AsyncMock(
+        return_value=schema(status_records=[_mk_rar(a, a) for a in (0, 1, 2)])
+    )
+    cluster.read_attributes_coalesce_window = 0.01
+
+    result1, result2 = await asyncio.gather(
+        cluster._read_attributes_coalesced([0, 1]),
+        cluster._read_attributes_coalesced([2]),
+    )
+
+    assert isinstance(result1, schema)
+    assert isinstance(result2, schema)
+    assert [r.attrid for r in result1.status_records] == [0, 1]
+    assert [r.attrid for r in result2.status_records] == [2]
+
+
 async def test_read_attributes_value_normalization_error(cluster):
     async def mockrequest(
         foundation, command, schema, args, manufacturer=None, **kwargs
@@ -382,6 +473,45 @@ async def test_item_access_attributes(cluster):
         cluster.get("no_such_attribute")
 
 
+async def test_deferred_attribute_cache(cluster):
+    """A deferred attribute cache is loaded once, in the background."""
+    loaded = datetime.now(timezone.utc)
+    loader = AsyncMock(
+        return_value=({4: "Manufacturer", 5: "Model"}, {4: loaded, 5: loaded})
+    )
+    cluster._attr_cache_loader = loader
+    cluster.update_attribute(4, "Newer")
+    cluster.update_attribute(5, None)
+
+    assert cluster.get(4) == "Newer"
+    assert cluster.get(5) is None
+    await cluster._wait_attr_cache()
+    await cluster._wait_attr_cache()
+
+    assert loader.await_count == 1
+    assert cluster._attr_cache_loader is None
+    assert cluster.get(4) == "Newer"
+    assert cluster.get(5) is None
+
+
+async def test_deferred_attribute_cache_failure(cluster, caplog):
+    """A failed load of the attribute cache is tried again on next use."""
+    loaded = datetime.now(timezone.utc)
+    loader = AsyncMock(side_effect=[RuntimeError("Uh oh"), ({5: "Model"}, {5: loaded})])
+    cluster._attr_cache_loader = loader
+
+    with caplog.at_level(logging.WARNING):
+        success, _ = await cluster.read_attributes([5], only_cache=True)
+
+    assert success == {}
+    assert "Failed to load the attribute cache" in caplog.text
+    assert cluster._attr_cache_loader is loader
+
+    success, _ = await cluster.read_attributes([5], only_cache=True)
+    assert success == {5: "Model"}
+    assert cluster._attr_cache_loader is None
+
+
 async def test_item_set_attributes(cluster):
     with patch.object(cluster, "write_attributes") as write_mock:
         cluster["model"] = sentinel.model
@@ -565,9 +695,8 @@ async def test_read_attributes_resp_str(cluster):
 
 
 async def test_read_attributes_resp_exc(cluster):
-    with patch.object(foundation.DATA_TYPES, "pytype_to_datatype_id") as mck:
-        mck.side_effect = ValueError
-        await cluster.read_attributes_rsp({"hw_version": 32})
+    # `hw_version` is a `uint8_t`, the value cannot be converted
+    await cluster.read_attributes_rsp({"hw_version": 1000})
     assert cluster._endpoint.reply.call_count == 1
     assert cluster._endpoint.request.call_count == 0
     assert cluster.endpoint.reply.call_args[0][2][-3:] == b"\x03\x00\x86"
@@ -827,6 +956,188 @@ async def test_configure_reporting_multiple_def_rsp(cluster):
     assert cluster.unsupported_attributes == set()
 
 
+def test_split_records():
+    assert zcl._split_records([], [], 10) == [[]]
+    assert zcl._split_records("abcde", [4, 4, 4, 12, 1], 10) == [
+        ["a", "b"],
+        ["c"],
+        ["d"],
+        ["e"],
+    ]
+
+
+def test_read_attributes_raw_signature(cluster):
+    assert not asyncio.iscoroutinefunction(cluster.read_attributes_raw)
+
+
+async def test_read_attributes_split(cluster):
+    """Reads larger than a frame are split over multiple frames."""
+    cluster.endpoint.device.node_desc.maximum_incoming_transfer_size = 10
+    in_flight = max_in_flight = 0
+
+    async def mockrequest(
+        foundation, command, schema, args, manufacturer=None, **kwargs
+    ):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+
+        if 0x0007 in args:
+            unsupported = zcl.foundation.Status.UNSUPPORTED_ATTRIBUTE
+            return [[_mk_rar(0x0007, None, unsupported)]]
+
+        return [[_mk_rar(attrid, attrid) for attrid in args]]
+
+    cluster.request = AsyncMock(side_effect=mockrequest)
+    success, failure = await cluster.read_attributes([0, 1, 2, 3, 4, 5, 7])
+
+    assert [c.args[3] for c in cluster.request.mock_calls] == [
+        [0, 1],
+        [2, 3],
+        [4, 5],
+        [7],
+    ]
+    assert max_in_flight == zcl.MAX_CONCURRENT_SPLIT_REQUESTS
+    assert success == {0: 0, 1: 1, 2: 2, 3: 3, 4: "4", 5: "5"}
+    assert failure == {7: zcl.foundation.Status.UNSUPPORTED_ATTRIBUTE}
+
+    # The radio limits frames as well
+    cluster.endpoint.device.node_desc.maximum_incoming_transfer_size = 82
+    cluster.endpoint.device.application.max_aps_payload_size = 11
+    cluster.request.reset_mock()
+    await cluster.read_attributes([0, 1, 2, 3, 4], allow_cache=False)
+    assert [c.args[3] for c in cluster.request.mock_calls] == [[0, 1, 2], [3, 4]]
+
+    # Reads that fit are not split
+    cluster.request.reset_mock()
+    await cluster.read_attributes([0, 1, 2], allow_cache=False)
+    assert [c.args[3] for c in cluster.request.mock_calls] == [[0, 1, 2]]
+
+    # A default response fails the entire read
+    cluster.endpoint.device.application.max_aps_payload_size = 9
+    cluster.request = AsyncMock(side_effect=[[[_mk_rar(0, 0), _mk_rar(1, 1)]], [0xC1]])
+    success, failure = await cluster.read_attributes([0, 1, 4])
+    assert success == {}
+    assert failure == {0: 0xC1, 1: 0xC1, 4: 0xC1}
+
+
+async def test_read_attributes_split_unknown_limit(cluster):
+    """Reads are not split when no frame size limit is known."""
+    cluster.request = AsyncMock(return_value=[[_mk_rar(a, a) for a in range(50)]])
+    await cluster.read_attributes(list(range(50)))
+    assert cluster.request.await_count == 1
+
+
+async def test_read_attributes_truncated_response(cluster):
+    """Attributes left out of a full response are read again."""
+    schema = zcl.foundation.GENERAL_COMMANDS[
+        zcl.foundation.GeneralCommand.Read_Attributes_rsp
+    ].schema
+
+    cluster.request = AsyncMock(
+        side_effect=[
+            schema(status_records=[_mk_rar(0, 0), _mk_rar(1, 1)]),
+            schema(status_records=[_mk_rar(2, 2)]),
+            schema(status_records=[_mk_rar(3, 3)]),
+        ]
+    )
+    result = await cluster.read_attributes_raw([0, 1, 2, 3])
+
+    assert [c.args[3] for c in cluster.request.mock_calls] == [
+        [0, 1, 2, 3],
+        [2, 3],
+        [3],
+    ]
+    assert isinstance(result, schema)
+    assert [r.attrid for r in result.status_records] == [0, 1, 2, 3]
+
+
+async def test_read_attributes_split_asdu_too_long(cluster):
+    """Requests the radio reports as too large are split in half and retried."""
+    schema = zcl.foundation.GENERAL_COMMANDS[
+        zcl.foundation.GeneralCommand.Read_Attributes_rsp
+    ].schema
+
+    async def mockrequest(
+        foundation, command, schema_, args, manufacturer=None, **kwargs
+    ):
+        if len(args) > 2:
+            raise zigpy.exceptions.DeliveryError(
+                "Too long", status=t.APSStatus.APS_ASDU_TOO_LONG
+            )
+
+        return schema(status_records=[_mk_rar(attrid, attrid) for attrid in args])
+
+    cluster.request = AsyncMock(side_effect=mockrequest)
+    result = await cluster.read_attributes_raw([0, 1, 2, 3, 4])
+
+    assert [c.args[3] for c in cluster.request.mock_calls] == [
+        [0, 1, 2, 3, 4],
+        [0, 1],
+        [2, 3, 4],
+        [2],
+        [3, 4],
+    ]
+    assert isinstance(result, schema)
+    assert [r.attrid for r in result.status_records] == [0, 1, 2, 3, 4]
+
+    # Other delivery errors are not retried
+    cluster.request = AsyncMock(
+        side_effect=zigpy.exceptions.DeliveryError("Failed", status=0xE1)
+    )
+    with pytest.raises(zigpy.exceptions.DeliveryError):
+        await cluster.read_attributes_raw([0, 1, 2, 3, 4])
+    assert cluster.request.await_count == 1
+
+
+async def test_write_attributes_split(cluster):
+    """Large writes are split over multiple frames and their responses merged."""
+    cluster.endpoint.device.node_desc.maximum_incoming_transfer_size = 20
+    success = [
+        zcl.foundation.WriteAttributesStatusRecord(zcl.foundation.Status.SUCCESS)
+    ]
+    failed = zcl.foundation.WriteAttributesStatusRecord(
+        zcl.foundation.Status.READ_ONLY, 0x0011
+    )
+    cluster.request = AsyncMock(side_effect=[[success], [[failed]]])
+
+    result = await cluster.write_attributes(
+        {"location_desc": "0123456789", 0x0011: 1, "device_enabled": True}
+    )
+
+    assert cluster.request.call_count == 2
+    assert result == [[failed]]
+    assert cluster.get("location_desc") == "0123456789"
+    assert cluster.get(0x0011) is None
+    assert cluster.get("device_enabled") == t.Bool.true
+
+    # Everything succeeded
+    cluster.request = AsyncMock(return_value=[success])
+    result = await cluster.write_attributes(
+        {"location_desc": "0123456789", 0x0011: 1, "device_enabled": True}
+    )
+
+    assert cluster.request.call_count == 2
+    assert result == [success]
+
+
+async def test_configure_reporting_multiple_split(cluster):
+    """Large reporting configurations are split over multiple frames."""
+    cluster.endpoint.device.node_desc.maximum_incoming_transfer_size = 20
+    cluster.request = AsyncMock(
+        side_effect=[
+            _mk_cfg_rsp({0: zcl.foundation.Status.SUCCESS}),
+            _mk_cfg_rsp({4: zcl.foundation.Status.UNSUPPORTED_ATTRIBUTE}),
+        ]
+    )
+    await cluster.configure_reporting_multiple({3: (5, 15, 20), 4: (6, 16, 26)})
+
+    assert cluster.request.call_count == 2
+    assert cluster.unsupported_attributes == {4, "manufacturer"}
+
+
 def _mk_cfg_rsp(responses: dict[int, zcl.foundation.Status]):
     """A helper to create a configure response record."""
     cfg_response = zcl.foundation.ConfigureReportingResponse()
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 
 import zigpy.types as t
@@ -321,6 +323,46 @@ def test_frame_header():
     assert isinstance(r, str)
 
 
+@pytest.mark.parametrize("frame_control", range(256))
+def test_frame_header_fast_decoder(frame_control):
+    """Test the fast frame header decoder matches the generic one."""
+    data = bytes([frame_control]) + b"\x5f\x11\xc0\x0a\xaa"
+
+    hdr, rest = foundation.ZCLHeader.deserialize(data)
+    hdr2, rest2 = t.Struct.deserialize.__func__(foundation.ZCLHeader, data)
+
+    assert rest == rest2
+    assert hdr == hdr2
+    assert repr(hdr) == repr(hdr2)
+    assert hdr.serialize() == hdr2.serialize() == data[: -len(rest)]
+    offset = len(hdr2.serialize())
+    assert foundation.ZCLHeader.deserialize_from(data, 0) == (hdr, offset)
+
+    # Headers do not share state
+    hdr.frame_control.direction = foundation.Direction.Client_to_Server
+    assert foundation.ZCLHeader.deserialize(data)[0] == hdr2
+
+
+@pytest.mark.parametrize("data", [b"", b"\x00", b"\x00\x01", b"\x04\x00\x00\x01"])
+def test_frame_header_too_short(data):
+    """Test truncated frame headers."""
+    with pytest.raises(ValueError):
+        foundation.ZCLHeader.deserialize(data)
+
+
+def test_frame_header_with_direction():
+    """Test changing the direction of a header without mutating it."""
+    hdr = foundation.ZCLHeader.general(tsn=0x12, command_id=0x0A, manufacturer=0x1234)
+    assert hdr.with_direction(foundation.Direction.Client_to_Server) is hdr
+
+    hdr2 = hdr.with_direction(foundation.Direction.Server_to_Client)
+    assert hdr2 is not hdr
+    assert hdr.direction == foundation.Direction.Client_to_Server
+    assert hdr2.direction == foundation.Direction.Server_to_Client
+    assert hdr2.replace(frame_control=hdr.frame_control) == hdr
+    assert hdr2.serialize() == b"\x0c\x34\x12\x12\x0a"
+
+
 def test_frame_header_general():
     """Test frame header general command."""
     (tsn, cmd_id, manufacturer) = (0x11, 0x15, 0x3344)
@@ -820,3 +862,53 @@ def test_array():
             ),
         )
     ]
+
+
+def test_data_types_lookup_cache():
+    """Test memoized datatype lookups are invalidated when new types are added."""
+
+    class CustomUint(t.uint16_t):
+        pass
+
+    class CustomType(t.FixedIntType, bits=24, signed=False):
+        pass
+
+    data_types = foundation.DataTypes(dict(foundation.DATA_TYPES))
+
+    assert data_types.pytype_to_datatype_id(CustomUint) == 0x21
+    assert data_types._datatype_id_cache[CustomUint] == 0x21
+    assert data_types.pytype_to_datatype_id(CustomType) == 0xFF
+
+    data_types[0xF0] = ("Custom", CustomType, foundation.Analog)
+    assert data_types.pytype_to_datatype_id(CustomType) == 0xF0
+
+    del data_types[0xF0]
+    assert data_types.pytype_to_datatype_id(CustomType) == 0xFF
+
+    data_types.update({0xF1: ("Custom", CustomType, foundation.Analog)})
+    assert data_types.pytype_to_datatype_id(CustomType) == 0xF1
+
+    assert data_types.pop(0xF1)[1] is CustomType
+    assert data_types.pytype_to_datatype_id(CustomType) == 0xFF
+
+
+def test_attribute_def_datatype_id():
+    """Test the datatype ID is precomputed on attribute definitions."""
+
+    class CustomType(t.FixedIntType, bits=24, signed=False):
+        pass
+
+    attr = foundation.ZCLAttributeDef(id=0x0000, type=t.uint8_t)
+    assert attr.datatype_id == 0x20
+    assert attr.replace(type=t.CharacterString).datatype_id == 0x42
+
+    custom_attr = foundation.ZCLAttributeDef(id=0x0001, type=CustomType)
+    assert custom_attr.datatype_id == 0xFF
+
+    with patch.dict(
+        foundation.DATA_TYPES, {0xF0: ("Custom", CustomType, foundation.Analog)}
+    ):
+        assert custom_attr.datatype_id == 0xF0
+
+    assert custom_attr.datatype_id == 0xFF
+    assert foundation.ZCLAttributeDef(id=0x0002).datatype_id is None
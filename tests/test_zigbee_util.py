@@ -8,7 +8,7 @@ import sys
 
 import pytest
 
-from zigpy import util
+from zigpy import datastructures, util
 from zigpy.exceptions import ControllerException
 from zigpy.types.named import KeyData
 
@@ -600,3 +600,66 @@ async def test_async_iterate_in_chunks() -> None:
         chunks.append(chunk)
 
     assert chunks == [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]]
+
+
+def test_adaptive_concurrency(caplog) -> None:
+    limiter = datastructures.FairScheduler(16)
+    adaptive = util.AdaptiveConcurrency(limiter, min_value=2, max_value=8)
+
+    # The initial limit is clamped to the bounds
+    assert limiter.max_value == 8
+
+    # Failures halve the limit, but only once per window of requests
+    with caplog.at_level(logging.DEBUG):
+        adaptive.on_failure()
+
+    assert limiter.max_value == 4
+    assert "changing limit from 8 to 4 (delivery failure)" in caplog.text
+
+    for _ in range(3):
+        adaptive.on_failure()
+
+    assert limiter.max_value == 4
+
+    adaptive.on_failure()
+    assert limiter.max_value == 2
+
+    # The limit never goes below the minimum
+    for _ in range(10):
+        adaptive.on_failure()
+
+    assert limiter.max_value == 2
+
+    # Each window of successful requests increases the limit by one
+    for _ in range(2 + 3 + 4):
+        adaptive.on_success(0.1)
+
+    assert limiter.max_value == 5
+
+    # Up to the maximum
+    for _ in range(100):
+        adaptive.on_success(0.1)
+
+    assert limiter.max_value == 8
+
+    # Rising latency is treated as congestion
+    while limiter.max_value == 8:
+        adaptive.on_success(1.0)
+
+    assert limiter.max_value == 4
+    assert adaptive.latency > 2 * adaptive.baseline_latency
+    assert "limit:4" in repr(adaptive)
+
+
+@pytest.mark.parametrize(
+    ("min_value", "max_value"),
+    [(0, 8), (4, 2), (0, 0), (-1, 1)],
+)
+def test_adaptive_concurrency_invalid_bounds(min_value, max_value) -> None:
+    limiter = datastructures.FairScheduler(16)
+
+    with pytest.raises(ValueError):
+        util.AdaptiveConcurrency(limiter, min_value=min_value, max_value=max_value)
+
+    # The limiter is left untouched
+    assert limiter.max_value == 16
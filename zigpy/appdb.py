@@ -1,18 +1,29 @@
 from __future__ import annotations
 
 import asyncio
+import collections
 import contextlib
 from datetime import datetime, timedelta, timezone
+import itertools
 import json
 import logging
+import operator
 import re
+import sys
+import time
 import types
-from typing import Any
+from typing import Any, Callable, Iterable
+
+if sys.version_info[:2] < (3, 11):
+    from async_timeout import timeout as asyncio_timeout  # pragma: no cover
+else:
+    from asyncio import timeout as asyncio_timeout  # pragma: no cover
 
 import aiosqlite
 
 import zigpy.appdb_schemas
 import zigpy.backups
+import zigpy.config as conf
 import zigpy.device
 import zigpy.endpoint
 import zigpy.exceptions
@@ -38,6 +49,52 @@ DB_V_REGEX = re.compile(r"(?:_v\d+)?$")
 
 MIN_UPDATE_DELTA = timedelta(seconds=30).total_seconds()
 
+# Queued events are handled in a single transaction, committed once
+GROUP_COMMIT_MAX_EVENTS = 500
+# Time to wait for more events before handling a batch. By default only events that are
+# already queued are batched, so nothing is committed later than it would be otherwise.
+GROUP_COMMIT_DELAY = 0
+
+# Once `CONF_DATABASE_QUEUE_HIGH_WATERMARK` events are queued, events that only update a
+# value are held back and merged with earlier events for the same row until the queue
+# drains below the low watermark. Other events are still queued, there is one merged
+# event per row at most. Once the queue is full, the oldest queued events are dropped.
+
+# Number of leading arguments identifying the row written by a mergeable event, the
+# first one is always the IEEE address of the device
+_MERGEABLE_EVENTS = {
+    "_save_device_last_seen": 1,
+    "_save_attribute": 5,
+}
+
+COUNTERS_DATABASE = "database"
+
+_BATCHABLE_HANDLERS: dict[Callable, Callable[..., tuple[str, dict[str, Any]]]] = {}
+
+
+def _batchable(statement: Callable[..., tuple[str, dict[str, Any]]]):
+    """Mark an event handler that only executes the statement built by `statement`.
+
+    Consecutive events of the handler are executed with a single `executemany`.
+    """
+
+    def decorator(handler):
+        _BATCHABLE_HANDLERS[handler] = statement
+        return handler
+
+    return decorator
+
+
+def _event_ieee(args: tuple) -> t.EUI64 | None:
+    """IEEE address of the device whose rows are written by an event, if any."""
+    if not args:
+        return None
+
+    if isinstance(args[0], t.EUI64):
+        return args[0]
+
+    return getattr(args[0], "ieee", None)
+
 
 def _import_compatible_sqlite3(min_version: tuple[int, int, int]) -> types.ModuleType:
     """Loads an SQLite module with a library version matching the provided constraint."""
@@ -114,6 +171,16 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
         self._db = connection
         self._application = application
         self._callback_handlers: asyncio.Queue = asyncio.Queue()
+        self._in_batch = False
+        self._pending_attributes: dict[tuple, tuple[Any, datetime, bool]] = {}
+        self._attribute_write_handle: asyncio.TimerHandle | None = None
+        self._overflowing = False
+        self._num_dropped_events = 0
+        # Held back events by device, then by the row they write
+        self._merged_events: dict[t.EUI64, dict[tuple, tuple]] = {}
+        self._num_merged_events = 0
+        self._queue_depth = 0
+        self._max_queue_depth = 0
         self.running = False
         self._worker_task = asyncio.create_task(self._worker())
 
@@ -159,28 +226,194 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
     async def _worker(self) -> None:
         """Process request in the received order."""
         while True:
-            cb_name, args = await self._callback_handlers.get()
-            handler = getattr(self, cb_name)
-            assert handler
+            events = [await self._callback_handlers.get()]
+
+            if GROUP_COMMIT_DELAY > 0:
+                await asyncio.sleep(GROUP_COMMIT_DELAY)
+
+            while (
+                len(events) < GROUP_COMMIT_MAX_EVENTS
+                and not self._callback_handlers.empty()
+            ):
+                events.append(self._callback_handlers.get_nowait())
+
             try:
+                if len(events) == 1:
+                    await self._handle_event(*events[0])
+                else:
+                    await self._handle_batch(events)
+            finally:
+                # Merged events are queued before `join()` can see an empty queue
+                low_watermark = self._application.config[
+                    conf.CONF_DATABASE_QUEUE_LOW_WATERMARK
+                ]
+
+                if self._callback_handlers.qsize() <= low_watermark:
+                    self._num_dropped_events = 0
+
+                    if self._overflowing:
+                        LOGGER.debug("Database queue drained below the low watermark")
+                        self._overflowing = False
+                        self._flush_merged_events()
+
+                self._counters["events_handled"].increment(len(events))
+                self._update_queue_depth()
+
+                for _ in events:
+                    self._callback_handlers.task_done()
+
+    async def _handle_event(self, cb_name: str, args: tuple) -> None:
+        handler = getattr(self, cb_name)
+        assert handler
+        try:
+            if self._in_batch:
+                async with self._savepoint():
+                    await handler(*args)
+            else:
                 await handler(*args)
-            except sqlite3.Error as exc:
-                LOGGER.debug(
-                    "Error handling '%s' event with %s params: %s",
-                    cb_name,
-                    args,
-                    str(exc),
-                )
-            except Exception as ex:
-                LOGGER.error(
-                    "Unexpected error while processing %s(%s): %s", cb_name, args, ex
-                )
-            self._callback_handlers.task_done()
+        except sqlite3.Error as exc:
+            self._counters["events_dropped"].increment()
+            LOGGER.debug(
+                "Error handling '%s' event with %s params: %s",
+                cb_name,
+                args,
+                str(exc),
+            )
+        except Exception as ex:
+            self._counters["events_dropped"].increment()
+            LOGGER.error(
+                "Unexpected error while processing %s(%s): %s", cb_name, args, ex
+            )
+
+    async def _handle_batch(self, events: list[tuple[str, tuple]]) -> None:
+        """Handle events in order within a single transaction, committed once.
+
+        Every event runs in its own savepoint: a failing event is rolled back without
+        affecting the rest of the batch. If the transaction itself cannot be committed,
+        it is rolled back and every event is retried on its own.
+        """
+        self._in_batch = True
+
+        try:
+            if not self._db.in_transaction:
+                await self.execute("BEGIN")
+
+            for cb_name, group in itertools.groupby(events, operator.itemgetter(0)):
+                args_list = [args for _, args in group]
+
+                if len(args_list) > 1 and await self._execute_many(cb_name, args_list):
+                    continue
+
+                for args in args_list:
+                    await self._handle_event(cb_name, args)
+
+            await self._commit_events(len(events))
+            return
+        except sqlite3.Error as exc:
+            LOGGER.warning(
+                "Failed to commit %d events, retrying individually: %s",
+                len(events),
+                exc,
+            )
+        finally:
+            self._in_batch = False
+
+        try:
+            await self._db.rollback()
+        except sqlite3.Error as exc:
+            LOGGER.warning(
+                "Failed to roll back, dropping %d events: %s", len(events), exc
+            )
+            self._counters["events_dropped"].increment(len(events))
+            return
+
+        self._counters["events_retried"].increment(len(events))
+
+        for cb_name, args in events:
+            await self._handle_event(cb_name, args)
+
+    async def _execute_many(self, cb_name: str, args_list: list[tuple]) -> bool:
+        """Execute consecutive events of a batchable handler with one statement."""
+        handler = getattr(self, cb_name)
+        statement = _BATCHABLE_HANDLERS.get(getattr(handler, "__func__", None))
+
+        if statement is None:
+            return False
+
+        try:
+            statements = [statement(self, *args) for args in args_list]
+        except Exception:
+            # The events will fail and be logged individually
+            return False
+
+        query = statements[0][0]
+
+        if any(q != query for q, _ in statements):
+            return False
+
+        try:
+            async with self._savepoint():
+                await self._db.executemany(query, [params for _, params in statements])
+        except sqlite3.Error as exc:
+            LOGGER.debug(
+                "Error handling %d '%s' events, retrying individually: %s",
+                len(args_list),
+                cb_name,
+                exc,
+            )
+            return False
+
+        return True
+
+    @contextlib.asynccontextmanager
+    async def _savepoint(self):
+        await self.execute("SAVEPOINT event")
+
+        try:
+            yield
+        except BaseException:
+            await self.execute("ROLLBACK TO event")
+            raise
+        finally:
+            await self.execute("RELEASE event")
+
+    async def _commit(self) -> None:
+        """Commit, unless the event is part of a batch committed by the worker."""
+        if not self._in_batch:
+            await self._commit_events(1)
+
+    async def _commit_events(self, num_events: int) -> None:
+        start = time.monotonic()
+        await self._db.commit()
+
+        counters = self._counters
+        counters["commits"].increment()
+        counters["commit_time_ms"].increment(round((time.monotonic() - start) * 1000))
+        counters["events_committed"].increment(num_events)
+
+    @property
+    def _counters(self) -> zigpy.state.CounterGroup:
+        return self._application.state.counters[COUNTERS_DATABASE]
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of events waiting to be written."""
+        return self._callback_handlers.qsize() + self._num_merged_events
 
     async def shutdown(self) -> None:
         """Shutdown connection."""
+        self._write_pending_attributes()
+        self._flush_merged_events()
         self.running = False
-        await self._callback_handlers.join()
+
+        try:
+            async with asyncio_timeout(
+                self._application.config[conf.CONF_DATABASE_SHUTDOWN_TIMEOUT]
+            ):
+                await self._callback_handlers.join()
+        except asyncio.TimeoutError:
+            self._log_unflushed_events()
+
         if not self._worker_task.done():
             self._worker_task.cancel()
 
@@ -199,8 +432,127 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
         if not self.running:
             LOGGER.debug("Discarding %s event", cb_name)
             return
+
+        counters = self._counters
+        counters["events_queued"].increment()
+        high_watermark = self._application.config[
+            conf.CONF_DATABASE_QUEUE_HIGH_WATERMARK
+        ]
+
+        if not self._overflowing and self._callback_handlers.qsize() >= high_watermark:
+            LOGGER.warning(
+                "Database queue is above the high watermark (%d events), merging events",
+                high_watermark,
+            )
+            self._overflowing = True
+
+        if self._overflowing and cb_name in _MERGEABLE_EVENTS:
+            self._merge_event(cb_name, args)
+        else:
+            if self._overflowing:
+                counters["events_overflowed"].increment()
+
+                # Held back events for the same device must still be written first
+                ieee = _event_ieee(args)
+
+                if ieee is not None:
+                    self._flush_merged_events(ieee)
+
+            self._put_event(cb_name, args)
+
+        self._update_queue_depth()
+
+    def _put_event(self, cb_name: str, args: tuple) -> None:
+        """Queue an event, dropping the oldest queued event if the queue is full."""
+        max_size = self._application.config[conf.CONF_DATABASE_QUEUE_MAX_SIZE]
+
+        while self._callback_handlers.qsize() >= max_size:
+            dropped_name, _ = self._callback_handlers.get_nowait()
+            self._callback_handlers.task_done()
+            self._counters["events_dropped"].increment()
+            self._num_dropped_events += 1
+
+            if self._num_dropped_events == 1:
+                LOGGER.warning(
+                    "Database queue is full (%d events), dropping the oldest events",
+                    max_size,
+                )
+            else:
+                LOGGER.debug("Dropping %s event", dropped_name)
+
         self._callback_handlers.put_nowait((cb_name, args))
 
+    def _log_unflushed_events(self) -> None:
+        """Log the events that could not be written before shutting down."""
+        unflushed: collections.Counter[str] = collections.Counter()
+
+        while not self._callback_handlers.empty():
+            cb_name, _ = self._callback_handlers.get_nowait()
+            self._callback_handlers.task_done()
+            unflushed[cb_name] += 1
+
+        self._counters["events_unflushed"].increment(sum(unflushed.values()))
+        self._update_queue_depth()
+
+        LOGGER.warning(
+            "Timed out writing to the database, %d events were not written: %s",
+            sum(unflushed.values()),
+            ", ".join(f"{name} ({count})" for name, count in unflushed.most_common()),
+        )
+
+    def _update_queue_depth(self) -> None:
+        """Publish the current and maximum queue depth."""
+        counters = self._counters
+        queue_depth = self.queue_depth
+
+        # Counters only count up, replace the counter instead of registering a reset
+        if queue_depth < self._queue_depth:
+            counters["queue_depth"] = zigpy.state.Counter(
+                "queue_depth", initial_value=queue_depth
+            )
+        else:
+            counters["queue_depth"].update(queue_depth)
+
+        self._queue_depth = queue_depth
+
+        if queue_depth > self._max_queue_depth:
+            self._max_queue_depth = queue_depth
+            counters["max_queue_depth"].update(queue_depth)
+
+    def _merge_event(self, cb_name: str, args: tuple) -> None:
+        """Replace the held back event writing the same row, last write wins."""
+        key = (cb_name, *args[: _MERGEABLE_EVENTS[cb_name]])
+        device_events = self._merged_events.setdefault(args[0], {})
+        merged_args = device_events.pop(key, None)
+
+        if merged_args is None:
+            self._num_merged_events += 1
+        else:
+            self._counters["events_merged"].increment()
+
+            # A changed value must be written, even if it changed back
+            if cb_name == "_save_attribute" and (
+                merged_args[5] != args[5] or merged_args[7:] == (0,)
+            ):
+                args = (*args[:7], 0)
+
+        device_events[key] = args
+
+    def _flush_merged_events(self, ieee: t.EUI64 | None = None) -> None:
+        """Queue held back events, only those of a single device if `ieee` is given."""
+        if ieee is None:
+            merged_events, self._merged_events = self._merged_events, {}
+        elif ieee in self._merged_events:
+            merged_events = {ieee: self._merged_events.pop(ieee)}
+        else:
+            return
+
+        for device_events in merged_events.values():
+            self._num_merged_events -= len(device_events)
+
+            for (cb_name, *_), args in device_events.items():
+                self._put_event(cb_name, args)
+
     async def _set_isolation_level(self, level: str | None):
         """Set the SQLite statement isolation level in a thread-safe way."""
         await self._db._execute(lambda: setattr(self._db, "isolation_level", level))
@@ -221,9 +573,16 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
     def device_joined(self, device: zigpy.typing.DeviceType) -> None:
         self.enqueue("_update_device_nwk", device.ieee, device.nwk)
 
-    async def _update_device_nwk(self, ieee: t.EUI64, nwk: t.NWK) -> None:
-        await self.execute(f"UPDATE devices{DB_V} SET nwk=? WHERE ieee=?", (nwk, ieee))
-        await self._db.commit()
+    def _update_device_nwk_statement(
+        self, ieee: t.EUI64, nwk: t.NWK
+    ) -> tuple[str, dict[str, Any]]:
+        q = f"UPDATE devices{DB_V} SET nwk=:nwk WHERE ieee=:ieee"
+        return q, {"nwk": nwk, "ieee": ieee}
+
+    @_batchable(_update_device_nwk_statement)
+    async def _update_device_nwk(self, *args) -> None:
+        await self.execute(*self._update_device_nwk_statement(*args))
+        await self._commit()
 
     def device_initialized(self, device: zigpy.typing.DeviceType) -> None:
         pass
@@ -237,19 +596,22 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
         """Device last_seen time is updated."""
         self.enqueue("_save_device_last_seen", device.ieee, last_seen)
 
-    async def _save_device_last_seen(self, ieee: t.EUI64, last_seen: datetime) -> None:
+    def _save_device_last_seen_statement(
+        self, ieee: t.EUI64, last_seen: datetime
+    ) -> tuple[str, dict[str, Any]]:
         q = f"""UPDATE devices{DB_V}
                     SET last_seen=:ts
                     WHERE ieee=:ieee AND :ts - last_seen > :min_update_delta"""
-        await self.execute(
-            q,
-            {
-                "ts": last_seen.timestamp(),
-                "ieee": ieee,
-                "min_update_delta": MIN_UPDATE_DELTA,
-            },
-        )
-        await self._db.commit()
+        return q, {
+            "ts": last_seen.timestamp(),
+            "ieee": ieee,
+            "min_update_delta": MIN_UPDATE_DELTA,
+        }
+
+    @_batchable(_save_device_last_seen_statement)
+    async def _save_device_last_seen(self, *args) -> None:
+        await self.execute(*self._save_device_last_seen_statement(*args))
+        await self._commit()
 
     def device_relays_updated(
         self, device: zigpy.typing.DeviceType, relays: t.Relays | None
@@ -266,7 +628,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                         DO UPDATE SET relays=excluded.relays WHERE relays != :relays"""
             await self.execute(q, {"ieee": ieee, "relays": relays.serialize()})
 
-        await self._db.commit()
+        await self._commit()
 
     def attribute_updated(
         self,
@@ -275,20 +637,65 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
         value: Any,
         timestamp: datetime,
     ) -> None:
-        self.enqueue(
-            "_save_attribute",
+        key = (
             cluster.endpoint.device.ieee,
             cluster.endpoint.endpoint_id,
             cluster.cluster_type,
             cluster.cluster_id,
             attrid,
-            value,
-            timestamp,
         )
 
+        # Updates are held for the interval and only the latest value is written
+        interval = self._application.config[conf.CONF_ATTRIBUTE_WRITE_INTERVAL]
+
+        if not self.running or interval <= 0:
+            self.enqueue("_save_attribute", *key, value, timestamp)
+            return
+
+        self._counters["attribute_updates"].increment()
+
+        # An unchanged value is only written if the stored one is older than
+        # `MIN_UPDATE_DELTA`, a value that changed and then changed back is not unchanged
+        changed = False
+
+        if key in self._pending_attributes:
+            pending_value, _, changed = self._pending_attributes[key]
+            changed = changed or pending_value != value
+
+        self._pending_attributes[key] = (value, timestamp, changed)
+
+        if self._attribute_write_handle is None:
+            self._attribute_write_handle = asyncio.get_running_loop().call_later(
+                interval, self._write_pending_attributes
+            )
+
+    def _cancel_attribute_write(self) -> None:
+        if self._attribute_write_handle is not None:
+            self._attribute_write_handle.cancel()
+            self._attribute_write_handle = None
+
+    def _write_pending_attributes(self) -> None:
+        """Enqueue a single write of the latest value of every updated attribute."""
+        self._cancel_attribute_write()
+
+        if not self._pending_attributes:
+            return
+
+        pending, self._pending_attributes = self._pending_attributes, {}
+
+        for key, (value, timestamp, changed) in pending.items():
+            self.enqueue(
+                "_save_attribute",
+                *key,
+                value,
+                timestamp,
+                0 if changed else MIN_UPDATE_DELTA,
+            )
+
+        self._counters["attribute_writes"].increment(len(pending))
+
     def attribute_cleared(self, cluster: zigpy.typing.ClusterType, attrid: int) -> None:
-        self.enqueue(
-            "_clear_attribute",
+        key = (
             cluster.endpoint.device.ieee,
             cluster.endpoint.endpoint_id,
             cluster.cluster_type,
@@ -296,6 +703,13 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
             attrid,
         )
 
+        self._pending_attributes.pop(key, None)
+
+        if not self._pending_attributes:
+            self._cancel_attribute_write()
+
+        self.enqueue("_clear_attribute", *key)
+
     def unsupported_attribute_added(
         self, cluster: zigpy.typing.ClusterType, attrid: int
     ) -> None:
@@ -320,7 +734,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                    ON CONFLICT (ieee, endpoint_id, cluster_type, cluster_id, attr_id)
                    DO NOTHING"""
         await self.execute(q, (ieee, endpoint_id, cluster_type, cluster_id, attrid))
-        await self._db.commit()
+        await self._commit()
 
     def unsupported_attribute_removed(
         self, cluster: zigpy.typing.ClusterType, attrid: int
@@ -348,7 +762,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                                                          AND cluster_id = ?
                                                          AND attr_id = ?"""
         await self.execute(q, (ieee, endpoint_id, cluster_type, cluster_id, attrid))
-        await self._db.commit()
+        await self._commit()
 
     def neighbors_updated(self, ieee: t.EUI64, neighbors: list[zdo_t.Neighbor]) -> None:
         """Neighbor update from Mgmt_Lqi_req."""
@@ -364,7 +778,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
         await self._db.executemany(
             f"INSERT INTO neighbors{DB_V} VALUES (?,?,?,?,?,?,?,?,?,?,?,?)", rows
         )
-        await self._db.commit()
+        await self._commit()
 
     def routes_updated(self, ieee: t.EUI64, routes: list[zdo_t.Route]) -> None:
         """Route update from Mgmt_Rtg_req."""
@@ -378,7 +792,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
         await self._db.executemany(
             f"INSERT INTO routes{DB_V} VALUES (?,?,?,?,?,?,?,?)", rows
         )
-        await self._db.commit()
+        await self._commit()
 
     def group_added(self, group: zigpy.group.Group) -> None:
         """Group is added."""
@@ -389,7 +803,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                     ON CONFLICT (group_id)
                     DO UPDATE SET name=excluded.name"""
         await self.execute(q, (group.group_id, group.name))
-        await self._db.commit()
+        await self._commit()
 
     def group_member_added(
         self, group: zigpy.group.Group, ep: zigpy.typing.EndpointType
@@ -404,7 +818,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                     ON CONFLICT
                     DO NOTHING"""
         await self.execute(q, (group.group_id, *ep.unique_id))
-        await self._db.commit()
+        await self._commit()
 
     def group_member_removed(
         self, group: zigpy.group.Group, ep: zigpy.typing.EndpointType
@@ -419,7 +833,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                                                 AND ieee=?
                                                 AND endpoint_id=?"""
         await self.execute(q, (group.group_id, *ep.unique_id))
-        await self._db.commit()
+        await self._commit()
 
     def group_removed(self, group: zigpy.group.Group) -> None:
         """Called when a group is removed."""
@@ -428,14 +842,23 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
     async def _group_removed(self, group: zigpy.group.Group) -> None:
         q = f"DELETE FROM groups{DB_V} WHERE group_id=?"
         await self.execute(q, (group.group_id,))
-        await self._db.commit()
+        await self._commit()
 
     def device_removed(self, device: zigpy.typing.DeviceType) -> None:
+        self._pending_attributes = {
+            key: pending
+            for key, pending in self._pending_attributes.items()
+            if key[0] != device.ieee
+        }
+
+        if not self._pending_attributes:
+            self._cancel_attribute_write()
+
         self.enqueue("_remove_device", device)
 
     async def _remove_device(self, device: zigpy.typing.DeviceType) -> None:
         await self.execute(f"DELETE FROM devices{DB_V} WHERE ieee = ?", (device.ieee,))
-        await self._db.commit()
+        await self._commit()
 
     def raw_device_initialized(self, device: zigpy.typing.DeviceType) -> None:
         self.enqueue("_save_device", device)
@@ -462,7 +885,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
             await self._save_node_descriptor(device)
 
         if isinstance(device, zigpy.quirks.CustomDevice):
-            await self._db.commit()
+            await self._commit()
             return
 
         await self._save_endpoints(device)
@@ -470,7 +893,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
             await self._save_clusters(ep)
             await self._save_attribute_cache(ep)
             await self._save_unsupported_attributes(ep)
-        await self._db.commit()
+        await self._commit()
 
     async def _save_endpoints(self, device: zigpy.typing.DeviceType) -> None:
         rows = [
@@ -566,7 +989,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                     DO NOTHING"""
         await self._db.executemany(q, clusters)
 
-    async def _save_attribute(
+    def _save_attribute_statement(
         self,
         ieee: t.EUI64,
         endpoint_id: int,
@@ -575,7 +998,8 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
         attrid: int,
         value: Any,
         timestamp: datetime,
-    ) -> None:
+        min_update_delta: float = MIN_UPDATE_DELTA,
+    ) -> tuple[str, dict[str, Any]]:
         q = f"""
             INSERT INTO attributes_cache{DB_V}
             VALUES (:ieee, :endpoint_id, :cluster_type, :cluster_id, :attr_id, :value, :timestamp)
@@ -585,29 +1009,30 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                     value != excluded.value
                     OR :timestamp - last_updated > :min_update_delta
             """
-        await self.execute(
-            q,
-            {
-                "ieee": ieee,
-                "endpoint_id": endpoint_id,
-                "cluster_type": cluster_type,
-                "cluster_id": cluster_id,
-                "attr_id": attrid,
-                "value": value,
-                "timestamp": timestamp.timestamp(),
-                "min_update_delta": MIN_UPDATE_DELTA,
-            },
-        )
-        await self._db.commit()
-
-    async def _clear_attribute(
+        return q, {
+            "ieee": ieee,
+            "endpoint_id": endpoint_id,
+            "cluster_type": cluster_type,
+            "cluster_id": cluster_id,
+            "attr_id": attrid,
+            "value": value,
+            "timestamp": timestamp.timestamp(),
+            "min_update_delta": min_update_delta,
+        }
+
+    @_batchable(_save_attribute_statement)
+    async def _save_attribute(self, *args) -> None:
+        await self.execute(*self._save_attribute_statement(*args))
+        await self._commit()
+
+    def _clear_attribute_statement(
         self,
         ieee: t.EUI64,
         endpoint_id: int,
         cluster_type: ClusterType,
         cluster_id: int,
         attrid: int,
-    ) -> None:
+    ) -> tuple[str, dict[str, Any]]:
         q = f"""
             DELETE FROM attributes_cache{DB_V}
             WHERE
@@ -617,18 +1042,18 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                 AND cluster_id = :cluster_id
                 AND attr_id = :attr_id
             """
-
-        await self.execute(
-            q,
-            {
-                "ieee": ieee,
-                "endpoint_id": endpoint_id,
-                "cluster_type": cluster_type,
-                "cluster_id": cluster_id,
-                "attr_id": attrid,
-            },
-        )
-        await self._db.commit()
+        return q, {
+            "ieee": ieee,
+            "endpoint_id": endpoint_id,
+            "cluster_type": cluster_type,
+            "cluster_id": cluster_id,
+            "attr_id": attrid,
+        }
+
+    @_batchable(_clear_attribute_statement)
+    async def _clear_attribute(self, *args) -> None:
+        await self.execute(*self._clear_attribute_statement(*args))
+        await self._commit()
 
     def network_backup_created(self, backup: zigpy.backups.NetworkBackup) -> None:
         self.enqueue("_network_backup_created", json.dumps(backup.as_dict()))
@@ -640,7 +1065,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                         backup_json=excluded.backup_json"""
 
         await self.execute(q, (None, backup_json))
-        await self._db.commit()
+        await self._commit()
 
     def network_backup_removed(self, backup: zigpy.backups.NetworkBackup) -> None:
         self.enqueue("_network_backup_removed", backup.backup_time)
@@ -650,7 +1075,7 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
                     WHERE json_extract(backup_json, '$.backup_time')=?"""
 
         await self.execute(q, (backup_time.isoformat(),))
-        await self._db.commit()
+        await self._commit()
 
     async def load(self) -> None:
         LOGGER.debug("Loading application state")
@@ -675,7 +1100,17 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
             device = zigpy.quirks.get_device(device)
             self._application.devices[device.ieee] = device
 
-        await self._load_attributes()
+        if self._application.config[conf.CONF_LAZY_ATTRIBUTE_CACHE]:
+            preload = self._application.config[conf.CONF_LAZY_ATTRIBUTE_CACHE_PRELOAD]
+
+            if preload:
+                await self._load_attributes(
+                    f"cluster_id IN ({', '.join(str(int(c)) for c in preload)})"
+                )
+
+            self._defer_attributes(preload)
+        else:
+            await self._load_attributes()
         await self._load_unsupported_attributes()
         await self._load_groups()
         await self._load_group_members()
@@ -685,126 +1120,270 @@ class PersistingListener(zigpy.util.CatchingTaskMixin):
         await self._load_network_backups()
         await self._register_device_listeners()
 
+    _ATTRIBUTES_QUERY = f"""
+        SELECT
+            CAST(ieee AS TEXT),
+            endpoint_id,
+            cluster_type,
+            cluster_id,
+            attr_id,
+            value,
+            last_updated
+        FROM attributes_cache{DB_V}
+        """
+
+    async def _fetchall(self, query: str, parameters: tuple = ()) -> list[tuple]:
+        async with self.execute(query, parameters) as cursor:
+            return await cursor.fetchall()
+
+    @staticmethod
+    def _group_attributes(
+        rows: Iterable[tuple],
+    ) -> dict[tuple, tuple[dict[int, Any], dict[int, datetime]]]:
+        """Group cached attribute rows by cluster."""
+        clusters: dict[tuple, tuple[dict[int, Any], dict[int, datetime]]] = {}
+        ieees: dict[str, t.EUI64] = {}
+        fromtimestamp = datetime.fromtimestamp
+
+        for (
+            ieee,
+            endpoint_id,
+            cluster_type,
+            cluster_id,
+            attr_id,
+            value,
+            last_updated,
+        ) in rows:
+            key = (ieee, endpoint_id, cluster_type, cluster_id)
+
+            try:
+                values, timestamps = clusters[key]
+            except KeyError:
+                values, timestamps = clusters[key] = ({}, {})
+
+            values[attr_id] = value
+            timestamps[attr_id] = fromtimestamp(last_updated, timezone.utc)
+
+        # The IEEE column is selected as text, each address is only converted once
+        return {
+            (
+                ieees.get(ieee) or ieees.setdefault(ieee, t.EUI64.convert(ieee)),
+                *key,
+            ): cluster
+            for (ieee, *key), cluster in clusters.items()
+        }
+
     async def _load_attributes(self, filter: str = None) -> None:
+        query = self._ATTRIBUTES_QUERY
+
         if filter:
-            query = f"SELECT * FROM attributes_cache{DB_V} WHERE {filter}"
-        else:
-            query = f"SELECT * FROM attributes_cache{DB_V}"
+            query += f" WHERE {filter}"
 
-        async with self.execute(query) as cursor:
-            async for (
-                ieee,
-                endpoint_id,
-                cluster_type,
-                cluster_id,
-                attr_id,
-                value,
-                last_updated,
-            ) in cursor:
-                dev = self._application.get_device(ieee)
+        clusters = self._group_attributes(await self._fetchall(query))
 
-                # Some quirks create endpoints and clusters that do not exist
-                if endpoint_id not in dev.endpoints:
-                    continue
+        for (ieee, endpoint_id, cluster_type, cluster_id), (
+            values,
+            timestamps,
+        ) in clusters.items():
+            dev = self._application.get_device(ieee)
 
-                ep = dev.endpoints[endpoint_id]
-                clusters = (
-                    ep.in_clusters
-                    if cluster_type == ClusterType.Server
-                    else ep.out_clusters
-                )
+            # Some quirks create endpoints and clusters that do not exist
+            if endpoint_id not in dev.endpoints:
+                continue
 
-                if cluster_id not in clusters:
-                    continue
+            ep = dev.endpoints[endpoint_id]
+            ep_clusters = (
+                ep.in_clusters
+                if cluster_type == ClusterType.Server
+                else ep.out_clusters
+            )
 
-                clusters[cluster_id]._attr_cache[attr_id] = value
-                clusters[cluster_id]._attr_last_updated[
-                    attr_id
-                ] = datetime.fromtimestamp(last_updated, timezone.utc)
-
-                LOGGER.debug(
-                    "[0x%04x:%s:0x%04x] Attribute id: %s value: %s",
-                    dev.nwk,
-                    endpoint_id,
-                    cluster_id,
-                    attr_id,
-                    value,
-                )
+            if cluster_id not in ep_clusters:
+                continue
+
+            ep_clusters[cluster_id]._attr_cache.update(values)
+            ep_clusters[cluster_id]._attr_last_updated.update(timestamps)
+
+            # Populate the device's manufacturer and model attributes
+            if cluster_id == Basic.cluster_id:
+                if Basic.AttributeDefs.manufacturer.id in values:
+                    dev.manufacturer = decode_str_attribute(
+                        values[Basic.AttributeDefs.manufacturer.id]
+                    )
+
+                if Basic.AttributeDefs.model.id in values:
+                    dev.model = decode_str_attribute(
+                        values[Basic.AttributeDefs.model.id]
+                    )
+
+        LOGGER.debug("Loaded cached attributes of %d clusters", len(clusters))
+
+    def _deferred_clusters(
+        self, devices: Iterable[zigpy.typing.DeviceType]
+    ) -> dict[tuple, zigpy.typing.ClusterType]:
+        return {
+            (
+                dev.ieee,
+                ep.endpoint_id,
+                cluster.cluster_type,
+                cluster.cluster_id,
+            ): cluster
+            for dev in devices
+            for ep in dev.non_zdo_endpoints
+            for cluster in itertools.chain(
+                ep.in_clusters.values(), ep.out_clusters.values()
+            )
+            if cluster._attr_cache_loader is not None
+        }
+
+    def _defer_attributes(self, preload: Iterable[int]) -> None:
+        """Load cached attributes of clusters not in `preload` on first use."""
+        preload = set(preload)
+
+        for dev in self._application.devices.values():
+            for ep in dev.non_zdo_endpoints:
+                for cluster in itertools.chain(
+                    ep.in_clusters.values(), ep.out_clusters.values()
+                ):
+                    if cluster.cluster_id not in preload:
+                        cluster._attr_cache_loader = self._load_cluster_attributes
+
+    async def _load_cluster_attributes(
+        self, cluster: zigpy.typing.ClusterType
+    ) -> tuple[dict[int, Any], dict[int, datetime]]:
+        """Load the cached attributes of a single cluster."""
+        start = time.monotonic()
+
+        rows = await self._fetchall(
+            f"""
+            SELECT attr_id, value, last_updated
+            FROM attributes_cache{DB_V}
+            WHERE
+                ieee = ?
+                AND endpoint_id = ?
+                AND cluster_type = ?
+                AND cluster_id = ?
+            """,
+            (
+                cluster.endpoint.device.ieee,
+                cluster.endpoint.endpoint_id,
+                cluster.cluster_type,
+                cluster.cluster_id,
+            ),
+        )
+
+        counters = self._counters
+        counters["lazy_loads"].increment()
+        counters["lazy_load_time_ms"].increment(
+            round((time.monotonic() - start) * 1000)
+        )
+
+        return (
+            {attr_id: value for attr_id, value, _ in rows},
+            {
+                attr_id: datetime.fromtimestamp(last_updated, timezone.utc)
+                for attr_id, _, last_updated in rows
+            },
+        )
 
-                # Populate the device's manufacturer and model attributes
-                if cluster_id == Basic.cluster_id and attr_id == Basic.AttributeDefs.manufacturer.id:
-                    dev.manufacturer = decode_str_attribute(value)
-                elif cluster_id == Basic.cluster_id and attr_id == Basic.AttributeDefs.model.id:
-                    dev.model = decode_str_attribute(value)
+    async def prefetch_attributes(
+        self, devices: Iterable[zigpy.typing.DeviceType] | None = None
+    ) -> None:
+        """Load the cached attributes of devices whose loading was deferred."""
+        if devices is None:
+            clusters = self._deferred_clusters(self._application.devices.values())
+            queries = [(self._ATTRIBUTES_QUERY, ())]
+        else:
+            clusters = self._deferred_clusters(devices)
+            queries = [
+                (f"{self._ATTRIBUTES_QUERY} WHERE ieee = ?", (ieee,))
+                for ieee in {ieee for ieee, *_ in clusters}
+            ]
+
+        if not clusters:
+            return
+
+        grouped = {}
+
+        for query, parameters in queries:
+            grouped.update(
+                self._group_attributes(await self._fetchall(query, parameters))
+            )
+
+        for key, cluster in clusters.items():
+            cluster._attr_cache_loaded(*grouped.get(key, ({}, {})))
 
     async def _load_unsupported_attributes(self) -> None:
         """Load unsuppoted attributes."""
 
-        async with self.execute(
-            f"SELECT * FROM unsupported_attributes{DB_V}"
-        ) as cursor:
-            async for (ieee, endpoint_id, cluster_type, cluster_id, attr_id) in cursor:
-                dev = self._application.get_device(ieee)
+        rows = await self._fetchall(f"SELECT * FROM unsupported_attributes{DB_V}")
 
-                try:
-                    ep = dev.endpoints[endpoint_id]
-                except KeyError:
-                    continue
+        for ieee, endpoint_id, cluster_type, cluster_id, attr_id in rows:
+            dev = self._application.get_device(ieee)
 
-                clusters = (
-                    ep.in_clusters
-                    if cluster_type == ClusterType.Server
-                    else ep.out_clusters
-                )
+            try:
+                ep = dev.endpoints[endpoint_id]
+            except KeyError:
+                continue
 
-                try:
-                    cluster = clusters[cluster_id]
-                except KeyError:
-                    continue
+            clusters = (
+                ep.in_clusters
+                if cluster_type == ClusterType.Server
+                else ep.out_clusters
+            )
+
+            try:
+                cluster = clusters[cluster_id]
+            except KeyError:
+                continue
 
-                cluster.add_unsupported_attribute(attr_id, inhibit_events=True)
+            cluster.add_unsupported_attribute(attr_id, inhibit_events=True)
 
     async def _load_devices(self) -> None:
-        async with self.execute(f"SELECT * FROM devices{DB_V}") as cursor:
-            async for (ieee, nwk, status, last_seen) in cursor:
-                dev = self._application.add_device(ieee, nwk)
-                dev.status = zigpy.device.Status(status)
+        for ieee, nwk, status, last_seen in await self._fetchall(
+            f"SELECT * FROM devices{DB_V}"
+        ):
+            dev = self._application.add_device(ieee, nwk)
+            dev.status = zigpy.device.Status(status)
 
-                if last_seen > 0:
-                    dev.last_seen = last_seen
+            if last_seen > 0:
+                dev.last_seen = last_seen
 
     async def _load_node_descriptors(self) -> None:
-        async with self.execute(f"SELECT * FROM node_descriptors{DB_V}") as cursor:
-            async for (ieee, *fields) in cursor:
-                dev = self._application.get_device(ieee)
-                dev.node_desc = zdo_t.NodeDescriptor(*fields)
-                assert dev.node_desc.is_valid
+        for ieee, *fields in await self._fetchall(
+            f"SELECT * FROM node_descriptors{DB_V}"
+        ):
+            dev = self._application.get_device(ieee)
+            dev.node_desc = zdo_t.NodeDescriptor(*fields)
+            assert dev.node_desc.is_valid
 
     async def _load_endpoints(self) -> None:
-        async with self.execute(f"SELECT * FROM endpoints{DB_V}") as cursor:
-            async for (ieee, epid, profile_id, device_type, status) in cursor:
-                dev = self._application.get_device(ieee)
-                ep = dev.add_endpoint(epid)
-                ep.profile_id = profile_id
-                ep.status = zigpy.endpoint.Status(status)
-
-                if profile_id == zigpy.profiles.zha.PROFILE_ID:
-                    ep.device_type = zigpy.profiles.zha.DeviceType(device_type)
-                elif profile_id == zigpy.profiles.zll.PROFILE_ID:
-                    ep.device_type = zigpy.profiles.zll.DeviceType(device_type)
-                else:
-                    ep.device_type = device_type
+        for ieee, epid, profile_id, device_type, status in await self._fetchall(
+            f"SELECT * FROM endpoints{DB_V}"
+        ):
+            dev = self._application.get_device(ieee)
+            ep = dev.add_endpoint(epid)
+            ep.profile_id = profile_id
+            ep.status = zigpy.endpoint.Status(status)
+
+            if profile_id == zigpy.profiles.zha.PROFILE_ID:
+                ep.device_type = zigpy.profiles.zha.DeviceType(device_type)
+            elif profile_id == zigpy.profiles.zll.PROFILE_ID:
+                ep.device_type = zigpy.profiles.zll.DeviceType(device_type)
+            else:
+                ep.device_type = device_type
 
     async def _load_clusters(self) -> None:
-        async with self.execute(f"SELECT * FROM clusters{DB_V}") as cursor:
-            async for (ieee, endpoint_id, cluster_type, cluster_id) in cursor:
-                dev = self._application.get_device(ieee)
-                ep = dev.endpoints[endpoint_id]
-
-                if ClusterType(cluster_type) == ClusterType.Server:
-                    ep.add_input_cluster(cluster_id)
-                else:
-                    ep.add_output_cluster(cluster_id)
+        for ieee, endpoint_id, cluster_type, cluster_id in await self._fetchall(
+            f"SELECT * FROM clusters{DB_V}"
+        ):
+            dev = self._application.get_device(ieee)
+            ep = dev.endpoints[endpoint_id]
+
+            if ClusterType(cluster_type) == ClusterType.Server:
+                ep.add_input_cluster(cluster_id)
+            else:
+                ep.add_output_cluster(cluster_id)
 
     async def _load_groups(self) -> None:
         async with self.execute(f"SELECT * FROM groups{DB_V}") as cursor:
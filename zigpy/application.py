@@ -4,6 +4,7 @@ import abc
 import asyncio
 import collections
 import contextlib
+import contextvars
 import errno
 import logging
 import os
@@ -23,6 +24,7 @@ import zigpy.appdb
 import zigpy.backups
 import zigpy.config as conf
 import zigpy.const as const
+import zigpy.datastructures
 import zigpy.device
 import zigpy.endpoint
 import zigpy.exceptions
@@ -53,6 +55,27 @@ _R = TypeVar("_R")
 CHANNEL_CHANGE_BROADCAST_DELAY_S = 1.0
 CHANNEL_CHANGE_SETTINGS_RELOAD_DELAY_S = 1.0
 
+PACKET_DEBOUNCER_RESOLUTION = 1.0
+PACKET_DEBOUNCER_MAX_SIZE = 65536
+
+COUNTERS_REQUEST_SCHEDULER = "request_scheduler"
+
+
+_REQUEST_DESTINATION: contextvars.ContextVar[typing.Hashable] = contextvars.ContextVar(
+    "request_destination", default=None
+)
+
+
+@contextlib.contextmanager
+def _request_destination(destination: typing.Hashable) -> typing.Iterator[None]:
+    """Schedule packets sent within the context as requests to `destination`."""
+    token = _REQUEST_DESTINATION.set(destination)
+
+    try:
+        yield
+    finally:
+        _REQUEST_DESTINATION.reset(token)
+
 
 class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
     SCHEMA = conf.CONFIG_SCHEMA
@@ -60,8 +83,12 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
     _watchdog_period: int = 30
     _probe_configs: list[dict[str, Any]] = []
 
+    # Largest APS payload the radio can send in a single frame, if known. Requests
+    # that do not fit are split over multiple frames.
+    max_aps_payload_size: int | None = None
+
     def __init__(self, config: dict) -> None:
-        self.devices: dict[t.EUI64, zigpy.device.Device] = {}
+        self.devices: zigpy.device.DeviceRegistry = zigpy.device.DeviceRegistry()
         self.state: zigpy.state.State = zigpy.state.State()
         self._listeners = {}
         self._config = self.SCHEMA(config)
@@ -73,18 +100,37 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
 
         self._watchdog_task: asyncio.Task | None = None
 
-        self._concurrent_requests_semaphore = zigpy.util.DynamicBoundedSemaphore(
-            self._config[conf.CONF_MAX_CONCURRENT_REQUESTS]
+        self._packet_debouncer = zigpy.datastructures.TimerWheelDebouncer(
+            resolution=PACKET_DEBOUNCER_RESOLUTION,
+            max_size=PACKET_DEBOUNCER_MAX_SIZE,
         )
 
+        self._concurrent_requests_semaphore = zigpy.datastructures.FairScheduler(
+            self._config[conf.CONF_MAX_CONCURRENT_REQUESTS],
+            per_destination=self._config[
+                conf.CONF_MAX_CONCURRENT_REQUESTS_PER_DESTINATION
+            ],
+            aging_interval=self._config[conf.CONF_REQUEST_PRIORITY_AGING] or None,
+            on_queue_change=self._update_scheduler_queue_depths,
+        )
+        self._scheduler_queue_depths: dict[int, int] = {}
+        self._adaptive_concurrency: zigpy.util.AdaptiveConcurrency | None = None
+
+        if self._config[conf.CONF_ADAPTIVE_CONCURRENCY]:
+            self._adaptive_concurrency = zigpy.util.AdaptiveConcurrency(
+                self._concurrent_requests_semaphore,
+                min_value=self._config[conf.CONF_MIN_CONCURRENT_REQUESTS],
+                max_value=self._config[conf.CONF_MAX_CONCURRENT_REQUESTS],
+            )
+
         self.ota = zigpy.ota.OTA(config[conf.CONF_OTA], self)
         self.backups: zigpy.backups.BackupManager = zigpy.backups.BackupManager(self)
         self.topology: zigpy.topology.Topology = zigpy.topology.Topology(self)
 
         self._req_listeners: collections.defaultdict[
-            zigpy.device.Device,
-            collections.deque[zigpy.listeners.BaseRequestListener],
-        ] = collections.defaultdict(lambda: collections.deque([]))
+            zigpy.device.Device | zigpy.listeners.ANY_DEVICE,
+            zigpy.listeners.RequestListenerIndex,
+        ] = collections.defaultdict(zigpy.listeners.RequestListenerIndex)
 
     def create_task(
         self, target: Coroutine[Any, Any, _R], name: str | None = None
@@ -108,6 +154,20 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         await self._dblistener.load()
         self._add_db_listeners()
 
+    async def prefetch_attribute_cache(
+        self, devices: typing.Iterable[zigpy.device.Device] | None = None
+    ) -> None:
+        """Load the attribute caches of devices, all by default, ahead of first use.
+
+        With `lazy_attribute_cache` enabled, every cluster otherwise loads its cache
+        from the database in the background when it is first accessed. Until then,
+        only values updated since startup are available.
+        """
+        if self._dblistener is None:
+            return
+
+        await self._dblistener.prefetch_attributes(devices)
+
     def _add_db_listeners(self):
         if self._dblistener is None:
             return
@@ -434,6 +494,9 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         self.backups.stop_periodic_backups()
         self.topology.stop_periodic_scans()
 
+        for device in self.devices.values():
+            device.cancel_deferred_requests("application is shutting down")
+
         try:
             await self.disconnect()
         except Exception:
@@ -482,6 +545,7 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
             return
 
         dev.cancel_initialization()
+        dev.cancel_deferred_requests("device is being removed")
 
         LOGGER.info("Removing device 0x%04x (%s)", dev.nwk, ieee)
         self.create_task(
@@ -594,6 +658,7 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         except KeyError:
             return
         else:
+            dev.cancel_deferred_requests("device left the network")
             self.listener_event("device_left", dev)
 
     def handle_relays(self, nwk: t.NWK, relays: list[t.NWK]) -> None:
@@ -752,28 +817,89 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         for endpoint in self.config[conf.CONF_ADDITIONAL_ENDPOINTS]:
             await self.add_endpoint(endpoint)
 
+    def _update_scheduler_queue_depths(self) -> None:
+        """Publish the number of requests waiting to be sent, for every priority."""
+        counters = self.state.counters[COUNTERS_REQUEST_SCHEDULER]
+        depths = self._concurrent_requests_semaphore.priority_queue_depths()
+
+        for priority in self._scheduler_queue_depths.keys() | depths.keys():
+            old_depth = self._scheduler_queue_depths.get(priority, 0)
+            new_depth = self._scheduler_queue_depths[priority] = depths.get(priority, 0)
+
+            if new_depth == old_depth:
+                continue
+
+            try:
+                name = zigpy.util.RequestPriority(priority).name.lower()
+            except ValueError:
+                name = f"priority_{priority}"
+
+            name = f"queue_depth_{name}"
+
+            # Counters only count up, replace the counter instead of registering a reset
+            if new_depth < old_depth:
+                counters[name] = zigpy.state.Counter(name, initial_value=new_depth)
+            else:
+                counters[name].update(new_depth)
+
     @contextlib.asynccontextmanager
-    async def _limit_concurrency(self):
-        """Async context manager to limit global coordinator request concurrency."""
+    async def _limit_concurrency(
+        self, *, destination: typing.Hashable = None, priority: int | None = None
+    ):
+        """Async context manager to limit global coordinator request concurrency.
+
+        Requests are queued per destination and destinations take turns. Unless given,
+        the destination and priority are those of the request being sent. With adaptive
+        concurrency enabled, the outcome and latency of every request adjust the limit.
+        """
 
+        if destination is None:
+            destination = _REQUEST_DESTINATION.get()
+
+        if priority is None:
+            priority = zigpy.util.current_request_priority()
+
+        scheduler = self._concurrent_requests_semaphore
         start_time = time.monotonic()
-        was_locked = self._concurrent_requests_semaphore.locked()
+        was_locked = scheduler.locked() or scheduler.num_waiting > 0
 
         if was_locked:
             LOGGER.debug(
-                "Max concurrency (%s) reached, delaying request (%s enqueued)",
-                self._concurrent_requests_semaphore.max_value,
-                self._concurrent_requests_semaphore.num_waiting,
+                "Max concurrency (%s) reached, delaying request to %s"
+                " (%s enqueued, %s for this destination)",
+                scheduler.max_value,
+                destination,
+                scheduler.num_waiting,
+                scheduler.queue_depth(destination),
             )
 
-        async with self._concurrent_requests_semaphore:
+        async with scheduler(priority=priority, destination=destination):
             if was_locked:
                 LOGGER.debug(
                     "Previously delayed request is now running, delayed by %0.2fs",
                     time.monotonic() - start_time,
                 )
 
-            yield
+            counters = self.state.counters[COUNTERS_REQUEST_SCHEDULER]
+            counters["requests"].increment()
+            counters["delayed"].update(scheduler.num_delayed)
+            counters["aged"].update(scheduler.num_aged)
+            counters["wait_time_ms"].update(round(scheduler.total_wait_time * 1000))
+            counters["max_wait_time_ms"].update(round(scheduler.max_wait_time * 1000))
+
+            if self._adaptive_concurrency is None:
+                yield
+                return
+
+            send_start = time.monotonic()
+
+            try:
+                yield
+            except zigpy.exceptions.DeliveryError:
+                self._adaptive_concurrency.on_failure()
+                raise
+
+            self._adaptive_concurrency.on_success(time.monotonic() - send_start)
 
     @abc.abstractmethod
     async def send_packet(self, packet: t.ZigbeePacket) -> None:
@@ -838,21 +964,22 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         if not expect_reply:
             tx_options |= t.TransmitOptions.ACK
 
-        await self.send_packet(
-            t.ZigbeePacket(
-                src=src,
-                src_ep=src_ep,
-                dst=dst,
-                dst_ep=dst_ep,
-                tsn=sequence,
-                profile_id=profile,
-                cluster_id=cluster,
-                data=t.SerializableBytes(data),
-                extended_timeout=extended_timeout,
-                source_route=source_route,
-                tx_options=tx_options,
+        with _request_destination(device.ieee):
+            await self.send_packet(
+                t.ZigbeePacket(
+                    src=src,
+                    src_ep=src_ep,
+                    dst=dst,
+                    dst_ep=dst_ep,
+                    tsn=sequence,
+                    profile_id=profile,
+                    cluster_id=cluster,
+                    data=t.SerializableBytes(data),
+                    extended_timeout=extended_timeout,
+                    source_route=source_route,
+                    tx_options=tx_options,
+                )
             )
-        )
 
         return (zigpy.zcl.foundation.Status.SUCCESS, "")
 
@@ -882,22 +1009,25 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
                                   of 7 or greater is treated as infinite
         """
 
-        await self.send_packet(
-            t.ZigbeePacket(
-                src=t.AddrModeAddress(
-                    addr_mode=t.AddrMode.NWK, address=self.state.node_info.nwk
-                ),
-                src_ep=src_ep,
-                dst=t.AddrModeAddress(addr_mode=t.AddrMode.Group, address=group_id),
-                tsn=sequence,
-                profile_id=profile,
-                cluster_id=cluster,
-                data=t.SerializableBytes(data),
-                tx_options=t.TransmitOptions.NONE,
-                radius=hops,
-                non_member_radius=non_member_radius,
+        with _request_destination(
+            t.AddrModeAddress(addr_mode=t.AddrMode.Group, address=group_id)
+        ):
+            await self.send_packet(
+                t.ZigbeePacket(
+                    src=t.AddrModeAddress(
+                        addr_mode=t.AddrMode.NWK, address=self.state.node_info.nwk
+                    ),
+                    src_ep=src_ep,
+                    dst=t.AddrModeAddress(addr_mode=t.AddrMode.Group, address=group_id),
+                    tsn=sequence,
+                    profile_id=profile,
+                    cluster_id=cluster,
+                    data=t.SerializableBytes(data),
+                    tx_options=t.TransmitOptions.NONE,
+                    radius=hops,
+                    non_member_radius=non_member_radius,
+                )
             )
-        )
 
         return (zigpy.zcl.foundation.Status.SUCCESS, "")
 
@@ -926,24 +1056,27 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         :param broadcast_address: broadcast address.
         """
 
-        await self.send_packet(
-            t.ZigbeePacket(
-                src=t.AddrModeAddress(
-                    addr_mode=t.AddrMode.NWK, address=self.state.node_info.nwk
-                ),
-                src_ep=src_ep,
-                dst=t.AddrModeAddress(
-                    addr_mode=t.AddrMode.Broadcast, address=broadcast_address
-                ),
-                dst_ep=dst_ep,
-                tsn=sequence,
-                profile_id=profile,
-                cluster_id=cluster,
-                data=t.SerializableBytes(data),
-                tx_options=t.TransmitOptions.NONE,
-                radius=radius,
+        with _request_destination(
+            t.AddrModeAddress(addr_mode=t.AddrMode.Broadcast, address=broadcast_address)
+        ):
+            await self.send_packet(
+                t.ZigbeePacket(
+                    src=t.AddrModeAddress(
+                        addr_mode=t.AddrMode.NWK, address=self.state.node_info.nwk
+                    ),
+                    src_ep=src_ep,
+                    dst=t.AddrModeAddress(
+                        addr_mode=t.AddrMode.Broadcast, address=broadcast_address
+                    ),
+                    dst_ep=dst_ep,
+                    tsn=sequence,
+                    profile_id=profile,
+                    cluster_id=cluster,
+                    data=t.SerializableBytes(data),
+                    tx_options=t.TransmitOptions.NONE,
+                    radius=radius,
+                )
             )
-        )
 
         return (zigpy.zcl.foundation.Status.SUCCESS, "")
 
@@ -996,6 +1129,35 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
     def packet_received(self, packet: t.ZigbeePacket) -> None:
         """Notify zigpy of a received Zigbee packet."""
 
+        self._packet_received(packet, batch=None)
+
+    def packet_received_batch(self, packets: typing.Iterable[t.ZigbeePacket]) -> None:
+        """Notify zigpy of multiple received Zigbee packets at once.
+
+        Each packet is handled completely, in the order they were received, exactly as
+        if it had been passed to `packet_received`. Exceptions propagate the same way
+        and stop the rest of the batch from being handled.
+
+        Listeners implementing `handle_message_batch` opt into receiving a single event
+        with a list of `handle_message` arguments, once the batch has been handled.
+        """
+
+        messages: list[tuple] = []
+
+        try:
+            for packet in packets:
+                self._packet_received(packet, batch=messages)
+        finally:
+            if messages:
+                self.listener_event_batch("handle_message", messages)
+
+    def _packet_received(
+        self, packet: t.ZigbeePacket, *, batch: list[tuple] | None
+    ) -> None:
+        """Handle a received packet, collecting its `handle_message` event arguments
+        into `batch` for listeners that opt into batched events.
+        """
+
         LOGGER.debug("Received a packet: %r", packet)
         assert packet.src is not None
         assert packet.dst is not None
@@ -1004,8 +1166,35 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         if zigpy.zdo.ZDO_ENDPOINT in (packet.src_ep, packet.dst_ep):
             self._maybe_parse_zdo(packet)
 
+        device = self._get_packet_sender(packet)
+
+        if device is None:
+            return
+
+        # Radio libraries may hand us a view of their receive buffer, copy it once
+        data = packet.data.serialize()
+        message = (
+            device,
+            packet.profile_id,
+            packet.cluster_id,
+            packet.src_ep,
+            packet.dst_ep,
+            data,
+        )
+
+        if batch is None:
+            self.listener_event("handle_message", *message)
+        else:
+            self.listener_event_unbatched("handle_message", *message)
+            batch.append(message)
+
+        self._deliver_packet(device, packet, data)
+
+    def _get_packet_sender(self, packet: t.ZigbeePacket) -> zigpy.device.Device | None:
+        """Look up the device that sent a packet, starting discovery if it is unknown."""
+
         try:
-            device = self.get_device_with_address(packet.src)
+            return self.get_device_with_address(packet.src)
         except KeyError:
             LOGGER.warning("Unknown device %r", packet.src)
 
@@ -1016,17 +1205,12 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
                     f"discover_unknown_device_from_packet-nwk={packet.src.address!r}",
                 )
 
-            return
+            return None
 
-        self.listener_event(
-            "handle_message",
-            device,
-            packet.profile_id,
-            packet.cluster_id,
-            packet.src_ep,
-            packet.dst_ep,
-            packet.data.serialize(),
-        )
+    def _deliver_packet(
+        self, device: zigpy.device.Device, packet: t.ZigbeePacket, data: bytes
+    ) -> None:
+        """Pass a received packet to its device, initializing it if necessary."""
 
         if device.is_initialized:
             return device.packet_received(packet)
@@ -1066,7 +1250,7 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
             packet.cluster_id,
             packet.src_ep,
             packet.dst_ep,
-            packet.data.serialize(),
+            data,
         )
 
         # Reload the device device object, in it was replaced by the quirk
@@ -1149,7 +1333,7 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
             callback=callback,
         )
 
-        self._req_listeners[src].append(listener)
+        self._req_listeners[src].add(listener)
 
         try:
             yield
@@ -1169,7 +1353,7 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
             future=asyncio.get_running_loop().create_future(),
         )
 
-        self._req_listeners[src].append(listener)
+        self._req_listeners[src].add(listener)
 
         try:
             yield listener.future
@@ -1280,14 +1464,10 @@ class ControllerApplication(zigpy.util.ListenableMixin, abc.ABC):
         if nwk == self.state.node_info.nwk:
             return self.devices[self.state.node_info.ieee]
 
-        # TODO: Make this not terrible
-        # Unlike its IEEE address, a device's NWK address can change at runtime so this
-        # is not as simple as building a second mapping
-        for dev in self.devices.values():
-            if dev.nwk == nwk:
-                return dev
-
-        raise KeyError(f"Device not found: nwk={nwk!r}, ieee={ieee!r}")
+        try:
+            return self.devices.get_by_nwk(nwk)
+        except KeyError:
+            raise KeyError(f"Device not found: nwk={nwk!r}, ieee={ieee!r}") from None
 
     def get_endpoint_id(self, cluster_id: int, is_server_cluster: bool = False) -> int:
         """Returns coordinator endpoint id for specified cluster id."""
@@ -10,6 +10,7 @@ import logging
 from typing import TYPE_CHECKING, Any
 
 import zigpy.config as conf
+import zigpy.datastructures
 import zigpy.state
 import zigpy.types as t
 from zigpy.util import ListenableMixin
@@ -222,7 +223,7 @@ class BackupManager(ListenableMixin):
                 LOGGER.warning("Failed to create a network backup", exc_info=True)
 
             LOGGER.debug("Waiting for %ss before backing up again", period)
-            await asyncio.sleep(period)
+            await zigpy.datastructures.get_timer_service().sleep(period)
 
     def __getitem__(self, key) -> NetworkBackup:
         return self.backups[key]
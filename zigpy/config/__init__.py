@@ -5,9 +5,19 @@ from __future__ import annotations
 import voluptuous as vol
 
 from zigpy.config.defaults import (
+    CONF_ADAPTIVE_CONCURRENCY_DEFAULT,
+    CONF_ATTRIBUTE_WRITE_INTERVAL_DEFAULT,
+    CONF_DATABASE_QUEUE_HIGH_WATERMARK_DEFAULT,
+    CONF_DATABASE_QUEUE_LOW_WATERMARK_DEFAULT,
+    CONF_DATABASE_QUEUE_MAX_SIZE_DEFAULT,
+    CONF_DATABASE_SHUTDOWN_TIMEOUT_DEFAULT,
     CONF_DEVICE_BAUDRATE_DEFAULT,
     CONF_DEVICE_FLOW_CONTROL_DEFAULT,
+    CONF_LAZY_ATTRIBUTE_CACHE_DEFAULT,
+    CONF_LAZY_ATTRIBUTE_CACHE_PRELOAD_DEFAULT,
     CONF_MAX_CONCURRENT_REQUESTS_DEFAULT,
+    CONF_MAX_CONCURRENT_REQUESTS_PER_DESTINATION_DEFAULT,
+    CONF_MIN_CONCURRENT_REQUESTS_DEFAULT,
     CONF_NWK_BACKUP_ENABLED_DEFAULT,
     CONF_NWK_BACKUP_PERIOD_DEFAULT,
     CONF_NWK_CHANNEL_DEFAULT,
@@ -34,6 +44,11 @@ from zigpy.config.defaults import (
     CONF_OTA_THIRDREALITY_DEFAULT,
     CONF_OTA_Z2M_LOCAL_INDEX_DEFAULT,
     CONF_OTA_Z2M_REMOTE_INDEX_DEFAULT,
+    CONF_PACKET_DEDUP_WINDOW_DEFAULT,
+    CONF_REQUEST_PRIORITY_AGING_DEFAULT,
+    CONF_SLEEPY_DEVICE_FAST_POLL_DEFAULT,
+    CONF_SLEEPY_DEVICE_QUEUE_DEFAULT,
+    CONF_SLEEPY_DEVICE_QUEUE_TIMEOUT_DEFAULT,
     CONF_SOURCE_ROUTING_DEFAULT,
     CONF_STARTUP_ENERGY_SCAN_DEFAULT,
     CONF_TOPO_SCAN_ENABLED_DEFAULT,
@@ -54,12 +69,23 @@ from zigpy.config.validators import (
 import zigpy.types as t
 
 CONF_ADDITIONAL_ENDPOINTS = "additional_endpoints"
+CONF_ATTRIBUTE_WRITE_INTERVAL = "attribute_write_interval"
 CONF_DATABASE = "database_path"
+CONF_DATABASE_QUEUE_HIGH_WATERMARK = "database_queue_high_watermark"
+CONF_DATABASE_QUEUE_LOW_WATERMARK = "database_queue_low_watermark"
+CONF_DATABASE_QUEUE_MAX_SIZE = "database_queue_max_size"
+CONF_DATABASE_SHUTDOWN_TIMEOUT = "database_shutdown_timeout"
 CONF_DEVICE = "device"
 CONF_DEVICE_PATH = "path"
 CONF_DEVICE_BAUDRATE = "baudrate"
 CONF_DEVICE_FLOW_CONTROL = "flow_control"
+CONF_LAZY_ATTRIBUTE_CACHE = "lazy_attribute_cache"
+CONF_LAZY_ATTRIBUTE_CACHE_PRELOAD = "lazy_attribute_cache_preload"
 CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_MAX_CONCURRENT_REQUESTS_PER_DESTINATION = "max_concurrent_requests_per_destination"
+CONF_MIN_CONCURRENT_REQUESTS = "min_concurrent_requests"
+CONF_ADAPTIVE_CONCURRENCY = "adaptive_concurrency"
+CONF_REQUEST_PRIORITY_AGING = "request_priority_aging"
 CONF_NWK = "network"
 CONF_NWK_CHANNEL = "channel"
 CONF_NWK_CHANNELS = "channels"
@@ -94,6 +120,10 @@ CONF_OTA_Z2M_LOCAL_INDEX = "z2m_local_index"
 CONF_OTA_Z2M_REMOTE_INDEX = "z2m_remote_index"
 CONF_OTA_PROVIDER_URL = "url"
 CONF_OTA_PROVIDER_MANUF_IDS = "manufacturer_ids"
+CONF_PACKET_DEDUP_WINDOW = "packet_dedup_window"
+CONF_SLEEPY_DEVICE_FAST_POLL = "sleepy_device_fast_poll"
+CONF_SLEEPY_DEVICE_QUEUE = "sleepy_device_queue"
+CONF_SLEEPY_DEVICE_QUEUE_TIMEOUT = "sleepy_device_queue_timeout"
 CONF_SOURCE_ROUTING = "source_routing"
 CONF_STARTUP_ENERGY_SCAN = "startup_energy_scan"
 CONF_TOPO_SCAN_PERIOD = "topology_scan_period"
@@ -209,6 +239,31 @@ SCHEMA_OTA = {
 ZIGPY_SCHEMA = vol.Schema(
     {
         vol.Optional(CONF_DATABASE, default=None): vol.Any(None, str),
+        vol.Optional(
+            CONF_DATABASE_QUEUE_HIGH_WATERMARK,
+            default=CONF_DATABASE_QUEUE_HIGH_WATERMARK_DEFAULT,
+        ): vol.All(int, vol.Range(min=1)),
+        vol.Optional(
+            CONF_DATABASE_QUEUE_LOW_WATERMARK,
+            default=CONF_DATABASE_QUEUE_LOW_WATERMARK_DEFAULT,
+        ): vol.All(int, vol.Range(min=0)),
+        vol.Optional(
+            CONF_DATABASE_QUEUE_MAX_SIZE, default=CONF_DATABASE_QUEUE_MAX_SIZE_DEFAULT
+        ): vol.All(int, vol.Range(min=1)),
+        vol.Optional(
+            CONF_DATABASE_SHUTDOWN_TIMEOUT,
+            default=CONF_DATABASE_SHUTDOWN_TIMEOUT_DEFAULT,
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(
+            CONF_ATTRIBUTE_WRITE_INTERVAL, default=CONF_ATTRIBUTE_WRITE_INTERVAL_DEFAULT
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(
+            CONF_LAZY_ATTRIBUTE_CACHE, default=CONF_LAZY_ATTRIBUTE_CACHE_DEFAULT
+        ): cv_boolean,
+        vol.Optional(
+            CONF_LAZY_ATTRIBUTE_CACHE_PRELOAD,
+            default=CONF_LAZY_ATTRIBUTE_CACHE_PRELOAD_DEFAULT,
+        ): [cv_hex],
         vol.Optional(CONF_NWK, default={}): SCHEMA_NETWORK,
         vol.Optional(CONF_OTA, default={}): SCHEMA_OTA,
         vol.Optional(
@@ -233,9 +288,35 @@ ZIGPY_SCHEMA = vol.Schema(
         vol.Optional(
             CONF_MAX_CONCURRENT_REQUESTS, default=CONF_MAX_CONCURRENT_REQUESTS_DEFAULT
         ): vol.All(int, vol.Range(min=0)),
+        vol.Optional(
+            CONF_MAX_CONCURRENT_REQUESTS_PER_DESTINATION,
+            default=CONF_MAX_CONCURRENT_REQUESTS_PER_DESTINATION_DEFAULT,
+        ): vol.Any(None, vol.All(int, vol.Range(min=1))),
+        vol.Optional(
+            CONF_MIN_CONCURRENT_REQUESTS, default=CONF_MIN_CONCURRENT_REQUESTS_DEFAULT
+        ): vol.All(int, vol.Range(min=1)),
+        vol.Optional(
+            CONF_ADAPTIVE_CONCURRENCY, default=CONF_ADAPTIVE_CONCURRENCY_DEFAULT
+        ): cv_boolean,
+        vol.Optional(
+            CONF_REQUEST_PRIORITY_AGING, default=CONF_REQUEST_PRIORITY_AGING_DEFAULT
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
         vol.Optional(CONF_SOURCE_ROUTING, default=CONF_SOURCE_ROUTING_DEFAULT): (
             cv_boolean
         ),
+        vol.Optional(
+            CONF_SLEEPY_DEVICE_QUEUE, default=CONF_SLEEPY_DEVICE_QUEUE_DEFAULT
+        ): cv_boolean,
+        vol.Optional(
+            CONF_SLEEPY_DEVICE_QUEUE_TIMEOUT,
+            default=CONF_SLEEPY_DEVICE_QUEUE_TIMEOUT_DEFAULT,
+        ): vol.All(vol.Coerce(float), vol.Range(min=1)),
+        vol.Optional(
+            CONF_SLEEPY_DEVICE_FAST_POLL, default=CONF_SLEEPY_DEVICE_FAST_POLL_DEFAULT
+        ): cv_boolean,
+        vol.Optional(
+            CONF_PACKET_DEDUP_WINDOW, default=CONF_PACKET_DEDUP_WINDOW_DEFAULT
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
         vol.Optional(
             CONF_STARTUP_ENERGY_SCAN, default=CONF_STARTUP_ENERGY_SCAN_DEFAULT
         ): cv_boolean,
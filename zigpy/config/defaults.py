@@ -6,6 +6,17 @@ CONF_DEVICE_BAUDRATE_DEFAULT = 115200
 CONF_DEVICE_FLOW_CONTROL_DEFAULT = None
 CONF_STARTUP_ENERGY_SCAN_DEFAULT = True
 CONF_MAX_CONCURRENT_REQUESTS_DEFAULT = 8
+CONF_MAX_CONCURRENT_REQUESTS_PER_DESTINATION_DEFAULT = None  # no limit
+CONF_MIN_CONCURRENT_REQUESTS_DEFAULT = 1
+CONF_ADAPTIVE_CONCURRENCY_DEFAULT = False
+CONF_ATTRIBUTE_WRITE_INTERVAL_DEFAULT = 0  # seconds, 0 writes every update
+CONF_DATABASE_QUEUE_HIGH_WATERMARK_DEFAULT = 10_000
+CONF_DATABASE_QUEUE_LOW_WATERMARK_DEFAULT = 5_000
+CONF_DATABASE_QUEUE_MAX_SIZE_DEFAULT = 50_000
+CONF_DATABASE_SHUTDOWN_TIMEOUT_DEFAULT = 30  # seconds
+CONF_REQUEST_PRIORITY_AGING_DEFAULT = 0  # seconds per priority level, 0 disables
+CONF_LAZY_ATTRIBUTE_CACHE_DEFAULT = False
+CONF_LAZY_ATTRIBUTE_CACHE_PRELOAD_DEFAULT: list[int] = []
 CONF_NWK_BACKUP_ENABLED_DEFAULT = True
 CONF_NWK_BACKUP_PERIOD_DEFAULT = 24 * 60  # 24 hours
 CONF_NWK_CHANNEL_DEFAULT = None
@@ -32,7 +43,11 @@ CONF_OTA_SONOFF_DEFAULT = True
 CONF_OTA_THIRDREALITY_DEFAULT = True
 CONF_OTA_Z2M_LOCAL_INDEX_DEFAULT = None
 CONF_OTA_Z2M_REMOTE_INDEX_DEFAULT = None
+CONF_PACKET_DEDUP_WINDOW_DEFAULT = 10  # seconds
 CONF_SOURCE_ROUTING_DEFAULT = False
+CONF_SLEEPY_DEVICE_QUEUE_DEFAULT = False
+CONF_SLEEPY_DEVICE_QUEUE_TIMEOUT_DEFAULT = 2 * 60 * 60  # 2 hours
+CONF_SLEEPY_DEVICE_FAST_POLL_DEFAULT = False
 CONF_TOPO_SCAN_PERIOD_DEFAULT = 4 * 60  # 4 hours
 CONF_TOPO_SCAN_ENABLED_DEFAULT = True
 CONF_TOPO_SKIP_COORDINATOR_DEFAULT = False
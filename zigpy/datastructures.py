@@ -2,11 +2,14 @@
 from __future__ import annotations
 
 import asyncio
+import collections
 import contextlib
 import functools
 import heapq
+import math
 import types
 import typing
+import weakref
 
 
 class WrappedContextManager:
@@ -172,28 +175,567 @@ class PriorityLock(PriorityDynamicBoundedSemaphore):
         raise ValueError("Max value of lock cannot be updated")
 
 
+class FairScheduler:
+    """Concurrency limiter that shares its slots fairly between destinations.
+
+    Waiters are queued per destination. Higher priorities are served first and, within
+    a priority, destinations with waiters are served round-robin. Each destination can
+    also be limited to a number of concurrent slots so that a single slow destination
+    cannot hold all of them. Waiters without a destination are not subject to the
+    per-destination limit.
+
+    With `aging_interval` set, a waiter gains one priority level for every
+    `aging_interval` seconds it has been waiting so that a steady stream of higher
+    priority waiters cannot starve lower priorities.
+
+    `on_queue_change` is called whenever a waiter is queued or leaves the queue.
+    """
+
+    def __init__(
+        self,
+        value: int = 0,
+        per_destination: int | None = None,
+        aging_interval: float | None = None,
+        on_queue_change: typing.Callable[[], None] | None = None,
+    ) -> None:
+        self._max_value: int = value
+        self._in_use: int = 0
+        self._in_flight: dict[typing.Hashable, int] = {}
+        self.per_destination: int | None = per_destination
+        self.aging_interval: float | None = aging_interval
+        self._on_queue_change = on_queue_change
+
+        # Priority -> destination -> waiters, destinations in round-robin order
+        self._queues: dict[
+            int,
+            dict[typing.Hashable, collections.deque[tuple[asyncio.Future, float]]],
+        ] = {}
+        self._num_waiting: int = 0
+        self._priority_depths: dict[int, int] = {}
+
+        self.num_delayed: int = 0
+        self.num_aged: int = 0
+        self.total_wait_time: float = 0.0
+        self.max_wait_time: float = 0.0
+
+    @property
+    def value(self) -> int:
+        return self._max_value - self._in_use
+
+    @property
+    def max_value(self) -> int:
+        return self._max_value
+
+    @max_value.setter
+    def max_value(self, new_value: int) -> None:
+        """Update the scheduler's max value."""
+        if new_value < 0:
+            raise ValueError(f"Semaphore value must be >= 0: {new_value!r}")
+
+        self._max_value = new_value
+        self._dispatch()
+
+    @property
+    def num_waiting(self) -> int:
+        return self._num_waiting
+
+    def in_flight(self, destination: typing.Hashable) -> int:
+        """Number of slots currently held by a destination."""
+        return self._in_flight.get(destination, 0)
+
+    def queue_depth(self, destination: typing.Hashable) -> int:
+        """Number of waiters queued for a destination."""
+        return sum(
+            len(queues[destination])
+            for queues in self._queues.values()
+            if destination in queues
+        )
+
+    def queue_depths(self) -> dict[typing.Hashable, int]:
+        """Number of waiters queued for every destination with waiters."""
+        depths: dict[typing.Hashable, int] = collections.Counter()
+
+        for queues in self._queues.values():
+            for destination, queue in queues.items():
+                depths[destination] += len(queue)
+
+        return dict(depths)
+
+    def priority_queue_depths(self) -> dict[int, int]:
+        """Number of waiters queued for every priority with waiters."""
+        return dict(self._priority_depths)
+
+    def _dequeued(self, priority: int) -> None:
+        self._num_waiting -= 1
+        self._priority_depths[priority] -= 1
+
+        if not self._priority_depths[priority]:
+            del self._priority_depths[priority]
+
+    def locked(self) -> bool:
+        """Returns True if a slot cannot be acquired immediately."""
+        return self._in_use >= self._max_value
+
+    def _can_run(self, destination: typing.Hashable) -> bool:
+        return (
+            destination is None
+            or self.per_destination is None
+            or self._in_flight.get(destination, 0) < self.per_destination
+        )
+
+    def _take(self, destination: typing.Hashable) -> None:
+        self._in_use += 1
+        self._in_flight[destination] = self._in_flight.get(destination, 0) + 1
+
+    def _next_waiter(self) -> tuple[int, typing.Hashable] | None:
+        """Find the priority and destination of the next waiter that can run."""
+        best: tuple[int, typing.Hashable] | None = None
+        best_priority = 0.0
+        highest_priority = None
+        now = None
+
+        for priority in sorted(self._queues, reverse=True):
+            queues = self._queues[priority]
+
+            for destination in queues:
+                if self._can_run(destination):
+                    break
+            else:
+                continue
+
+            if self.aging_interval is None:
+                return priority, destination
+
+            fut, enqueued = queues[destination][0]
+
+            if now is None:
+                now = fut.get_loop().time()
+
+            effective_priority = priority + (now - enqueued) / self.aging_interval
+
+            if best is None:
+                highest_priority = priority
+
+            if best is None or effective_priority > best_priority:
+                best = (priority, destination)
+                best_priority = effective_priority
+
+        # A lower priority waiter has aged past every higher priority one
+        if best is not None and best[0] != highest_priority:
+            self.num_aged += 1
+
+        return best
+
+    def _dispatch(self) -> None:
+        """Hand out free slots to waiting destinations."""
+        dequeued = False
+
+        while self._in_use < self._max_value:
+            waiter = self._next_waiter()
+
+            if waiter is None:
+                break
+
+            priority, destination = waiter
+            queues = self._queues[priority]
+            queue = queues[destination]
+
+            fut, enqueued = queue.popleft()
+            self._dequeued(priority)
+            dequeued = True
+
+            # Move the destination to the back of the round-robin order
+            del queues[destination]
+
+            if queue:
+                queues[destination] = queue
+            elif not queues:
+                del self._queues[priority]
+
+            # The waiter was cancelled and will clean up after itself
+            if fut.done():
+                continue
+
+            wait_time = fut.get_loop().time() - enqueued
+            self.num_delayed += 1
+            self.total_wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+
+            self._take(destination)
+            fut.set_result(None)
+
+        if dequeued and self._on_queue_change is not None:
+            self._on_queue_change()
+
+    def _remove_waiter(
+        self, destination: typing.Hashable, priority: int, entry: tuple
+    ) -> None:
+        queues = self._queues.get(priority, {})
+        queue = queues.get(destination, ())
+
+        if entry not in queue:
+            return
+
+        queue.remove(entry)
+        self._dequeued(priority)
+
+        if not queue:
+            del queues[destination]
+
+        if not queues:
+            del self._queues[priority]
+
+        if self._on_queue_change is not None:
+            self._on_queue_change()
+
+    async def acquire(
+        self, destination: typing.Hashable = None, priority: int = 0
+    ) -> typing.Literal[True]:
+        """Acquire a slot for a destination, waiting for its turn if none are free."""
+        if not self._queues and not self.locked() and self._can_run(destination):
+            self._take(destination)
+            return True
+
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        entry = (fut, loop.time())
+
+        queues = self._queues.setdefault(priority, {})
+        queues.setdefault(destination, collections.deque()).append(entry)
+        self._num_waiting += 1
+        self._priority_depths[priority] = self._priority_depths.get(priority, 0) + 1
+
+        if self._on_queue_change is not None:
+            self._on_queue_change()
+
+        # Slots may be free if every other waiter is held back by its destination
+        self._dispatch()
+
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if not fut.cancelled():
+                # We were handed a slot but were cancelled before we could use it
+                self.release(destination)
+            else:
+                self._remove_waiter(destination, priority, entry)
+
+            raise
+
+        return True
+
+    def release(self, destination: typing.Hashable = None) -> None:
+        """Release a slot held by a destination and wake up the next waiter."""
+        count = self._in_flight.get(destination, 0)
+
+        if count <= 0:
+            raise ValueError("Semaphore released too many times")
+
+        if count == 1:
+            del self._in_flight[destination]
+        else:
+            self._in_flight[destination] = count - 1
+
+        self._in_use -= 1
+        self._dispatch()
+
+    @contextlib.asynccontextmanager
+    async def __call__(
+        self, priority: int = 0, destination: typing.Hashable = None
+    ) -> typing.AsyncIterator[None]:
+        """Allows specifying the priority and destination by calling the scheduler.
+
+        This allows both `async with sched:` and
+        `async with sched(priority=5, destination=ieee):`.
+        """
+        await self.acquire(destination, priority)
+
+        try:
+            yield
+        finally:
+            self.release(destination)
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+        return None
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        self.release()
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} [in use:{self._in_use},"
+            f" max value:{self._max_value}, waiters:{self._num_waiting},"
+            f" destinations:{len(self._in_flight)}]>"
+        )
+
+
 # Backwards compatibility
 DynamicBoundedSemaphore = PriorityDynamicBoundedSemaphore
 
 
+class CoarseTimerHandle:
+    """Handle of a timer scheduled with a `TimerService`."""
+
+    __slots__ = ("_service", "_when", "_tick", "_callback", "_args", "_cancelled")
+
+    def __init__(
+        self,
+        service: TimerService,
+        when: float,
+        tick: int,
+        callback: typing.Callable[..., None],
+        args: tuple[typing.Any, ...],
+    ) -> None:
+        self._service = service
+        self._when = when
+        self._tick = tick
+        self._callback = callback
+        self._args = args
+        self._cancelled = False
+
+    def when(self) -> float:
+        """Time at which the timer was requested to run."""
+        return self._when
+
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        """Cancel the timer. Cancelling a timer that has already run does nothing."""
+        if self._cancelled:
+            return
+
+        self._cancelled = True
+        self._service._remove(self)
+
+    def __repr__(self) -> str:
+        state = " cancelled" if self._cancelled else ""
+        return (
+            f"<{self.__class__.__name__} when={self._when}{state} {self._callback!r}>"
+        )
+
+
+class TimerService:
+    """Coarse-grained timers driven by a single event loop callback.
+
+    Timers are grouped into buckets of `resolution` seconds and the event loop only
+    ever has a single timer handle scheduled, for the earliest bucket. Scheduling and
+    cancelling timers is O(1) and never touches the event loop's own timer heap.
+    Timers never run before the event loop would run them but can run up to
+    `resolution` seconds late.
+    """
+
+    def __init__(
+        self, resolution: float = 0.005, loop: asyncio.AbstractEventLoop | None = None
+    ) -> None:
+        self.resolution = resolution
+
+        # Services are looked up by their loop and must not keep it alive
+        self._loop_ref: weakref.ref[asyncio.AbstractEventLoop] | None = (
+            weakref.ref(loop) if loop is not None else None
+        )
+
+        self._buckets: dict[int, dict[CoarseTimerHandle, None]] = {}
+        self._ticks: list[int] = []
+
+        self._handle: asyncio.TimerHandle | None = None
+        self._handle_tick: int | None = None
+
+    @property
+    def _loop(self) -> asyncio.AbstractEventLoop:
+        loop = self._loop_ref() if self._loop_ref is not None else None
+
+        if loop is None:
+            loop = asyncio.get_running_loop()
+            self._loop_ref = weakref.ref(loop)
+
+        return loop
+
+    def time(self) -> float:
+        return self._loop.time()
+
+    def _tick(self, when: float) -> int:
+        """Bucket of a timer: the first tick that is not earlier than `when`."""
+        return math.ceil(when / self.resolution)
+
+    def call_at(
+        self, when: float, callback: typing.Callable[..., None], *args: typing.Any
+    ) -> CoarseTimerHandle:
+        """Schedule `callback` to be called at loop time `when`."""
+        tick = self._tick(when)
+        timer = CoarseTimerHandle(self, when, tick, callback, args)
+
+        bucket = self._buckets.get(tick)
+
+        if bucket is None:
+            bucket = self._buckets[tick] = {}
+            heapq.heappush(self._ticks, tick)
+
+        bucket[timer] = None
+
+        if self._handle_tick is None or tick < self._handle_tick:
+            self._schedule(tick)
+
+        return timer
+
+    def call_later(
+        self, delay: float, callback: typing.Callable[..., None], *args: typing.Any
+    ) -> CoarseTimerHandle:
+        """Schedule `callback` to be called after `delay` seconds."""
+        return self.call_at(self._loop.time() + delay, callback, *args)
+
+    async def sleep(self, delay: float) -> None:
+        """Coarse-grained equivalent of `asyncio.sleep`."""
+        future = self._loop.create_future()
+        timer = self.call_later(delay, _set_result_unless_done, future)
+
+        try:
+            await future
+        finally:
+            timer.cancel()
+
+    def _remove(self, timer: CoarseTimerHandle) -> None:
+        bucket = self._buckets.get(timer._tick)
+
+        if bucket is None:
+            return
+
+        bucket.pop(timer, None)
+
+        if bucket:
+            return
+
+        # Drop empty buckets right away, their ticks are skipped when the loop callback
+        # runs. Compact the heap once most of it refers to buckets that are gone.
+        del self._buckets[timer._tick]
+
+        if len(self._ticks) > 2 * len(self._buckets):
+            self._ticks = list(self._buckets)
+            heapq.heapify(self._ticks)
+
+    def _schedule(self, tick: int) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+
+        self._handle_tick = tick
+        self._handle = self._loop.call_at(tick * self.resolution, self._run)
+
+    def _run(self) -> None:
+        scheduled_tick = self._handle_tick
+        self._handle = None
+        self._handle_tick = None
+
+        # Buckets are due once the loop time reaches the time `_schedule` uses for them.
+        # The event loop runs callbacks up to its clock resolution early, so the tick
+        # we were scheduled for is due regardless. Otherwise we would keep waking up
+        # until it is reached.
+        now = self._loop.time()
+        now_tick = self._tick(now)
+
+        if now_tick * self.resolution > now:
+            now_tick -= 1
+
+        if scheduled_tick is not None:
+            now_tick = max(now_tick, scheduled_tick)
+
+        while self._ticks and self._ticks[0] <= now_tick:
+            tick = heapq.heappop(self._ticks)
+
+            for timer in self._buckets.pop(tick, ()):
+                # Callbacks can cancel timers in the bucket that is being run
+                if timer._cancelled:
+                    continue
+
+                timer._cancelled = True
+
+                try:
+                    timer._callback(*timer._args)
+                except Exception as exc:
+                    self._loop.call_exception_handler(
+                        {
+                            "message": f"Exception in timer callback {timer!r}",
+                            "exception": exc,
+                        }
+                    )
+
+        # Do not wake up for buckets that have been emptied by cancellation
+        while self._ticks and self._ticks[0] not in self._buckets:
+            heapq.heappop(self._ticks)
+
+        # Callbacks may have scheduled new timers, make sure we wake up for the earliest
+        if self._ticks and self._handle_tick != self._ticks[0]:
+            self._schedule(self._ticks[0])
+
+    def close(self) -> None:
+        """Cancel every timer and stop waking up the event loop."""
+        if self._handle is not None:
+            self._handle.cancel()
+
+        self._handle = None
+        self._handle_tick = None
+
+        for bucket in self._buckets.values():
+            for timer in bucket:
+                timer._cancelled = True
+
+        self._buckets.clear()
+        self._ticks.clear()
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}"
+            f" [timers:{len(self)}, buckets:{len(self._buckets)}]>"
+        )
+
+
+def _set_result_unless_done(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+_TIMER_SERVICES: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, TimerService
+] = weakref.WeakKeyDictionary()
+
+
+def get_timer_service() -> TimerService:
+    """Return the timer service shared by everything running in the current loop."""
+    loop = asyncio.get_running_loop()
+    service = _TIMER_SERVICES.get(loop)
+
+    if service is None:
+        service = _TIMER_SERVICES[loop] = TimerService(loop=loop)
+
+    return service
+
+
 class ReschedulableTimeout:
     """Timeout object made to be efficiently rescheduled continuously."""
 
     def __init__(self, callback: typing.Callable[[], None]) -> None:
-        self._timer: asyncio.TimerHandle | None = None
+        self._timer: CoarseTimerHandle | None = None
         self._callback = callback
 
         self._when: float = 0
 
     @functools.cached_property
-    def _loop(self) -> asyncio.AbstractEventLoop:
-        return asyncio.get_running_loop()
+    def _timers(self) -> TimerService:
+        return get_timer_service()
 
     def _timeout_trigger(self) -> None:
-        now = self._loop.time()
+        assert self._timer is not None
 
-        # If we triggered early, reschedule
-        if self._when > now:
+        # The timeout was pushed back after the timer was scheduled, reschedule
+        if self._when > self._timer.when():
             self._reschedule()
             return
 
@@ -204,10 +746,10 @@ class ReschedulableTimeout:
         if self._timer is not None:
             self._timer.cancel()
 
-        self._timer = self._loop.call_at(self._when, self._timeout_trigger)
+        self._timer = self._timers.call_at(self._when, self._timeout_trigger)
 
     def reschedule(self, delay: float) -> None:
-        self._when = self._loop.time() + delay
+        self._when = self._timers.time() + delay
 
         # If the current timer will expire too late (or isn't running), reschedule
         if self._timer is None or self._timer.when() > self._when:
@@ -219,6 +761,82 @@ class ReschedulableTimeout:
             self._timer = None
 
 
+class TimerWheelDebouncer:
+    """Debouncer that expires objects in coarse time buckets.
+
+    Objects are grouped into buckets by the tick during which they expire and every
+    bucket is visited only once, making insertion and expiration amortized O(1).
+    Objects can outlive their expiration time by up to `resolution` seconds.
+    """
+
+    def __init__(self, resolution: float = 1.0, max_size: int | None = None) -> None:
+        self.resolution = resolution
+        self.max_size = max_size
+
+        self._ticks: dict[typing.Hashable, int] = {}
+        self._buckets: dict[int, list[typing.Hashable]] = {}
+        self._last_tick: int | None = None
+
+    @functools.cached_property
+    def _loop(self) -> asyncio.BaseEventLoop:
+        return asyncio.get_running_loop()
+
+    def clean(self, now: float | None = None) -> None:
+        """Clean up expired buckets."""
+        if now is None:
+            now = self._loop.time()
+
+        tick = int(now // self.resolution)
+        last_tick = self._last_tick
+
+        if last_tick is not None and tick <= last_tick:
+            return
+
+        self._last_tick = tick
+
+        if last_tick is None or tick - last_tick > len(self._buckets):
+            expired = [b for b in self._buckets if b <= tick]
+        else:
+            expired = range(last_tick + 1, tick + 1)
+
+        for bucket_tick in expired:
+            for obj in self._buckets.pop(bucket_tick, ()):
+                # Objects may have been evicted and stored again in a later bucket
+                if self._ticks.get(obj) == bucket_tick:
+                    del self._ticks[obj]
+
+    def is_filtered(self, obj: typing.Hashable, now: float | None = None) -> bool:
+        """Check if an object will be filtered."""
+        self.clean(now)
+
+        return obj in self._ticks
+
+    def filter(self, obj: typing.Hashable, expire_in: float) -> bool:
+        """Check if an object should be filtered. If not, store it."""
+        now = self._loop.time()
+
+        if self.is_filtered(obj, now=now):
+            return True
+
+        # Every object in a bucket expires before the bucket's tick starts
+        tick = int((now + expire_in) // self.resolution) + 1
+        self._ticks[obj] = tick
+        self._buckets.setdefault(tick, []).append(obj)
+
+        # Forget the oldest objects first when full
+        if self.max_size is not None and len(self._ticks) > self.max_size:
+            del self._ticks[next(iter(self._ticks))]
+
+        return False
+
+    def __len__(self) -> int:
+        return len(self._ticks)
+
+    def __repr__(self) -> str:
+        """String representation of the debouncer."""
+        return f"<{self.__class__.__name__} [tracked:{len(self._ticks)}]>"
+
+
 class Debouncer:
     """Generic debouncer supporting per-invocation expiration."""
 
@@ -279,3 +897,72 @@ class Debouncer:
     def __repr__(self) -> str:
         """String representation of the debouncer."""
         return f"<{self.__class__.__name__} [tracked:{len(self._queue)}]>"
+
+
+class IndexedDict(dict):
+    """A `dict` that keeps derived indices in sync with its items.
+
+    Every mutation is routed through `_item_added`, `_item_removed` and `_cleared`,
+    which subclasses override to maintain their indices.
+    """
+
+    _MISSING = object()
+
+    def _item_added(self, key: typing.Any, value: typing.Any) -> None:
+        pass
+
+    def _item_removed(self, key: typing.Any, value: typing.Any) -> None:
+        pass
+
+    def _cleared(self) -> None:
+        pass
+
+    def __setitem__(self, key: typing.Any, value: typing.Any) -> None:
+        old_value = dict.get(self, key, self._MISSING)
+
+        if old_value is not self._MISSING:
+            self._item_removed(key, old_value)
+
+        super().__setitem__(key, value)
+        self._item_added(key, value)
+
+    def __delitem__(self, key: typing.Any) -> None:
+        value = dict.__getitem__(self, key)
+        super().__delitem__(key)
+        self._item_removed(key, value)
+
+    def pop(self, key: typing.Any, default: typing.Any = _MISSING) -> typing.Any:
+        if key not in self:
+            if default is self._MISSING:
+                raise KeyError(key)
+
+            return default
+
+        value = dict.__getitem__(self, key)
+        del self[key]
+
+        return value
+
+    def popitem(self) -> tuple[typing.Any, typing.Any]:
+        key, value = super().popitem()
+        self._item_removed(key, value)
+
+        return key, value
+
+    def setdefault(self, key: typing.Any, default: typing.Any = None) -> typing.Any:
+        if key not in self:
+            self[key] = default
+
+        return dict.__getitem__(self, key)
+
+    def update(self, *args, **kwargs) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self) -> None:
+        super().clear()
+        self._cleared()
+
+    def __ior__(self, other: typing.Any) -> IndexedDict:
+        self.update(other)
+        return self
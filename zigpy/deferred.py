@@ -0,0 +1,230 @@
+"""Requests deferred until a sleepy end device wakes up."""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import logging
+import typing
+
+import zigpy.config as conf
+from zigpy.exceptions import DeliveryError
+import zigpy.types as t
+from zigpy.zcl import foundation
+from zigpy.zcl.clusters.general import PollControl
+
+if typing.TYPE_CHECKING:
+    from zigpy.device import Device
+
+LOGGER = logging.getLogger(__name__)
+
+# Fast polling is stopped explicitly once the queue is drained, this is only a fallback
+FAST_POLL_TIMEOUT = 30 * 4  # quarter seconds
+
+WRITE_COMMANDS = frozenset(
+    {
+        foundation.GeneralCommand.Write_Attributes,
+        foundation.GeneralCommand.Write_Attributes_Undivided,
+        foundation.GeneralCommand.Write_Attributes_No_Response,
+    }
+)
+
+
+def _write_attributes(
+    cluster: int, src_ep: int, dst_ep: int, data: bytes
+) -> tuple[tuple, frozenset[int]] | None:
+    """Identify a ZCL attribute write and the attributes it writes."""
+    if dst_ep == 0:
+        return None
+
+    try:
+        hdr, payload = foundation.ZCLHeader.deserialize(data)
+    except ValueError:
+        return None
+
+    if not hdr.frame_control.is_general or hdr.command_id not in WRITE_COMMANDS:
+        return None
+
+    try:
+        records, _ = t.List[foundation.Attribute].deserialize(payload)
+    except (ValueError, KeyError):
+        return None
+
+    key = (
+        cluster,
+        src_ep,
+        dst_ep,
+        hdr.command_id,
+        hdr.manufacturer,
+        hdr.direction,
+    )
+
+    return key, frozenset(record.attrid for record in records)
+
+
+@dataclasses.dataclass
+class _DeferredRequest:
+    send: typing.Callable[[], typing.Awaitable[typing.Any]]
+    future: asyncio.Future
+    write: tuple[tuple, frozenset[int]] | None
+    waiters: int = 1
+
+
+class DeferredRequests:
+    """Requests to a sleepy end device, held until the device is next heard from.
+
+    Requests are sent one at a time, in order. A pending attribute write is replaced by
+    a later write of the same attributes and both callers receive the response to the
+    later one. Callers stop waiting after `timeout` seconds, pending requests fail
+    once the device is removed or leaves the network.
+    """
+
+    def __init__(self, device: Device) -> None:
+        self._device = device
+        self._queue: list[_DeferredRequest] = []
+        self._drain_task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    @property
+    def draining(self) -> bool:
+        return self._drain_task is not None and not self._drain_task.done()
+
+    def _coalesce(self, request: _DeferredRequest) -> _DeferredRequest:
+        if request.write is not None:
+            key, attrids = request.write
+
+            for pending in self._queue:
+                if pending.write is None or pending.future.done():
+                    continue
+
+                pending_key, pending_attrids = pending.write
+
+                if pending_key == key and pending_attrids <= attrids:
+                    LOGGER.debug(
+                        "[%s] Replacing deferred write of %s", self._device, attrids
+                    )
+                    pending.send = request.send
+                    pending.write = request.write
+                    pending.waiters += 1
+
+                    return pending
+
+        self._queue.append(request)
+        return request
+
+    async def request(
+        self,
+        send: typing.Callable[[], typing.Awaitable[typing.Any]],
+        *,
+        cluster: int,
+        src_ep: int,
+        dst_ep: int,
+        data: bytes,
+        timeout: float,
+    ) -> typing.Any:
+        """Send a request once the device is next heard from, waiting up to `timeout`."""
+        request = self._coalesce(
+            _DeferredRequest(
+                send=send,
+                future=asyncio.get_running_loop().create_future(),
+                write=_write_attributes(cluster, src_ep, dst_ep, data),
+            )
+        )
+
+        LOGGER.debug(
+            "[%s] Deferring request until the device is awake (%d queued)",
+            self._device,
+            len(self._queue),
+        )
+
+        try:
+            # Coalesced requests share a future, one caller must not cancel the other
+            return await asyncio.wait_for(asyncio.shield(request.future), timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            request.waiters -= 1
+
+            if request.waiters == 0 and request in self._queue:
+                self._queue.remove(request)
+                request.future.cancel()
+
+            raise
+
+    def cancel(self, reason: str) -> None:
+        """Fail every pending request, the device will not wake up for them."""
+        queue, self._queue = self._queue, []
+
+        for request in queue:
+            if not request.future.done():
+                request.future.set_exception(
+                    DeliveryError(f"Deferred request was cancelled: {reason}")
+                )
+
+        if queue:
+            LOGGER.debug(
+                "[%s] Cancelled %d deferred requests: %s",
+                self._device,
+                len(queue),
+                reason,
+            )
+
+    def release(self, checkin_tsn: int | None = None) -> None:
+        """Start sending deferred requests, the device is awake.
+
+        If the device was woken up by a Poll Control check-in, its TSN is used to ask
+        the device to fast poll until all requests are sent.
+        """
+        if not self._queue or self.draining:
+            return
+
+        self._drain_task = asyncio.get_running_loop().create_task(
+            self._drain(checkin_tsn)
+        )
+
+    def _poll_control(self) -> PollControl | None:
+        for endpoint in self._device.non_zdo_endpoints:
+            if PollControl.cluster_id in endpoint.in_clusters:
+                return endpoint.in_clusters[PollControl.cluster_id]
+
+        return None
+
+    async def _drain(self, checkin_tsn: int | None) -> None:
+        poll_control = None
+
+        if (
+            checkin_tsn is not None
+            and self._device.application.config[conf.CONF_SLEEPY_DEVICE_FAST_POLL]
+        ):
+            poll_control = self._poll_control()
+
+        if poll_control is not None:
+            try:
+                await poll_control.checkin_response(
+                    True, FAST_POLL_TIMEOUT, tsn=checkin_tsn, expect_reply=False
+                )
+            except Exception as exc:
+                LOGGER.debug("[%s] Failed to start fast polling: %r", self._device, exc)
+                poll_control = None
+
+        try:
+            while self._queue:
+                request = self._queue.pop(0)
+
+                if request.future.done():
+                    continue
+
+                try:
+                    result = await request.send()
+                except Exception as exc:
+                    request.future.set_exception(exc)
+                else:
+                    request.future.set_result(result)
+        finally:
+            if poll_control is not None:
+                try:
+                    await poll_control.fast_poll_stop(expect_reply=False)
+                except Exception as exc:
+                    LOGGER.debug(
+                        "[%s] Failed to stop fast polling: %r", self._device, exc
+                    )
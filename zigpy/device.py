@@ -1,22 +1,15 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import enum
+import functools
 import itertools
 import logging
-import sys
 import typing
 import warnings
 
-from zigpy.ota.manager import find_ota_cluster, update_firmware
-from zigpy.zcl.clusters.general import Ota
-
-if sys.version_info[:2] < (3, 11):
-    from async_timeout import timeout as asyncio_timeout  # pragma: no cover
-else:
-    from asyncio import timeout as asyncio_timeout  # pragma: no cover
-
+import zigpy.config as conf
 from zigpy.const import (
     SIG_ENDPOINTS,
     SIG_EP_INPUT,
@@ -28,12 +21,15 @@ from zigpy.const import (
     SIG_NODE_DESC,
 )
 import zigpy.datastructures
+import zigpy.deferred
 import zigpy.endpoint
 import zigpy.exceptions
 import zigpy.listeners
+from zigpy.ota.manager import find_ota_cluster, update_firmware
 import zigpy.types as t
 from zigpy.typing import AddressingMode
 import zigpy.util
+from zigpy.zcl.clusters.general import Ota, PollControl
 import zigpy.zcl.foundation as foundation
 import zigpy.zdo as zdo
 import zigpy.zdo.types as zdo_t
@@ -47,7 +43,10 @@ LOGGER = logging.getLogger(__name__)
 
 APS_REPLY_TIMEOUT = 5
 APS_REPLY_TIMEOUT_EXTENDED = 28
-PACKET_DEBOUNCE_WINDOW = 10
+DUPLICATE_PACKETS_COUNTER = "duplicate_packets"
+
+# Sleepy end devices stay awake briefly after they have been heard from
+SLEEPY_DEVICE_AWAKE_TIME = timedelta(seconds=5)
 
 AFTER_OTA_ATTR_READ_DELAY = 10
 OTA_RETRY_DECORATOR = zigpy.util.retryable_request(
@@ -55,6 +54,11 @@ OTA_RETRY_DECORATOR = zigpy.util.retryable_request(
 )
 
 
+def _set_timeout_unless_done(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_exception(asyncio.TimeoutError())
+
+
 class Status(enum.IntEnum):
     """The status of a Device. Maintained for backwards compatibility."""
 
@@ -74,7 +78,7 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
     def __init__(self, application: ControllerApplication, ieee: t.EUI64, nwk: t.NWK):
         self._application: ControllerApplication = application
         self._ieee: t.EUI64 = ieee
-        self.nwk: t.NWK = t.NWK(nwk)
+        self._nwk: t.NWK = t.NWK(nwk)
         self.zdo: zdo.ZDO = zdo.ZDO(self)
         self.endpoints: dict[int, zdo.ZDO | zigpy.endpoint.Endpoint] = {0: self.zdo}
         self.lqi: int | None = None
@@ -91,12 +95,16 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         self._relays: t.Relays | None = None
         self._skip_configuration: bool = False
         self._send_sequence: int = 0
-
-        self._packet_debouncer = zigpy.datastructures.Debouncer()
+        self._deferred_requests = zigpy.deferred.DeferredRequests(self)
 
         # Retained for backwards compatibility, will be removed in a future release
         self.status = Status.NEW
 
+    @property
+    def _packet_debouncer(self) -> zigpy.datastructures.TimerWheelDebouncer:
+        # Shared by all devices, packet fingerprints are keyed by device
+        return self._application._packet_debouncer
+
     def get_sequence(self) -> t.uint8_t:
         self._send_sequence = (self._send_sequence + 1) % 256
         return self._send_sequence
@@ -105,6 +113,21 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
     def name(self) -> str:
         return f"0x{self.nwk:04X}"
 
+    @property
+    def nwk(self) -> t.NWK:
+        return self._nwk
+
+    @nwk.setter
+    def nwk(self, value: t.NWK) -> None:
+        old_nwk = self._nwk
+        self._nwk = value
+
+        # Keep the application's NWK address index in sync
+        devices = getattr(self._application, "devices", None)
+
+        if isinstance(devices, DeviceRegistry):
+            devices.device_nwk_changed(self, old_nwk)
+
     def update_last_seen(self) -> None:
         """Update the `last_seen` attribute to the current time and emit an event."""
 
@@ -113,6 +136,7 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         )
 
         self.last_seen = datetime.now(timezone.utc)
+        self._deferred_requests.release()
 
     @property
     def last_seen(self) -> float | None:
@@ -171,6 +195,10 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
             self.debug("Canceling old initialize call")
             self._initialize_task.cancel()  # type:ignore[union-attr]
 
+    def cancel_deferred_requests(self, reason: str) -> None:
+        """Fail requests held until the device wakes up."""
+        self._deferred_requests.cancel(reason)
+
     def schedule_initialize(self) -> asyncio.Task | None:
         # Already-initialized devices don't need to be re-initialized
         if self.is_initialized:
@@ -202,7 +230,8 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
 
     async def initialize(self) -> None:
         try:
-            await self._initialize()
+            with zigpy.util.request_priority(zigpy.util.RequestPriority.BACKGROUND):
+                await self._initialize()
         except (asyncio.TimeoutError, zigpy.exceptions.ZigbeeException):
             self.application.listener_event("device_init_failure", self)
         except Exception:
@@ -297,6 +326,29 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         for ep in self.non_zdo_endpoints:
             await ep.remove_from_group(grp_id)
 
+    @property
+    def is_sleepy(self) -> bool:
+        """Whether the device is an end device that turns off its receiver when idle."""
+        return (
+            self.node_desc is not None
+            and bool(self.node_desc.is_end_device)
+            and not self.node_desc.is_receiver_on_when_idle
+        )
+
+    def _should_defer_request(self) -> bool:
+        if (
+            not self.is_sleepy
+            or self._deferred_requests.draining
+            or not self._application.config[conf.CONF_SLEEPY_DEVICE_QUEUE]
+        ):
+            return False
+
+        # Requests can be sent right away while the device is still awake
+        return (
+            self._last_seen is None
+            or datetime.now(timezone.utc) - self._last_seen > SLEEPY_DEVICE_AWAKE_TIME
+        )
+
     async def request(
         self,
         profile,
@@ -308,6 +360,44 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         expect_reply=True,
         timeout=APS_REPLY_TIMEOUT,
         use_ieee=False,
+    ):
+        send_request = functools.partial(
+            self._request,
+            profile,
+            cluster,
+            src_ep,
+            dst_ep,
+            sequence,
+            data,
+            expect_reply=expect_reply,
+            timeout=timeout,
+            use_ieee=use_ieee,
+        )
+
+        if not self._should_defer_request():
+            return await send_request()
+
+        # Hold the request until the sleepy device next wakes up
+        return await self._deferred_requests.request(
+            send_request,
+            cluster=cluster,
+            src_ep=src_ep,
+            dst_ep=dst_ep,
+            data=data,
+            timeout=self._application.config[conf.CONF_SLEEPY_DEVICE_QUEUE_TIMEOUT],
+        )
+
+    async def _request(
+        self,
+        profile,
+        cluster,
+        src_ep,
+        dst_ep,
+        sequence,
+        data,
+        expect_reply=True,
+        timeout=APS_REPLY_TIMEOUT,
+        use_ieee=False,
     ):
         extended_timeout = False
 
@@ -338,8 +428,14 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         with self._pending.new(sequence) as req:
             await send_request()
 
-            async with asyncio_timeout(timeout):
+            timer = zigpy.datastructures.get_timer_service().call_later(
+                timeout, _set_timeout_unless_done, req.result
+            )
+
+            try:
                 return await req.result
+            finally:
+                timer.cancel()
 
     def handle_message(
         self,
@@ -385,6 +481,47 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         )
         return self.endpoints[endpoint_id].deserialize(cluster_id, data)
 
+    @staticmethod
+    def _packet_fingerprint(packet: t.ZigbeePacket, data: bytes) -> tuple:
+        """Identify a packet for deduplication, ignoring its TSN and radio details."""
+        src = packet.src
+        dst = packet.dst
+
+        # The payload is short enough to be used as its own digest
+        return (
+            None if src is None else src.addr_mode,
+            None if src is None else src.address,
+            None if dst is None else dst.addr_mode,
+            None if dst is None else dst.address,
+            packet.src_ep,
+            packet.dst_ep,
+            packet.profile_id,
+            packet.cluster_id,
+            data,
+        )
+
+    @staticmethod
+    def _poll_control_checkin_tsn(packet: t.ZigbeePacket, data: bytes) -> int | None:
+        """Return the TSN of a Poll Control check-in command, if the packet is one."""
+        if (
+            packet.cluster_id != PollControl.cluster_id
+            or packet.dst_ep == zdo.ZDO_ENDPOINT
+        ):
+            return None
+
+        try:
+            hdr, _ = foundation.ZCLHeader.deserialize(data)
+        except ValueError:
+            return None
+
+        if (
+            hdr.frame_control.is_cluster
+            and hdr.command_id == PollControl.ClientCommandDefs.checkin.id
+        ):
+            return hdr.tsn
+
+        return None
+
     def packet_received(self, packet: t.ZigbeePacket) -> None:
         # Set radio details that can be read from any type of packet
         self.last_seen = packet.timestamp
@@ -395,12 +532,23 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         if packet.rssi is not None:
             self.rssi = packet.rssi
 
-        if self._packet_debouncer.filter(
-            # Be conservative with deduplication
-            obj=packet.replace(timestamp=None, tsn=None, lqi=None, rssi=None),
-            expire_in=PACKET_DEBOUNCE_WINDOW,
+        data = packet.data.serialize()
+
+        if self._deferred_requests:
+            self._deferred_requests.release(
+                checkin_tsn=self._poll_control_checkin_tsn(packet, data)
+            )
+
+        dedup_window = self._application.config[conf.CONF_PACKET_DEDUP_WINDOW]
+
+        if dedup_window > 0 and self._packet_debouncer.filter(
+            (self.ieee, self._packet_fingerprint(packet, data)),
+            expire_in=dedup_window,
         ):
             self.debug("Filtering duplicate packet")
+            self._application.state.device_counters[str(self.ieee)][
+                DUPLICATE_PACKETS_COUNTER
+            ].increment()
             return
 
         # Filter out packets that refer to unknown endpoints or clusters
@@ -429,8 +577,6 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
             return
 
         # Parse the ZCL/ZDO header first. This should never fail.
-        data = packet.data.serialize()
-
         if packet.dst_ep == zdo.ZDO_ENDPOINT:
             hdr, _ = zdo_t.ZDOHeader.deserialize(packet.cluster_id, data)
         else:
@@ -443,9 +589,14 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
             ):
                 # XXX: support for custom deserialization will be removed
                 hdr, args = self.deserialize(packet.src_ep, packet.cluster_id, data)
+            elif (
+                isinstance(hdr, foundation.ZCLHeader)
+                and type(endpoint).deserialize is zigpy.endpoint.Endpoint.deserialize
+            ):
+                # Next, parse the ZCL payload, reusing the already decoded header
+                hdr, args = endpoint.deserialize(packet.cluster_id, data, hdr=hdr)
             else:
                 # Next, parse the ZCL/ZDO payload
-                # FIXME: ZCL deserialization mutates the header!
                 hdr, args = endpoint.deserialize(packet.cluster_id, data)
         except Exception as exc:
             error = zigpy.exceptions.ParsingError()
@@ -483,9 +634,21 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
             return
 
         # Pass the request off to a listener, if one is registered
+        req_listeners = self._application._req_listeners
+        any_device_listeners = req_listeners.get(zigpy.listeners.ANY_DEVICE)
+        device_listeners = req_listeners.get(self)
+
         for listener in itertools.chain(
-            self._application._req_listeners[zigpy.listeners.ANY_DEVICE],
-            self._application._req_listeners[self],
+            (
+                any_device_listeners.candidates(hdr, args, cluster_id=packet.cluster_id)
+                if any_device_listeners
+                else ()
+            ),
+            (
+                device_listeners.candidates(hdr, args, cluster_id=packet.cluster_id)
+                if device_listeners
+                else ()
+            ),
         ):
             # Resolve only until the first future listener
             if listener.resolve(hdr, args) and isinstance(
@@ -673,6 +836,80 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         )
 
 
+class DeviceRegistry(zigpy.datastructures.IndexedDict):
+    """IEEE address to `Device` mapping that maintains an index by NWK address.
+
+    A device's NWK address can change at runtime. `Device.nwk` notifies the registry
+    it belongs to so the index never has to be rebuilt.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__()
+
+        # Devices claiming each NWK address, in the order they claimed it. There is
+        # usually only one claimant, more indicate a stale database entry.
+        self._nwk_index: dict[t.NWK, list[Device]] = {}
+        self.update(*args, **kwargs)
+
+    def _index_add(self, device: Device) -> None:
+        claimants = self._nwk_index.setdefault(device.nwk, [])
+
+        if claimants:
+            LOGGER.warning(
+                "NWK address conflict: %s and %s both use %s",
+                device.ieee,
+                claimants[-1].ieee,
+                device.nwk,
+            )
+
+        claimants.append(device)
+
+    def _index_remove(self, device: Device, nwk: t.NWK) -> None:
+        claimants = self._nwk_index.get(nwk)
+
+        if claimants is None:
+            return
+
+        for index, claimant in enumerate(claimants):
+            if claimant is device:
+                del claimants[index]
+                break
+
+        if not claimants:
+            del self._nwk_index[nwk]
+
+    def _item_added(self, ieee: t.EUI64, device: Device) -> None:
+        self._index_add(device)
+
+    def _item_removed(self, ieee: t.EUI64, device: Device) -> None:
+        self._index_remove(device, device.nwk)
+
+    def _cleared(self) -> None:
+        self._nwk_index.clear()
+
+    def device_nwk_changed(self, device: Device, old_nwk: t.NWK) -> None:
+        """Update the NWK index after a device's NWK address has changed."""
+        # Devices that are not (or no longer) registered are not indexed
+        if dict.get(self, device.ieee) is not device:
+            return
+
+        self._index_remove(device, old_nwk)
+        self._index_add(device)
+
+    def get_by_nwk(self, nwk: t.NWK | int) -> Device:
+        """Look up a device by its NWK address, raising `KeyError` if not found.
+
+        If multiple devices claim the same NWK address, the most recent claimant wins.
+        """
+        return self._nwk_index[nwk][-1]
+
+    def __setitem__(self, ieee: t.EUI64, device: Device) -> None:
+        if device is None:
+            raise TypeError(f"Cannot register {ieee} without a device")
+
+        super().__setitem__(ieee, device)
+
+
 async def broadcast(
     app,
     profile,
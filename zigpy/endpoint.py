@@ -217,14 +217,22 @@ class Endpoint(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         return self._model, self._manufacturer
 
     def deserialize(
-        self, cluster_id: t.ClusterId, data: bytes
+        self, cluster_id: t.ClusterId, data: bytes, *, hdr: ZCLHeader | None = None
     ) -> tuple[ZCLHeader, CommandSchema]:
         """Deserialize data for ZCL"""
         if cluster_id not in self.in_clusters and cluster_id not in self.out_clusters:
             raise KeyError(f"No cluster ID 0x{cluster_id:04x} on {self.unique_id}")
 
         cluster = self.in_clusters.get(cluster_id, self.out_clusters.get(cluster_id))
-        return cluster.deserialize(data)
+
+        # Clusters with custom deserialization always decode the header themselves
+        if (
+            hdr is None
+            or type(cluster).deserialize is not zigpy.zcl.Cluster.deserialize
+        ):
+            return cluster.deserialize(data)
+
+        return cluster.deserialize(data, hdr=hdr)
 
     def handle_message(
         self,
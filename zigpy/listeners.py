@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import dataclasses
 import inspect
+import itertools
 import logging
 import typing
 
@@ -128,6 +129,140 @@ class CallbackListener(BaseRequestListener):
         return False
 
 
+def _command_keys(
+    command: foundation.CommandSchema,
+) -> set[tuple[int | None, int, foundation.Direction]] | None:
+    """Keys identifying the ZCL command a command schema belongs to.
+
+    The first item of each key is the ID of a cluster defining the command, or `None`
+    if the command schema can be received on any cluster.
+    """
+    schema = type(command)
+    definition = schema.command
+
+    if definition is None or definition.id is None or definition.direction is None:
+        return None
+
+    cluster_ids = schema.cluster_ids
+
+    if not cluster_ids or None in cluster_ids:
+        cluster_ids = {None}
+
+    return {
+        (cluster_id, definition.id, definition.direction) for cluster_id in cluster_ids
+    }
+
+
+class RequestListenerIndex:
+    """Collection of request listeners, indexed by the ZCL commands they can match.
+
+    Command schema matchers are indexed by cluster ID, command ID and direction. Those
+    that can be received on any cluster, like general commands, share a bucket per
+    command ID and direction. All other matchers are kept in a separate bucket that is
+    checked for every command. Listeners are always returned in the order they were
+    added.
+    """
+
+    def __init__(self) -> None:
+        self._counter = itertools.count()
+
+        # Listeners are keyed by `id()`, some are not hashable
+        self._listeners: dict[int, tuple[int, BaseRequestListener]] = {}
+        self._by_command: dict[tuple, dict[int, BaseRequestListener]] = {}
+        self._unindexed: dict[int, BaseRequestListener] = {}
+
+    def __len__(self) -> int:
+        return len(self._listeners)
+
+    def __iter__(self) -> typing.Iterator[BaseRequestListener]:
+        return iter([listener for _, listener in self._listeners.values()])
+
+    def __contains__(self, listener: object) -> bool:
+        return id(listener) in self._listeners
+
+    def _keys(self, listener: BaseRequestListener) -> set[tuple | None]:
+        keys = set()
+
+        for matcher in listener.matchers:
+            if isinstance(matcher, foundation.CommandSchema):
+                keys.update(_command_keys(matcher) or {None})
+            else:
+                keys.add(None)
+
+        return keys
+
+    def add(self, listener: BaseRequestListener) -> None:
+        """Add a listener."""
+        if id(listener) in self._listeners:
+            raise ValueError(f"Listener has already been added: {listener!r}")
+
+        self._listeners[id(listener)] = (next(self._counter), listener)
+
+        for key in self._keys(listener):
+            if key is None:
+                self._unindexed[id(listener)] = listener
+            else:
+                self._by_command.setdefault(key, {})[id(listener)] = listener
+
+    def remove(self, listener: BaseRequestListener) -> None:
+        """Remove a listener, raising `ValueError` if it was never added."""
+        if self._listeners.pop(id(listener), None) is None:
+            raise ValueError(f"Listener has not been added: {listener!r}")
+
+        for key in self._keys(listener):
+            if key is None:
+                del self._unindexed[id(listener)]
+                continue
+
+            bucket = self._by_command[key]
+            del bucket[id(listener)]
+
+            if not bucket:
+                del self._by_command[key]
+
+    def candidates(
+        self,
+        hdr: foundation.ZCLHeader | zdo_t.ZDOHeader,
+        command: foundation.CommandSchema,
+        *,
+        cluster_id: int,
+    ) -> list[BaseRequestListener]:
+        """Listeners that can potentially be resolved by a command received on a
+        cluster, in order.
+        """
+        if isinstance(command, foundation.CommandSchema):
+            keys = _command_keys(command)
+        elif isinstance(hdr, zdo_t.ZDOHeader):
+            # Command schema matchers never match ZDO commands
+            return list(self._unindexed.values())
+        else:
+            keys = None
+
+        # Commands we cannot classify are offered to every listener
+        if keys is None:
+            return list(self)
+
+        # Listeners for the same schema share its keys, even if the cluster ID of the
+        # packet differs from the one of the cluster class defining the command
+        _, command_id, direction = next(iter(keys))
+        keys |= {(cluster_id, command_id, direction), (None, command_id, direction)}
+
+        candidates = dict(self._unindexed)
+
+        for key in keys:
+            candidates.update(self._by_command.get(key, {}))
+
+        if len(candidates) == len(self._unindexed):
+            return list(self._unindexed.values())
+
+        return [
+            self._listeners[listener_id][1]
+            for listener_id in sorted(
+                candidates, key=lambda listener_id: self._listeners[listener_id][0]
+            )
+        ]
+
+
 MatcherFuncType = typing.Callable[
     [
         typing.Union[foundation.ZCLHeader, zdo_t.ZDOHeader],
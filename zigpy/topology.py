@@ -10,6 +10,7 @@ import random
 import typing
 
 import zigpy.config
+import zigpy.datastructures
 import zigpy.device
 import zigpy.types as t
 import zigpy.util
@@ -66,7 +67,7 @@ class Topology(zigpy.util.ListenableMixin):
         """Delay scan by creating a task."""
 
         while True:
-            await asyncio.sleep(period)
+            await zigpy.datastructures.get_timer_service().sleep(period)
 
             # Don't run a scheduled scan if a scan is already running
             if self._scan_task is not None and not self._scan_task.done():
@@ -92,7 +93,9 @@ class Topology(zigpy.util.ListenableMixin):
             LOGGER.debug("Cancelling old scanning task")
             self._scan_task.cancel()
 
-        self._scan_task = asyncio.create_task(self._scan(devices))
+        # Scanning requests should not delay any other requests
+        with zigpy.util.request_priority(zigpy.util.RequestPriority.BACKGROUND):
+            self._scan_task = asyncio.create_task(self._scan(devices))
         await self._scan_task
 
     async def _scan_table(
@@ -9,6 +9,9 @@ import typing
 CALLABLE_T = typing.TypeVar("CALLABLE_T", bound=typing.Callable)
 T = typing.TypeVar("T")
 
+# Struct codes for byte-aligned little endian integers, keyed by size
+_INT_FORMATS = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
 
 class Bits(list):
     @classmethod
@@ -48,13 +51,156 @@ class Bits(list):
         return cls(bits), b""
 
 
+def pack_bitfields(values: typing.Sequence[FixedIntType]) -> bytes:
+    """Pack integers into bytes, the first value taking up the least significant bits.
+
+    Equivalent to `Bits.from_bitfields(values).serialize()`.
+    """
+
+    n = 0
+    length = 0
+
+    for value in values:
+        if type(value).bits is FixedIntType.bits:
+            chunk = int(value) & ((1 << value._bits) - 1)
+        else:
+            chunk = int("".join(map(str, value.bits())) or "0", 2)
+
+        n |= chunk << length
+        length += value._bits
+
+    if length % 8 != 0:
+        raise ValueError(f"Cannot serialize {length} bits into bytes: {values}")
+
+    return n.to_bytes(length // 8, "big")
+
+
+def unpack_bitfields(
+    types: typing.Sequence[type[FixedIntType]], data: bytes | memoryview
+) -> list[FixedIntType]:
+    """Unpack integers packed by `pack_bitfields`, consuming all of `data`."""
+
+    n = int.from_bytes(data, "big")
+    length = 0
+    values = []
+
+    for type_ in types:
+        bits = type_._bits
+        chunk = (n >> length) & ((1 << bits) - 1)
+        length += bits
+
+        if type_.from_bits.__func__ is not FixedIntType.from_bits.__func__:
+            value, _ = type_.from_bits(
+                Bits((chunk >> i) & 1 for i in range(bits - 1, -1, -1))
+            )
+        else:
+            if type_._signed and chunk >> (bits - 1):
+                chunk -= 1 << bits
+
+            value = type_._from_int_unchecked(chunk)
+
+        values.append(value)
+
+    if length != 8 * len(data):
+        raise ValueError(f"Bitfields {types} do not fill {len(data)} bytes")
+
+    return values
+
+
+def deserialize_from(
+    type_: typing.Any, data: bytes | memoryview, offset: int = 0
+) -> tuple[typing.Any, int]:
+    """Deserialize an instance of `type_` from `data`, starting at `offset`.
+
+    Returns the deserialized object and the offset of the first unconsumed byte. Types
+    implementing `deserialize_from` are decoded in place, everything else falls back to
+    `deserialize` on a slice of the remaining data.
+    """
+
+    if isinstance(type_, type):
+        try:
+            native = type_.__dict__["_native_deserialize_from"]
+        except KeyError:
+            native = _has_native_deserialize_from(type_)
+            setattr(type_, "_native_deserialize_from", native)
+
+        if native:
+            return type_.deserialize_from(data, offset)
+
+    remaining = data[offset:]
+
+    # Third party types expect `bytes`
+    if isinstance(remaining, memoryview):
+        remaining = remaining.tobytes()
+
+    value, remaining = type_.deserialize(remaining)
+
+    return value, len(data) - len(remaining)
+
+
+def deserialize_many_from(
+    type_: typing.Any, data: bytes | memoryview, count: int, offset: int = 0
+) -> tuple[list[typing.Any], int]:
+    """Deserialize `count` consecutive instances of `type_`, starting at `offset`.
+
+    This is the fast path for homogeneous arrays: fixed width types implementing
+    `deserialize_many_from` decode every item in one call, everything else is decoded
+    one item at a time with `deserialize_from`.
+    """
+
+    if _supports_deserialize_many(type_):
+        return type_.deserialize_many_from(data, count, offset)
+
+    items = []
+
+    for _i in range(count):
+        item, offset = deserialize_from(type_, data, offset)
+        items.append(item)
+
+    return items, offset
+
+
+def _supports_deserialize_many(type_: typing.Any) -> bool:
+    if not isinstance(type_, type):
+        return False
+
+    try:
+        return type_.__dict__["_native_deserialize_many"]
+    except KeyError:
+        native = _has_native_decoder(type_, "deserialize_many_from")
+        setattr(type_, "_native_deserialize_many", native)
+
+        return native
+
+
+_DECODERS = ("deserialize_many_from", "deserialize_from", "deserialize")
+
+
+def _has_native_decoder(cls: type, name: str) -> bool:
+    """Check if decoder `name` was not shadowed by a subclass's other decoders."""
+
+    for c in cls.__mro__:
+        namespace = vars(c)
+
+        if name in namespace:
+            return True
+        elif any(decoder in namespace for decoder in _DECODERS):
+            return False
+
+    return False
+
+
+def _has_native_deserialize_from(cls: type) -> bool:
+    return _has_native_decoder(cls, "deserialize_from")
+
+
 class SerializableBytes:
     """A container object for raw bytes that enforces `serialize()` will be called."""
 
-    def __init__(self, value: bytes = b"") -> None:
+    def __init__(self, value: bytes | bytearray | memoryview = b"") -> None:
         if isinstance(value, type(self)):
             value = value.value  # type: ignore
-        elif not isinstance(value, (bytes, bytearray)):
+        elif not isinstance(value, (bytes, bytearray, memoryview)):
             raise ValueError(f"Object is not bytes: {value!r}")  # noqa: TRY004
 
         self.value = value
@@ -63,16 +209,20 @@ class SerializableBytes:
         if not isinstance(other, type(self)):
             return NotImplemented
 
-        return self.value == other.value
+        return self.serialize() == other.serialize()
 
     def serialize(self) -> bytes:
+        # Views of radio buffers are only copied once, when they are first needed
+        if isinstance(self.value, memoryview):
+            self.value = self.value.tobytes()
+
         return self.value
 
     def __repr__(self) -> str:
-        return f"Serialized[{self.value!r}]"
+        return f"Serialized[{self.serialize()!r}]"
 
     def __hash__(self) -> int:
-        return hash(self.value)
+        return hash(self.serialize())
 
 
 NOT_SET = object()
@@ -187,18 +337,74 @@ class FixedIntType(int):
         return self.to_bytes(self._bits // 8, self._byteorder, signed=self._signed)
 
     @classmethod
-    def deserialize(cls, data: bytes) -> tuple[FixedIntType, bytes]:
+    def deserialize_from(
+        cls, data: bytes | memoryview, offset: int = 0
+    ) -> tuple[FixedIntType, int]:
         if cls._bits % 8 != 0:
             raise TypeError(f"Integer type with {cls._bits} bits is not byte aligned")
 
         byte_size = cls._bits // 8
+        end = offset + byte_size
 
-        if len(data) < byte_size:
+        if len(data) < end:
             raise ValueError(f"Data is too short to contain {byte_size} bytes")
 
-        r = cls.from_bytes(data[:byte_size], cls._byteorder, signed=cls._signed)
-        data = data[byte_size:]
-        return r, data
+        n = int.from_bytes(data[offset:end], cls._byteorder, signed=cls._signed)
+        return cls._from_int_unchecked(n), end
+
+    @classmethod
+    def deserialize(cls, data: bytes) -> tuple[FixedIntType, bytes]:
+        r, offset = cls.deserialize_from(data)
+        return r, data[offset:]
+
+    @classmethod
+    def _from_int_unchecked(cls, n: int) -> FixedIntType:
+        """Create an instance from an integer that is already known to be in range."""
+        if cls.__new__ is FixedIntType.__new__:
+            return int.__new__(cls, n)
+
+        # Enums and types with their own constructor still need to be called
+        return cls(n)
+
+    @classmethod
+    def deserialize_many_from(
+        cls, data: bytes | memoryview, count: int, offset: int = 0
+    ) -> tuple[list[FixedIntType], int]:
+        """Deserialize `count` consecutive integers starting at `offset`."""
+        if cls._bits % 8 != 0:
+            raise TypeError(f"Integer type with {cls._bits} bits is not byte aligned")
+
+        byte_size = cls._bits // 8
+        end = offset + count * byte_size
+
+        if len(data) < end:
+            raise ValueError(
+                f"Data is too short to contain {count} items of {byte_size} bytes"
+            )
+
+        if cls._byteorder == "little" and byte_size in _INT_FORMATS:
+            code = _INT_FORMATS[byte_size]
+            code = code.lower() if cls._signed else code
+            ints = struct.unpack_from(f"<{count}{code}", data, offset)
+        else:
+            ints = [
+                int.from_bytes(
+                    data[i : i + byte_size], cls._byteorder, signed=cls._signed
+                )
+                for i in range(offset, end, byte_size)
+            ]
+
+        if cls.__new__ is FixedIntType.__new__:
+            return [int.__new__(cls, n) for n in ints], end
+
+        return [cls(n) for n in ints], end
+
+    @classmethod
+    def deserialize_many(
+        cls, data: bytes, count: int
+    ) -> tuple[list[FixedIntType], bytes]:
+        values, offset = cls.deserialize_many_from(data, count)
+        return values, data[offset:]
 
 
 class uint_t(FixedIntType, signed=False):
@@ -692,15 +898,24 @@ class BaseFloat(float):
         ).to_bytes(self._size, "little")
 
     @classmethod
-    def deserialize(cls, data: bytes) -> tuple[BaseFloat, bytes]:
-        if len(data) < cls._size:
+    def deserialize_from(
+        cls, data: bytes | memoryview, offset: int = 0
+    ) -> tuple[BaseFloat, int]:
+        end = offset + cls._size
+
+        if len(data) < end:
             raise ValueError(f"Data is too short to contain {cls._size} bytes")
 
         double_bytes = cls._convert_format(
-            src=cls, dst=Double, n=int.from_bytes(data[: cls._size], "little")
+            src=cls, dst=Double, n=int.from_bytes(data[offset:end], "little")
         ).to_bytes(Double._size, "little")
 
-        return cls(struct.unpack("<d", double_bytes)[0]), data[cls._size :]
+        return cls(struct.unpack("<d", double_bytes)[0]), end
+
+    @classmethod
+    def deserialize(cls, data: bytes) -> tuple[BaseFloat, bytes]:
+        r, offset = cls.deserialize_from(data)
+        return r, data[offset:]
 
 
 class Half(BaseFloat, exponent_bits=5, fraction_bits=10):
@@ -724,18 +939,24 @@ class LVBytes(bytes):
         return len(self).to_bytes(self._prefix_length, "little", signed=False) + self
 
     @classmethod
-    def deserialize(cls, data):
-        if len(data) < cls._prefix_length:
+    def deserialize_from(cls, data, offset=0):
+        start = offset + cls._prefix_length
+
+        if len(data) < start:
             raise ValueError("Data is too short")
 
-        num_bytes = int.from_bytes(data[: cls._prefix_length], "little")
+        num_bytes = int.from_bytes(data[offset:start], "little")
+        end = start + num_bytes
 
-        if len(data) < cls._prefix_length + num_bytes:
+        if len(data) < end:
             raise ValueError("Data is too short")
 
-        s = data[cls._prefix_length : cls._prefix_length + num_bytes]
+        return cls(data[start:end]), end
 
-        return cls(s), data[cls._prefix_length + num_bytes :]
+    @classmethod
+    def deserialize(cls, data):
+        r, offset = cls.deserialize_from(data)
+        return r, data[offset:]
 
 
 def LimitedLVBytes(max_len):  # noqa: N802
@@ -795,6 +1016,12 @@ class KwargTypeMeta(type):
         if not isinstance(key, tuple):
             key = (key,)
 
+        # Subscripting happens at runtime too, skip the binding for known keys
+        try:
+            return cls._anonymous_classes[cls, key]
+        except KeyError:
+            pass
+
         signature = inspect.Signature(
             parameters=[
                 inspect.Parameter(
@@ -813,15 +1040,22 @@ class KwargTypeMeta(type):
         expanded_key = tuple(bound.arguments.values())
 
         if (cls, expanded_key) in cls._anonymous_classes:
-            return cls._anonymous_classes[cls, expanded_key]
+            anon_cls = cls._anonymous_classes[cls, expanded_key]
+        else:
 
-        class AnonSubclass(cls, **bound.arguments):
-            pass
+            class AnonSubclass(cls, **bound.arguments):
+                pass
 
-        AnonSubclass.__name__ = AnonSubclass.__qualname__ = f"Anonymous{cls.__name__}"
-        cls._anonymous_classes[cls, expanded_key] = AnonSubclass
+            AnonSubclass.__name__ = f"Anonymous{cls.__name__}"
+            AnonSubclass.__qualname__ = AnonSubclass.__name__
 
-        return AnonSubclass
+            anon_cls = cls._anonymous_classes[cls, expanded_key] = AnonSubclass
+
+        # Also cache the key as given. Partial keys are always shorter than expanded
+        # keys so the two never collide.
+        cls._anonymous_classes[cls, key] = anon_cls
+
+        return anon_cls
 
     def __subclasscheck__(cls, subclass):
         if type(subclass) is not KwargTypeMeta:
@@ -866,15 +1100,35 @@ class List(list, metaclass=KwargTypeMeta):
         return b"".join([self._item_type(i).serialize() for i in self])
 
     @classmethod
-    def deserialize(cls: type[T], data: bytes) -> tuple[T, bytes]:
+    def deserialize_from(
+        cls: type[T], data: bytes | memoryview, offset: int = 0
+    ) -> tuple[T, int]:
         assert cls._item_type is not None
 
+        # Fixed width items can be counted up front and decoded all at once
+        size = getattr(cls._item_type, "_size", None)
+
+        if (
+            size
+            and (len(data) - offset) % size == 0
+            and _supports_deserialize_many(cls._item_type)
+        ):
+            items, offset = deserialize_many_from(
+                cls._item_type, data, (len(data) - offset) // size, offset
+            )
+            return cls(items), offset
+
         lst = cls()
-        while data:
-            item, data = cls._item_type.deserialize(data)
+        while offset < len(data):
+            item, offset = deserialize_from(cls._item_type, data, offset)
             lst.append(item)
 
-        return lst, data
+        return lst, offset
+
+    @classmethod
+    def deserialize(cls: type[T], data: bytes) -> tuple[T, bytes]:
+        lst, offset = cls.deserialize_from(data)
+        return lst, data[offset:]
 
 
 class LVList(list, metaclass=KwargTypeMeta):
@@ -890,14 +1144,19 @@ class LVList(list, metaclass=KwargTypeMeta):
         )
 
     @classmethod
-    def deserialize(cls: type[T], data: bytes) -> tuple[T, bytes]:
+    def deserialize_from(
+        cls: type[T], data: bytes | memoryview, offset: int = 0
+    ) -> tuple[T, int]:
         assert cls._item_type is not None
-        length, data = cls._length_type.deserialize(data)
-        r = cls()
-        for _i in range(length):
-            item, data = cls._item_type.deserialize(data)
-            r.append(item)
-        return r, data
+        length, offset = deserialize_from(cls._length_type, data, offset)
+
+        items, offset = deserialize_many_from(cls._item_type, data, length, offset)
+        return cls(items), offset
+
+    @classmethod
+    def deserialize(cls: type[T], data: bytes) -> tuple[T, bytes]:
+        r, offset = cls.deserialize_from(data)
+        return r, data[offset:]
 
 
 class FixedList(list, metaclass=KwargTypeMeta):
@@ -917,13 +1176,18 @@ class FixedList(list, metaclass=KwargTypeMeta):
         return b"".join([self._item_type(i).serialize() for i in self])
 
     @classmethod
-    def deserialize(cls: type[T], data: bytes) -> tuple[T, bytes]:
+    def deserialize_from(
+        cls: type[T], data: bytes | memoryview, offset: int = 0
+    ) -> tuple[T, int]:
         assert cls._item_type is not None
-        r = cls()
-        for _i in range(cls._length):
-            item, data = cls._item_type.deserialize(data)
-            r.append(item)
-        return r, data
+
+        items, offset = deserialize_many_from(cls._item_type, data, cls._length, offset)
+        return cls(items), offset
+
+    @classmethod
+    def deserialize(cls: type[T], data: bytes) -> tuple[T, bytes]:
+        r, offset = cls.deserialize_from(data)
+        return r, data[offset:]
 
 
 class CharacterString(str):
@@ -948,26 +1212,37 @@ class CharacterString(str):
         ) + self.encode("utf8")
 
     @classmethod
-    def deserialize(cls: type[T], data: bytes) -> tuple[T, bytes]:
-        if len(data) < cls._prefix_length:
+    def deserialize_from(
+        cls: type[T], data: bytes | memoryview, offset: int = 0
+    ) -> tuple[T, int]:
+        start = offset + cls._prefix_length
+
+        if len(data) < start:
             raise ValueError("Data is too short")
 
-        length = int.from_bytes(data[: cls._prefix_length], "little")
+        length = int.from_bytes(data[offset:start], "little")
 
         if length == cls._invalid_length:
-            return cls("", invalid=True), data[cls._prefix_length :]  # type:ignore[call-arg]
+            return cls("", invalid=True), start  # type:ignore[call-arg]
+
+        end = start + length
 
-        if len(data) < cls._prefix_length + length:
+        if len(data) < end:
             raise ValueError("Data is too short")
 
-        raw = data[cls._prefix_length : cls._prefix_length + length]
+        raw = bytes(data[start:end])
         text = raw.split(b"\x00")[0].decode("utf8", errors="replace")
 
         # FIXME: figure out how to get this working: `T` is not behaving as expected in
         # the classmethod when it is not bound.
         r = cls(text)  # type:ignore[call-arg]
         r.raw = raw
-        return r, data[cls._prefix_length + length :]
+        return r, end
+
+    @classmethod
+    def deserialize(cls: type[T], data: bytes) -> tuple[T, bytes]:
+        r, offset = cls.deserialize_from(data)
+        return r, data[offset:]
 
 
 class LongCharacterString(CharacterString):
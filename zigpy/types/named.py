@@ -41,21 +41,94 @@ class BroadcastAddress(basic.enum16):
     RESERVED_FFF8 = 0xFFF8
 
 
-class EUI64(basic.FixedList, item_type=basic.uint8_t, length=8):
-    # EUI 64-bit ID (an IEEE address).
+class EUI64(bytes):
+    """EUI 64-bit ID (an IEEE address), stored as its serialized little endian bytes.
+
+    Hashing reuses the hash cached by `bytes`. Equality matches the old `FixedList`
+    based type: instances compare equal to other `EUI64` instances and to lists of
+    integers in the same order, but not to raw bytes or tuples.
+    """
+
+    _length = 8
+    _size = 8
+    _item_type = basic.uint8_t
+
+    def __new__(cls, value: bytes | typing.Iterable[int]) -> Self:
+        instance = super().__new__(cls, value)
+
+        if len(instance) != cls._length:
+            raise ValueError(
+                f"{cls.__name__} must be {cls._length} bytes long: {value!r}"
+            )
+
+        return instance
+
     def __repr__(self) -> str:
-        return ":".join("%02x" % i for i in self[::-1])
+        return self[::-1].hex(":")
+
+    __str__ = __repr__
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, EUI64):
+            return bytes.__eq__(self, other)
+        elif isinstance(other, list):
+            return list(self) == other
+        elif isinstance(other, (bytes, bytearray, memoryview)):
+            # Returning `NotImplemented` would fall back to comparing the raw bytes
+            return False
+
+        return NotImplemented
+
+    def __ne__(self, other: object) -> bool:
+        result = self.__eq__(other)
+
+        if result is NotImplemented:
+            return result
 
-    def __hash__(self) -> int:  # type: ignore
-        return hash(repr(self))
+        return not result
+
+    __hash__ = bytes.__hash__
+
+    def serialize(self) -> bytes:
+        return bytes(self)
+
+    @classmethod
+    def deserialize_from(
+        cls, data: bytes | memoryview, offset: int = 0
+    ) -> tuple[EUI64, int]:
+        end = offset + cls._length
+
+        if len(data) < end:
+            raise ValueError(f"Data is too short to contain {cls._length} bytes")
+
+        return cls(data[offset:end]), end
+
+    @classmethod
+    def deserialize(cls, data: bytes) -> tuple[EUI64, bytes]:
+        r, offset = cls.deserialize_from(data)
+        return r, data[offset:]
+
+    @classmethod
+    def deserialize_many_from(
+        cls, data: bytes | memoryview, count: int, offset: int = 0
+    ) -> tuple[list[EUI64], int]:
+        end = offset + count * cls._size
+
+        if len(data) < end:
+            raise ValueError(
+                f"Data is too short to contain {count} items of {cls._size} bytes"
+            )
+
+        return [
+            cls(data[i : i + cls._size]) for i in range(offset, end, cls._size)
+        ], end
 
     @classmethod
     def convert(cls, ieee: str) -> EUI64:
         if ieee is None:
             return None
-        ieee = [basic.uint8_t(p) for p in _hex_string_to_bytes(ieee)[::-1]]
-        assert len(ieee) == cls._length
-        return cls(ieee)
+
+        return cls(_hex_string_to_bytes(ieee)[::-1])
 
 
 EUI64.UNKNOWN = EUI64.convert("FF:FF:FF:FF:FF:FF:FF:FF")
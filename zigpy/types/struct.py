@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 import dataclasses
-import inspect
+import struct
 import typing
 
 import zigpy.types as t
 from typing_extensions import Self
 
 NoneType = type(None)
+NOT_COMPILED = object()
 
 
 class ListSubclass(list):
@@ -62,6 +63,9 @@ class Struct:
     def _real_cls(cls) -> type:
         # The "Optional" subclass is dynamically created and breaks types.
         # We have to use a little introspection to find our real class.
+        if cls.__name__ != "Optional":
+            return cls
+
         return next(c for c in cls.__mro__ if c.__name__ != "Optional")
 
     def __init_subclass__(cls) -> None:
@@ -69,6 +73,7 @@ class Struct:
 
         # We generate fields up here to fail early and cache it
         cls.fields = cls._real_cls()._get_fields()
+        cls._fields_by_name = {f.name: f for f in cls.fields}
 
         # Check to see if the Struct is also an integer
         cls._int_type = next(
@@ -81,6 +86,7 @@ class Struct:
         )
         cls._hash = -1
         cls._frozen = False
+        cls._codec = NOT_COMPILED
 
     def __new__(cls: type[_STRUCT], *args, **kwargs) -> _STRUCT:
         cls = cls._real_cls()
@@ -96,31 +102,37 @@ class Struct:
             # Integer constructor
             return cls.deserialize(cls._int_type(args[0]).serialize())[0]
 
-        # Pretend our signature is `__new__(cls, p1: t1, p2: t2, ...)`
-        signature = inspect.Signature(
-            parameters=[
-                inspect.Parameter(
-                    name=f.name,
-                    kind=inspect.Parameter.POSITIONAL_OR_KEYWORD,
-                    default=None,
-                    annotation=f.type,
-                )
-                for f in cls.fields
-            ]
-        )
-
-        bound = signature.bind(*args, **kwargs)
-        bound.apply_defaults()
-
+        bound = cls._bind_fields(args, kwargs)
         instance = super().__new__(cls)
 
         # Set each attributes on the instance
-        for name, value in bound.arguments.items():
-            field = getattr(cls.fields, name)
-            setattr(instance, name, field._convert_type(value, struct=instance))
+        for field in cls.fields:
+            value = bound.get(field.name)
+            setattr(instance, field.name, field._convert_type(value, struct=instance))
 
         return instance
 
+    @classmethod
+    def _bind_fields(
+        cls, args: tuple[typing.Any, ...], kwargs: dict[str, typing.Any]
+    ) -> dict[str, typing.Any]:
+        """Bind arguments as if our signature were `__new__(cls, p1=None, ...)`."""
+
+        if len(args) > len(cls.fields):
+            raise TypeError("too many positional arguments")
+
+        bound = {f.name: value for f, value in zip(cls.fields, args)}
+
+        for name, value in kwargs.items():
+            if name not in cls._fields_by_name:
+                raise TypeError(f"got an unexpected keyword argument {name!r}")
+            elif name in bound:
+                raise TypeError(f"multiple values for argument {name!r}")
+
+            bound[name] = value
+
+        return bound
+
     @classmethod
     def _get_fields(cls) -> list[StructField]:
         fields = ListSubclass()
@@ -228,7 +240,25 @@ class Struct:
     def as_tuple(self, *, skip_missing: bool = False) -> tuple:
         return tuple(self.as_dict(skip_missing=skip_missing).values())
 
+    @classmethod
+    def _get_codec(cls) -> _CompiledCodec | None:
+        codec = cls._codec
+
+        # Codecs are compiled on first use, once all of the field types exist
+        if codec is NOT_COMPILED:
+            codec = cls._codec = _CompiledCodec.compile(cls)
+
+        return codec
+
     def serialize(self) -> bytes:
+        codec = self._get_codec()
+
+        if codec is not None:
+            return codec.serialize(self)
+
+        return self._serialize_generic()
+
+    def _serialize_generic(self) -> bytes:
         chunks = []
 
         bit_offset = 0
@@ -251,7 +281,7 @@ class Struct:
 
                 # Serialize the current segment of bitfields once we reach a boundary
                 if bit_offset % 8 == 0:
-                    chunks.append(t.Bits.from_bitfields(bitfields).serialize())
+                    chunks.append(t.pack_bitfields(bitfields))
                     bitfields = []
 
                 continue
@@ -272,7 +302,20 @@ class Struct:
         return b"".join(chunks)
 
     @classmethod
-    def deserialize(cls: type[_STRUCT], data: bytes) -> tuple[_STRUCT, bytes]:
+    def deserialize_from(
+        cls: type[_STRUCT], data: bytes | memoryview, offset: int = 0
+    ) -> tuple[_STRUCT, int]:
+        codec = cls._get_codec()
+
+        if codec is not None:
+            return codec.deserialize_from(data, offset)
+
+        return cls._deserialize_from_generic(data, offset)
+
+    @classmethod
+    def _deserialize_from_generic(
+        cls: type[_STRUCT], data: bytes | memoryview, offset: int = 0
+    ) -> tuple[_STRUCT, int]:
         instance = cls()
 
         bit_length = 0
@@ -281,7 +324,7 @@ class Struct:
         for field in cls.fields:
             if field.requires is not None and not field.requires(instance):
                 continue
-            elif not data and field.optional:
+            elif offset >= len(data) and field.optional:
                 continue
 
             field_type = field.get_type(struct=instance)
@@ -293,18 +336,19 @@ class Struct:
                 bitfields.append(field)
 
                 if bit_length % 8 == 0:
-                    if len(data) < bit_length // 8:
+                    end = offset + bit_length // 8
+
+                    if len(data) < end:
                         raise ValueError(f"Data is too short to contain {bitfields}")
 
-                    bits, _ = t.Bits.deserialize(data[: bit_length // 8])
-                    data = data[bit_length // 8 :]
+                    values = t.unpack_bitfields(
+                        [f.type for f in bitfields], data[offset:end]
+                    )
+                    offset = end
 
-                    for f in bitfields:
-                        value, bits = f.type.from_bits(bits)
+                    for f, value in zip(bitfields, values):
                         setattr(instance, f.name, value)
 
-                    assert not bits
-
                     bit_length = 0
                     bitfields = []
 
@@ -315,7 +359,7 @@ class Struct:
                     f" {bitfields}"
                 )
 
-            value, data = field_type.deserialize(data)
+            value, offset = t.deserialize_from(field_type, data, offset)
             setattr(instance, field.name, value)
 
         if bitfields:
@@ -324,7 +368,12 @@ class Struct:
                 f" {bitfields}"
             )
 
-        return instance, data
+        return instance, offset
+
+    @classmethod
+    def deserialize(cls: type[_STRUCT], data: bytes) -> tuple[_STRUCT, bytes]:
+        instance, offset = cls.deserialize_from(data)
+        return instance, data[offset:]
 
     # TODO: improve? def replace(self: typing.Type[_STRUCT], **kwargs) -> _STRUCT:
     def replace(self, **kwargs: dict[str, typing.Any]) -> Struct:
@@ -477,3 +526,259 @@ class Struct:
         instance._frozen = True
 
         return instance
+
+
+_INT = 0
+_RAW_INT = 1
+_BITFIELDS = 2
+
+
+def _is_plain_int_type(field_type: type) -> bool:
+    """Check if an integer type can be packed without calling its own methods."""
+
+    return (
+        issubclass(field_type, t.FixedIntType)
+        and not issubclass(field_type, Struct)
+        and field_type.serialize is t.FixedIntType.serialize
+        and field_type.bits is t.FixedIntType.bits
+        and field_type.from_bits.__func__ is t.FixedIntType.from_bits.__func__
+        and (
+            field_type.deserialize_from.__func__
+            is t.FixedIntType.deserialize_from.__func__
+        )
+        and t.basic._has_native_deserialize_from(field_type)
+    )
+
+
+class _PackedRun:
+    """Consecutive integer fields and bitfields decoded with a single `struct` call."""
+
+    def __init__(self, formats: list[str], items: list[tuple]) -> None:
+        self.struct = struct.Struct("<" + "".join(formats))
+        self.size = self.struct.size
+        self.items = items
+
+    def unpack(
+        self, data: bytes | memoryview, offset: int
+    ) -> list[tuple[str, typing.Any]]:
+        if len(data) < offset + self.size:
+            raise ValueError(f"Data is too short to contain {self.size} bytes")
+
+        values = []
+
+        for item, n in zip(self.items, self.struct.unpack_from(data, offset)):
+            kind = item[0]
+
+            if kind == _INT:
+                values.append((item[1].name, item[2]._from_int_unchecked(n)))
+            elif kind == _RAW_INT:
+                _, field, field_type = item
+                n = int.from_bytes(n, field_type._byteorder, signed=field_type._signed)
+                values.append((field.name, field_type._from_int_unchecked(n)))
+            else:
+                _, size, bitfields = item
+
+                if size > 1:
+                    n = int.from_bytes(n, "big")
+
+                for field, field_type, shift, mask, sign_bit in bitfields:
+                    value = (n >> shift) & mask
+
+                    if sign_bit and value & sign_bit:
+                        value -= mask + 1
+
+                    values.append((field.name, field_type._from_int_unchecked(value)))
+
+        return values
+
+    def pack(self, struct_: Struct) -> bytes:
+        values = []
+
+        for item in self.items:
+            kind = item[0]
+
+            if kind == _INT:
+                values.append(_get_packed_value(struct_, item[1]))
+            elif kind == _RAW_INT:
+                _, field, field_type = item
+                value = _get_packed_value(struct_, field)
+                values.append(
+                    int.to_bytes(
+                        value,
+                        field_type._bits // 8,
+                        field_type._byteorder,
+                        signed=field_type._signed,
+                    )
+                )
+            else:
+                _, size, bitfields = item
+                n = 0
+
+                for field, _, shift, mask, _ in bitfields:
+                    n |= (_get_packed_value(struct_, field) & mask) << shift
+
+                values.append(n if size == 1 else n.to_bytes(size, "big"))
+
+        return self.struct.pack(*values)
+
+
+def _get_packed_value(struct_: Struct, field: StructField) -> typing.Any:
+    value = getattr(struct_, field.name)
+
+    if value is None:
+        raise ValueError(f"Value for field {field.name!r} is required: {struct_!r}")
+
+    return field._convert_type(value, struct=struct_)
+
+
+class _CompiledCodec:
+    """Specialized serializer and deserializer for a `Struct` subclass.
+
+    Runs of integers and bitfields are packed with precompiled `struct.Struct` objects,
+    all other fields are handled one at a time exactly like the generic code path.
+    """
+
+    def __init__(self, cls: type[Struct], steps: list[_PackedRun | StructField]):
+        self.cls = cls._real_cls()
+        self.steps = steps
+
+        self.fast_new = self.cls.__new__ is Struct.__new__
+        self.fast_setattr = self.cls.__setattr__ is Struct.__setattr__
+        self.blank = {f.name: None for f in cls.fields}
+
+    @classmethod
+    def compile(cls, struct_cls: type[Struct]) -> _CompiledCodec | None:
+        steps: list[_PackedRun | StructField] = []
+
+        formats: list[str] = []
+        items: list[tuple] = []
+        bit_length = 0
+        bitfields: list[StructField] = []
+
+        for field in struct_cls.fields:
+            if field.dynamic_type is not None:
+                return None
+
+            field_type = field.type
+            conditional = field.requires is not None or field.optional
+
+            if issubclass(field_type, t.FixedIntType) and not (
+                field_type._bits % 8 == 0 and bit_length % 8 == 0
+            ):
+                # Let the generic code path deal with (or fail on) exotic bitfields
+                if conditional or not _is_plain_int_type(field_type):
+                    return None
+
+                bit_length += field_type._bits
+                bitfields.append(field)
+
+                if bit_length % 8 == 0:
+                    size = bit_length // 8
+                    group = []
+                    shift = 0
+
+                    for f in bitfields:
+                        bits = f.type._bits
+                        sign_bit = 1 << (bits - 1) if f.type._signed else 0
+                        group.append((f, f.type, shift, (1 << bits) - 1, sign_bit))
+                        shift += bits
+
+                    formats.append("B" if size == 1 else f"{size}s")
+                    items.append((_BITFIELDS, size, group))
+
+                    bit_length = 0
+                    bitfields = []
+
+                continue
+            elif bitfields:
+                return None
+
+            if not conditional and _is_plain_int_type(field_type):
+                size = field_type._bits // 8
+
+                if field_type._byteorder == "little" and size in t.basic._INT_FORMATS:
+                    code = t.basic._INT_FORMATS[size]
+                    formats.append(code.lower() if field_type._signed else code)
+                    items.append((_INT, field, field_type))
+                else:
+                    formats.append(f"{size}s")
+                    items.append((_RAW_INT, field, field_type))
+
+                continue
+
+            if items:
+                steps.append(_PackedRun(formats, items))
+                formats = []
+                items = []
+
+            steps.append(field)
+
+        if bitfields:
+            return None
+
+        if items:
+            steps.append(_PackedRun(formats, items))
+
+        return cls(struct_cls, steps)
+
+    def _new_instance(self) -> Struct:
+        if not self.fast_new:
+            return self.cls()
+
+        instance = super(Struct, self.cls).__new__(self.cls)
+        instance.__dict__.update(self.blank)
+
+        return instance
+
+    def deserialize_from(
+        self, data: bytes | memoryview, offset: int
+    ) -> tuple[Struct, int]:
+        instance = self._new_instance()
+
+        for step in self.steps:
+            if type(step) is _PackedRun:
+                values = step.unpack(data, offset)
+                offset += step.size
+
+                if self.fast_setattr:
+                    instance.__dict__.update(values)
+                else:
+                    for name, value in values:
+                        setattr(instance, name, value)
+
+                continue
+
+            if step.requires is not None and not step.requires(instance):
+                continue
+            elif offset >= len(data) and step.optional:
+                continue
+
+            value, offset = t.deserialize_from(step.type, data, offset)
+            setattr(instance, step.name, value)
+
+        return instance, offset
+
+    def serialize(self, struct_: Struct) -> bytes:
+        chunks = []
+
+        for step in self.steps:
+            if type(step) is _PackedRun:
+                chunks.append(step.pack(struct_))
+                continue
+
+            if step.requires is not None and not step.requires(struct_):
+                continue
+
+            value = getattr(struct_, step.name)
+
+            if value is None:
+                if step.optional:
+                    continue
+
+                raise ValueError(
+                    f"Value for field {step.name!r} is required: {struct_!r}"
+                )
+
+            chunks.append(step._convert_type(value, struct=struct_).serialize())
+
+        return b"".join(chunks)
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import abc
 import asyncio
+import contextlib
+import contextvars
+import enum
 import functools
 import inspect
 import logging
@@ -67,6 +70,39 @@ class ListenableMixin:
                 )
         return result
 
+    def listener_event_unbatched(
+        self, method_name: str, *args
+    ) -> list[typing.Any | None]:
+        """Emit an event only to listeners that do not implement `<method_name>_batch`.
+
+        The others are sent the arguments later on, with `listener_event_batch`.
+        """
+        result = []
+        for listener, include_context in tuple(self._listeners.values()):
+            method = getattr(listener, method_name, None)
+
+            if method is None or hasattr(listener, f"{method_name}_batch"):
+                continue
+
+            try:
+                if include_context:
+                    result.append(method(self, *args))
+                else:
+                    result.append(method(*args))
+            except Exception as e:
+                LOGGER.debug(
+                    "Error calling listener %r with args %r", method, args, exc_info=e
+                )
+        return result
+
+    def listener_event_batch(
+        self, method_name: str, args_list: list[tuple[typing.Any, ...]]
+    ) -> list[typing.Any | None]:
+        """Emit `<method_name>_batch` with a list of `<method_name>` event arguments,
+        to listeners that opt into batched events by implementing it.
+        """
+        return self.listener_event(f"{method_name}_batch", args_list)
+
     async def async_event(self, method_name: str, *args) -> list[typing.Any]:
         tasks = []
         for listener, include_context in tuple(self._listeners.values()):
@@ -170,6 +206,143 @@ retryable_request = functools.partial(
 )
 
 
+class RequestPriority(enum.IntEnum):
+    """Scheduling priority of requests sent through the coordinator."""
+
+    # Interviews, topology scans and other requests nobody is waiting on
+    BACKGROUND = -1
+    NORMAL = 0
+
+
+_REQUEST_PRIORITY: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "request_priority", default=RequestPriority.NORMAL
+)
+
+
+def current_request_priority() -> int:
+    """Priority of requests sent from the current context."""
+    return _REQUEST_PRIORITY.get()
+
+
+@contextlib.contextmanager
+def request_priority(priority: int) -> typing.Iterator[None]:
+    """Send all requests made within the context, including from tasks created within
+    it, with the given priority.
+    """
+    token = _REQUEST_PRIORITY.set(priority)
+
+    try:
+        yield
+    finally:
+        _REQUEST_PRIORITY.reset(token)
+
+
+class AdaptiveConcurrency:
+    """Adjusts the max value of a concurrency limiter with AIMD.
+
+    The limit grows by one after every window of successful requests and is halved
+    when a request fails to be delivered or when the request latency grows well beyond
+    the lowest latency seen so far. The limit is only decreased again once a full
+    window of requests sent with the lowered limit has completed.
+    """
+
+    # Smoothing factor of the latency moving average
+    LATENCY_SMOOTHING = 0.1
+    # Rate at which the latency baseline follows latencies above it
+    BASELINE_DRIFT = 0.01
+    # Requests are congested once their latency exceeds the baseline by this factor
+    # and by this many seconds
+    LATENCY_TOLERANCE = 2.0
+    LATENCY_MIN_INCREASE = 0.1
+    DECREASE_FACTOR = 0.5
+
+    def __init__(self, limiter, *, min_value: int, max_value: int) -> None:
+        if not 1 <= min_value <= max_value:
+            raise ValueError(
+                f"Concurrency bounds must satisfy 1 <= min <= max:"
+                f" min={min_value!r}, max={max_value!r}"
+            )
+
+        self.limiter = limiter
+        self.min_value = min_value
+        self.max_value = max_value
+
+        self.latency: float | None = None
+        self.baseline_latency: float | None = None
+
+        self._successes = 0
+        self._completed_since_decrease = max_value
+
+        self.limiter.max_value = min(max(limiter.max_value, min_value), max_value)
+
+    def _set_limit(self, limit: int, reason: str) -> None:
+        LOGGER.debug(
+            "Adaptive concurrency: changing limit from %d to %d (%s)",
+            self.limiter.max_value,
+            limit,
+            reason,
+        )
+
+        self.limiter.max_value = limit
+        self._successes = 0
+
+    def _decrease(self, reason: str) -> None:
+        limit = self.limiter.max_value
+
+        if self._completed_since_decrease < limit:
+            return
+
+        self._completed_since_decrease = 0
+        new_limit = max(self.min_value, int(limit * self.DECREASE_FACTOR))
+
+        if new_limit != limit:
+            self._set_limit(new_limit, reason)
+
+    def on_success(self, latency: float) -> None:
+        """Record a request that was sent successfully."""
+        self._completed_since_decrease += 1
+
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.LATENCY_SMOOTHING * (latency - self.latency)
+
+        if self.baseline_latency is None or latency < self.baseline_latency:
+            self.baseline_latency = latency
+        else:
+            self.baseline_latency += self.BASELINE_DRIFT * (
+                latency - self.baseline_latency
+            )
+
+        if (
+            self.latency > self.LATENCY_TOLERANCE * self.baseline_latency
+            and self.latency - self.baseline_latency > self.LATENCY_MIN_INCREASE
+        ):
+            self._decrease(
+                f"latency {self.latency:0.3f}s,"
+                f" baseline {self.baseline_latency:0.3f}s"
+            )
+            return
+
+        self._successes += 1
+        limit = self.limiter.max_value
+
+        if self._successes >= limit and limit < self.max_value:
+            self._set_limit(limit + 1, f"{self._successes} successful requests")
+
+    def on_failure(self) -> None:
+        """Record a request that failed to be delivered."""
+        self._completed_since_decrease += 1
+        self._successes = 0
+        self._decrease("delivery failure")
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} [limit:{self.limiter.max_value},"
+            f" bounds:{self.min_value}-{self.max_value}, latency:{self.latency}]>"
+        )
+
+
 def aes_mmo_hash_update(length: int, result: bytes, data: bytes) -> tuple[int, bytes]:
     block_size = AES.block_size // 8
 
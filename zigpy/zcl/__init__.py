@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import collections
 from datetime import datetime, timezone
 import enum
@@ -7,10 +8,12 @@ import functools
 import itertools
 import logging
 import types
-from typing import TYPE_CHECKING, Any, Iterable, Sequence
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable, Sequence
 import warnings
 
 from zigpy import util
+from zigpy.datastructures import get_timer_service
+from zigpy.exceptions import DeliveryError
 import zigpy.types as t
 from zigpy.typing import AddressingMode, EndpointType
 from zigpy.zcl import foundation
@@ -23,6 +26,75 @@ if TYPE_CHECKING:
 
 LOGGER = logging.getLogger(__name__)
 
+# Size of a ZCL header with a manufacturer code
+MAX_ZCL_HEADER_SIZE = 5
+# Number of frames of a split request that are sent at the same time
+MAX_CONCURRENT_SPLIT_REQUESTS = 2
+
+
+def _serialized_sizes(records: Sequence[Any]) -> list[int] | None:
+    """Serialized size of every record, `None` if they cannot be serialized."""
+    try:
+        return [len(record.serialize()) for record in records]
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _split_records(
+    records: Sequence[Any], sizes: Sequence[int], limit: int
+) -> list[list[Any]]:
+    """Split records into consecutive chunks whose total size does not exceed a limit.
+
+    Records that are larger than the limit on their own are put into their own chunk.
+    """
+    chunks: list[list[Any]] = [[]]
+    used = 0
+
+    for record, size in zip(records, sizes):
+        if chunks[-1] and used + size > limit:
+            chunks.append([])
+            used = 0
+
+        chunks[-1].append(record)
+        used += size
+
+    return chunks
+
+
+def _merge_status_records(results: Sequence[list]) -> list:
+    """Merge the responses to a split write or configure reporting request.
+
+    These responses contain a single success record if every attribute succeeded, or
+    only records for the failed attributes otherwise.
+    """
+    for result in results:
+        # Default responses fail the entire request
+        if not isinstance(result[0], list):
+            return result
+
+    if len(results) == 1:
+        return results[0]
+
+    failures = [
+        record
+        for result in results
+        for record in result[0]
+        if record.status != foundation.Status.SUCCESS
+    ]
+
+    if not failures:
+        return results[0]
+
+    return _with_status_records(results[0], failures)
+
+
+def _with_status_records(result: Any, records: list) -> Any:
+    """Copy of a response to a general command with other status records."""
+    if isinstance(result, t.Struct):
+        return result.replace(status_records=records)
+
+    return [records, *result[1:]]
+
 
 def convert_list_schema(
     schema: Sequence[type], command_id: int, direction: foundation.Direction
@@ -86,6 +158,17 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
     attributes_by_name: dict[str, foundation.ZCLAttributeDef] = {}
     commands_by_name: dict[str, foundation.ZCLCommandDef] = {}
 
+    # Concurrent `read_attributes` calls made within this many seconds of each other are
+    # merged into a single request. Disabled by default, set on a cluster class or
+    # instance to opt in.
+    read_attributes_coalesce_window: float = 0
+
+    # Loads the attribute cache on first use, when loading was deferred at startup
+    _attr_cache_loader: (
+        Callable[[Cluster], Awaitable[tuple[dict[int, Any], dict[int, datetime]]]]
+        | None
+    ) = None
+
     # Internal caches and indices
     _registry: dict = {}
     _registry_range: dict = {}
@@ -199,6 +282,10 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
         )
         cls.commands_by_name = {cmd.name: cmd for cmd in all_cmds}
 
+        # Record which clusters define each command schema, for request listeners
+        for cmd in cls.commands_by_name.values():
+            cmd.schema.cluster_ids = cmd.schema.cluster_ids | {cls.cluster_id}
+
         if cls._skip_registry:
             return
 
@@ -212,8 +299,14 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
         self._endpoint: EndpointType = endpoint
         self._attr_cache: dict[int, Any] = {}
         self._attr_last_updated: dict[int, datetime] = {}
+        self._attr_cache_load: asyncio.Task | None = None
+        # Attributes cleared while the attribute cache is not loaded yet
+        self._attr_cache_cleared: set[int] = set()
         self.unsupported_attributes: set[int | str] = set()
         self._listeners = {}
+        self._coalesced_reads: dict[
+            int | None, tuple[dict[int, None], asyncio.Task]
+        ] = {}
         self._type: ClusterType = (
             ClusterType.Server if is_server else ClusterType.Client
         )
@@ -258,10 +351,23 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
         cluster.cluster_id = cluster_id
         return cluster
 
-    def deserialize(self, data: bytes) -> tuple[foundation.ZCLHeader, ...]:
+    def deserialize(
+        self, data: bytes, *, hdr: foundation.ZCLHeader | None = None
+    ) -> tuple[foundation.ZCLHeader, ...]:
+        """Deserialize a ZCL frame.
+
+        If the frame's header has already been decoded, it can be passed as `hdr` to
+        avoid decoding it again. `data` must still contain the entire frame.
+        """
         self.debug("Received ZCL frame: %r", data)
 
-        hdr, data = foundation.ZCLHeader.deserialize(data)
+        if hdr is None:
+            hdr, offset = foundation.ZCLHeader.deserialize_from(data, 0)
+        else:
+            # Frame control, optional manufacturer code, TSN, and command ID
+            offset = 5 if hdr.frame_control.is_manufacturer_specific else 3
+
+        data = data[offset:]
         self.debug("Decoded ZCL frame header: %r", hdr)
 
         if hdr.frame_control.frame_type == foundation.FrameType.CLUSTER_COMMAND:
@@ -284,13 +390,13 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
 
             command = foundation.GENERAL_COMMANDS[hdr.command_id]
 
-        hdr.frame_control.direction = command.direction
-        response, data = command.schema.deserialize(data)
+        hdr = hdr.with_direction(command.direction)
+        response, offset = t.deserialize_from(command.schema, data, 0)
 
         self.debug("Decoded ZCL frame: %s:%r", type(self).__name__, response)
 
-        if data:
-            self.debug("Data remains after deserializing ZCL frame: %r", data)
+        if offset < len(data):
+            self.debug("Data remains after deserializing ZCL frame: %r", data[offset:])
 
         return hdr, response
 
@@ -485,9 +591,153 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
                     foundation.Status.SUCCESS,
                 )
 
+    def _max_records_size(self) -> int | None:
+        """Space left for records in a single ZCL frame sent to the device, `None` if
+        neither the radio nor the device report how large frames can be.
+        """
+        device = self._endpoint.device
+        limits = [
+            getattr(device.application, "max_aps_payload_size", None),
+            getattr(device.node_desc, "maximum_incoming_transfer_size", None),
+        ]
+        limits = [limit for limit in limits if isinstance(limit, int) and limit > 0]
+
+        if not limits:
+            return None
+
+        return min(limits) - MAX_ZCL_HEADER_SIZE
+
+    async def _split_request(
+        self,
+        send: Callable[[list[Any]], Awaitable[Any]],
+        records: list[Any],
+        sizes: list[int] | None,
+    ) -> list[Any]:
+        """Send records split over as many requests as needed to fit into frames.
+
+        Requests are only split up front if they exceed the frame size limit. A request
+        the radio reports as too large to send is split in half and sent again.
+        """
+        limit = self._max_records_size()
+
+        if sizes is None or limit is None or sum(sizes) <= limit:
+            chunks = [records]
+        else:
+            chunks = _split_records(records, sizes, limit)
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_SPLIT_REQUESTS)
+
+        async def send_chunk(chunk: list[Any]) -> list[Any]:
+            async with semaphore:
+                try:
+                    return [await send(chunk)]
+                except DeliveryError as exc:
+                    if exc.status != t.APSStatus.APS_ASDU_TOO_LONG or len(chunk) < 2:
+                        raise
+
+            self.debug("Request with %d records is too large, splitting it", len(chunk))
+            half = len(chunk) // 2
+
+            return [*await send_chunk(chunk[:half]), *await send_chunk(chunk[half:])]
+
+        if len(chunks) == 1:
+            return await send_chunk(records)
+
+        self.debug("Splitting request into %d frames", len(chunks))
+        results = await asyncio.gather(*(send_chunk(chunk) for chunk in chunks))
+
+        return [result for chunk_results in results for result in chunk_results]
+
     def read_attributes_raw(self, attributes, manufacturer=None):
         attributes = [t.uint16_t(a) for a in attributes]
-        return self._read_attributes(attributes, manufacturer=manufacturer)
+        return self._read_attributes_split(attributes, manufacturer=manufacturer)
+
+    async def _read_attributes_split(
+        self, attributes: list[t.uint16_t], manufacturer: int | None = None
+    ) -> Any:
+        results = await self._split_request(
+            functools.partial(
+                self._read_attributes_complete, manufacturer=manufacturer
+            ),
+            attributes,
+            _serialized_sizes(attributes),
+        )
+
+        # Default responses fail the entire request
+        for result in results:
+            if not isinstance(result[0], list):
+                return result
+
+        if len(results) == 1:
+            return results[0]
+
+        return _with_status_records(
+            results[0], [record for result in results for record in result[0]]
+        )
+
+    async def _read_attributes_complete(
+        self, attributes: list[t.uint16_t], manufacturer: int | None = None
+    ) -> Any:
+        """Read attributes, reading again those that did not fit into the response."""
+        result = await self._read_attributes(attributes, manufacturer=manufacturer)
+
+        if not isinstance(result[0], list):
+            return result
+
+        # Devices leave out the records that do not fit into their response
+        received = [record.attrid for record in result[0]]
+
+        if not 0 < len(received) < len(attributes) or (
+            received != attributes[: len(received)]
+        ):
+            return result
+
+        self.debug(
+            "Response only contains %d of %d attributes, reading the rest",
+            len(received),
+            len(attributes),
+        )
+        rest = await self._read_attributes_complete(
+            attributes[len(received) :], manufacturer=manufacturer
+        )
+
+        if not isinstance(rest[0], list):
+            return result
+
+        return _with_status_records(result, [*result[0], *rest[0]])
+
+    async def _send_coalesced_read(self, manufacturer: int | None) -> Any:
+        await get_timer_service().sleep(self.read_attributes_coalesce_window)
+        attributes, _ = self._coalesced_reads.pop(manufacturer)
+
+        return await self.read_attributes_raw(
+            list(attributes), manufacturer=manufacturer
+        )
+
+    async def _read_attributes_coalesced(
+        self, attributes: list[int], manufacturer: int | None = None
+    ) -> Any:
+        """Read attributes together with any other reads started within the window."""
+        if manufacturer not in self._coalesced_reads:
+            self._coalesced_reads[manufacturer] = (
+                {},
+                asyncio.create_task(self._send_coalesced_read(manufacturer)),
+            )
+
+        pending, task = self._coalesced_reads[manufacturer]
+        pending.update(dict.fromkeys(attributes))
+
+        # The read is shared, one caller must not cancel it for the others
+        result = await asyncio.shield(task)
+
+        if not isinstance(result[0], list):
+            return result
+
+        requested = set(attributes)
+
+        return _with_status_records(
+            result, [rec for rec in result[0] if rec.attrid in requested]
+        )
 
     async def read_attributes(
         self,
@@ -512,9 +762,12 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
 
         to_read = []
         if allow_cache or only_cache:
+            await self._wait_attr_cache()
+            attr_cache = self._cached_attributes
+
             for idx, attribute in enumerate(attribute_ids):
-                if attribute in self._attr_cache:
-                    success[attributes[idx]] = self._attr_cache[attribute]
+                if attribute in attr_cache:
+                    success[attributes[idx]] = attr_cache[attribute]
                 elif attribute in self.unsupported_attributes:
                     failure[attributes[idx]] = foundation.Status.UNSUPPORTED_ATTRIBUTE
                 else:
@@ -525,7 +778,13 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
         if not to_read or only_cache:
             return success, failure
 
-        result = await self.read_attributes_raw(to_read, manufacturer=manufacturer)
+        if self.read_attributes_coalesce_window > 0:
+            result = await self._read_attributes_coalesced(
+                to_read, manufacturer=manufacturer
+            )
+        else:
+            result = await self.read_attributes_raw(to_read, manufacturer=manufacturer)
+
         if not isinstance(result[0], list):
             for attrid in to_read:
                 orig_attribute = orig_attributes[attrid]
@@ -572,9 +831,9 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
 
             try:
                 a.status = foundation.Status.SUCCESS
-                python_type = self.attributes[attrid].type
-                a.value.type = foundation.DATA_TYPES.pytype_to_datatype_id(python_type)
-                a.value.value = python_type(value)
+                attr_def = self.attributes[attrid]
+                a.value.type = attr_def.datatype_id
+                a.value.value = attr_def.type(value)
             except ValueError as e:
                 a.status = foundation.Status.UNSUPPORTED_ATTRIBUTE
                 self.error(str(e))
@@ -598,7 +857,7 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
                 continue
 
             attr = foundation.Attribute(attr_def.id, foundation.TypeValue())
-            attr.value.type = foundation.DATA_TYPES.pytype_to_datatype_id(attr_def.type)
+            attr.value.type = attr_def.datatype_id
 
             try:
                 attr.value.value = attr_def.type(value)
@@ -626,7 +885,13 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
         self, attrs: list[foundation.Attribute], manufacturer: int | None = None
     ) -> list:
         """Write attributes to device without internal 'attributes' validation"""
-        result = await self._write_attributes(attrs, manufacturer=manufacturer)
+        results = await self._split_request(
+            functools.partial(self._write_attributes, manufacturer=manufacturer),
+            attrs,
+            _serialized_sizes(attrs),
+        )
+        result = _merge_status_records(results)
+
         if not isinstance(result[0], list):
             return result
 
@@ -671,7 +936,7 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
         cfg = foundation.AttributeReportingConfig()
         cfg.direction = direction
         cfg.attrid = attr_def.id
-        cfg.datatype = foundation.DATA_TYPES.pytype_to_datatype_id(attr_def.type)
+        cfg.datatype = attr_def.datatype_id
         cfg.min_interval = min_interval
         cfg.max_interval = max_interval
         cfg.reportable_change = reportable_change
@@ -713,7 +978,12 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
             self._attr_reporting_rec(attr, rep[0], rep[1], rep[2])
             for attr, rep in attributes.items()
         ]
-        res = await self._configure_reporting(cfg, manufacturer=manufacturer)
+        results = await self._split_request(
+            functools.partial(self._configure_reporting, manufacturer=manufacturer),
+            cfg,
+            _serialized_sizes(cfg),
+        )
+        res = _merge_status_records(results)
 
         # Parse configure reporting result for unsupported attributes
         records = res[0]
@@ -818,13 +1088,80 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
         """Update specified attribute with specified value"""
         self._update_attribute(attrid, value)
 
+    @property
+    def _cached_attributes(self) -> dict[int, Any]:
+        """Cached attribute values.
+
+        If loading the attribute cache was deferred, it is loaded in the background and
+        only values that were updated since startup are available until it is loaded.
+        """
+        self._load_attr_cache()
+        return self._attr_cache
+
+    def _load_attr_cache(self) -> None:
+        """Start loading the attribute cache, if loading it was deferred."""
+        if self._attr_cache_loader is None or self._attr_cache_load is not None:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        self._attr_cache_load = loop.create_task(
+            self._run_attr_cache_loader(self._attr_cache_loader)
+        )
+
+    async def _wait_attr_cache(self) -> None:
+        """Load the attribute cache, if loading it was deferred, and wait for it."""
+        self._load_attr_cache()
+
+        if self._attr_cache_load is not None:
+            await asyncio.shield(self._attr_cache_load)
+
+    async def _run_attr_cache_loader(
+        self, loader: Callable[[Cluster], Awaitable[tuple[dict, dict]]]
+    ) -> None:
+        try:
+            values, timestamps = await loader(self)
+        except Exception as exc:
+            # The cache is loaded again on next use
+            self.warning("Failed to load the attribute cache: %r", exc)
+            return
+        finally:
+            self._attr_cache_load = None
+
+        self._attr_cache_loaded(values, timestamps)
+
+    def _attr_cache_loaded(
+        self, values: dict[int, Any], timestamps: dict[int, datetime]
+    ) -> None:
+        """Merge attribute values loaded from the database into the cache."""
+        if self._attr_cache_loader is None:
+            return
+
+        self._attr_cache_loader = None
+
+        # Values that were updated or cleared since startup are newer
+        for attrid, value in values.items():
+            if attrid in self._attr_cache or attrid in self._attr_cache_cleared:
+                continue
+
+            self._attr_cache[attrid] = value
+            self._attr_last_updated[attrid] = timestamps[attrid]
+
+        self._attr_cache_cleared.clear()
+
     def _update_attribute(self, attrid: int | t.uint16_t, value: Any) -> None:
         if value is None:
-            if attrid not in self._attr_cache:
+            if self._attr_cache_loader is not None:
+                # The value may only be cached in the database
+                self._attr_cache_cleared.add(attrid)
+            elif attrid not in self._attr_cache:
                 return
 
-            self._attr_cache.pop(attrid)
-            self._attr_last_updated.pop(attrid)
+            self._attr_cache.pop(attrid, None)
+            self._attr_last_updated.pop(attrid, None)
             self.listener_event("attribute_cleared", attrid)
         else:
             now = datetime.now(timezone.utc)
@@ -861,11 +1198,11 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin):
     def get(self, key: int | str, default: Any | None = None) -> Any:
         """Get cached attribute."""
         attr_def = self.find_attribute(key)
-        return self._attr_cache.get(attr_def.id, default)
+        return self._cached_attributes.get(attr_def.id, default)
 
     def __getitem__(self, key: int | str) -> Any:
         """Return cached value of the attr."""
-        return self._attr_cache[self.find_attribute(key).id]
+        return self._cached_attributes[self.find_attribute(key).id]
 
     def __setitem__(self, key: int | str, value: Any) -> None:
         """Set cached value through attribute write."""
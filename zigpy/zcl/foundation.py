@@ -6,6 +6,7 @@ import functools
 import keyword
 import typing
 
+import zigpy.datastructures
 import zigpy.types as t
 
 
@@ -102,12 +103,19 @@ class TypeValue:
         return self.type.to_bytes(1, "little") + self.value.serialize()
 
     @classmethod
-    def deserialize(cls, data: bytes) -> tuple[TypeValue, bytes]:
-        type, data = t.uint8_t.deserialize(data)
+    def deserialize_from(
+        cls, data: bytes | memoryview, offset: int = 0
+    ) -> tuple[TypeValue, int]:
+        type, offset = t.uint8_t.deserialize_from(data, offset)
         python_type = DATA_TYPES[type][1]
-        value, data = python_type.deserialize(data)
+        value, offset = t.deserialize_from(python_type, data, offset)
+
+        return cls(type=type, value=value), offset
 
-        return cls(type=type, value=value), data
+    @classmethod
+    def deserialize(cls, data: bytes) -> tuple[TypeValue, bytes]:
+        instance, offset = cls.deserialize_from(data)
+        return instance, data[offset:]
 
     def __repr__(self) -> str:
         return (
@@ -119,12 +127,14 @@ class TypeValue:
 
 class TypedCollection(TypeValue):
     @classmethod
-    def deserialize(cls, data):
-        type, data = t.uint8_t.deserialize(data)
+    def deserialize_from(cls, data, offset=0):
+        type, offset = t.uint8_t.deserialize_from(data, offset)
         python_type = DATA_TYPES[type][1]
-        values, data = t.LVList[python_type, t.uint16_t].deserialize(data)
+        values, offset = t.LVList[python_type, t.uint16_t].deserialize_from(
+            data, offset
+        )
 
-        return cls(type=type, value=values), data
+        return cls(type=type, value=values), offset
 
 
 class Array(TypedCollection):
@@ -139,7 +149,7 @@ class Set(TypedCollection):
     pass  # ToDo: Make this a real set?
 
 
-class DataTypes(dict):
+class DataTypes(zigpy.datastructures.IndexedDict):
     """DataTypes container."""
 
     def __init__(
@@ -157,13 +167,42 @@ class DataTypes(dict):
         ],
     ) -> None:
         super().__init__(data_types)
+        self.version = 0
+        self._reindex()
+
+    def _reindex(self) -> None:
+        """Rebuild the class index and drop memoized lookups."""
         self._idx_by_class = {
             _type: type_id for type_id, (name, _type, ad) in self.items()
         }
+        self._datatype_id_cache: dict[type, int] = {}
+        self.version += 1
+
+    def _item_added(self, key: int, value: tuple) -> None:
+        self._reindex()
+
+    def _item_removed(self, key: int, value: tuple) -> None:
+        self._reindex()
+
+    def _cleared(self) -> None:
+        self._reindex()
 
     def pytype_to_datatype_id(self, python_type: typing.Any) -> int:
         """Return Zigbee Datatype ID for a give python type."""
+        try:
+            return self._datatype_id_cache[python_type]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable types cannot be memoized
+            return self._lookup_datatype_id(python_type)
+
+        datatype_id = self._lookup_datatype_id(python_type)
+        self._datatype_id_cache[python_type] = datatype_id
 
+        return datatype_id
+
+    def _lookup_datatype_id(self, python_type: typing.Any) -> int:
         # We return the most specific parent class
         for cls in python_type.__mro__:
             if cls in self._idx_by_class:
@@ -549,6 +588,34 @@ class FrameControl(t.Struct, t.uint8_t):
         return bool(self.frame_type == FrameType.GLOBAL_COMMAND)
 
 
+_MANUFACTURER_SPECIFIC_BIT = 0b0000_0100
+
+# Decoded `FrameControl` field values, by frame control byte
+_FRAME_CONTROL_FIELDS: dict[int, dict[str, typing.Any]] = {}
+
+
+def _frame_control_fields(frame_control: int) -> dict[str, typing.Any]:
+    fields = FrameControl.deserialize(bytes([frame_control]))[0].__dict__.copy()
+
+    # The generic header decoder sets this flag from the manufacturer field
+    if fields["is_manufacturer_specific"]:
+        fields["is_manufacturer_specific"] = True
+
+    _FRAME_CONTROL_FIELDS[frame_control] = fields
+
+    return fields
+
+
+def _new_struct(cls: type[t.Struct], fields: dict[str, typing.Any] = None):
+    """Create a struct instance directly from its field values."""
+    instance = super(t.Struct, cls).__new__(cls)
+
+    if fields is not None:
+        instance.__dict__.update(fields)
+
+    return instance
+
+
 class ZCLHeader(t.Struct):
     NO_MANUFACTURER_ID = -1  # type: typing.Literal
 
@@ -593,6 +660,63 @@ class ZCLHeader(t.Struct):
         if name == "manufacturer" and self.frame_control is not None:
             self.frame_control.is_manufacturer_specific = value is not None
 
+    @classmethod
+    def deserialize_from(
+        cls, data: bytes | memoryview, offset: int = 0
+    ) -> tuple[ZCLHeader, int]:
+        """Decode a ZCL header with plain integer operations."""
+        if cls is not ZCLHeader:
+            return super().deserialize_from(data, offset)
+
+        try:
+            frame_control = data[offset]
+
+            if frame_control & _MANUFACTURER_SPECIFIC_BIT:
+                manufacturer = t.uint16_t._from_int_unchecked(
+                    data[offset + 1] | (data[offset + 2] << 8)
+                )
+                offset += 2
+            else:
+                manufacturer = None
+
+            tsn = data[offset + 1]
+            command_id = data[offset + 2]
+        except IndexError:
+            raise ValueError(f"Data is too short to contain a ZCL header: {data!r}")
+
+        fields = _FRAME_CONTROL_FIELDS.get(frame_control)
+
+        if fields is None:
+            fields = _frame_control_fields(frame_control)
+
+        hdr = _new_struct(ZCLHeader)
+        hdr.__dict__.update(
+            frame_control=_new_struct(FrameControl, fields),
+            manufacturer=manufacturer,
+            tsn=t.uint8_t._from_int_unchecked(tsn),
+            command_id=t.uint8_t._from_int_unchecked(command_id),
+        )
+
+        return hdr, offset + 3
+
+    @classmethod
+    def deserialize(cls, data: bytes) -> tuple[ZCLHeader, bytes]:
+        hdr, offset = cls.deserialize_from(data, 0)
+        return hdr, data[offset:]
+
+    def with_direction(self, direction: Direction) -> ZCLHeader:
+        """Return the header with its direction set, copying it only if necessary."""
+        if self.frame_control.direction == direction:
+            return self
+
+        frame_control = _new_struct(FrameControl, self.frame_control.__dict__)
+        frame_control.__dict__["direction"] = direction
+
+        hdr = _new_struct(type(self), self.__dict__)
+        hdr.__dict__["frame_control"] = frame_control
+
+        return hdr
+
     @classmethod
     def general(
         cls,
@@ -712,6 +836,10 @@ class CommandSchema(t.Struct, tuple):
 
     command: ZCLCommandDef = None
 
+    # IDs of the clusters that define this command. Empty for general commands and
+    # schemas shared with clusters without a fixed ID.
+    cluster_ids: typing.FrozenSet[typing.Optional[t.ClusterId]] = frozenset()
+
     def __iter__(self):
         return iter(self.as_tuple())
 
@@ -798,6 +926,28 @@ class ZCLAttributeDef(t.BaseDataclassMixin):
 
         ensure_valid_name(self.name)
 
+        self._compute_datatype_id()
+
+    def _compute_datatype_id(self) -> None:
+        if isinstance(self.type, type):
+            datatype_id = DATA_TYPES.pytype_to_datatype_id(self.type)
+        else:
+            datatype_id = None
+
+        object.__setattr__(self, "_datatype_id", (datatype_id, DATA_TYPES.version))
+
+    @property
+    def datatype_id(self) -> int | None:
+        """Zigbee data type ID of the attribute's type, computed up front."""
+        datatype_id, version = self._datatype_id
+
+        # Only recompute if new data types have been registered since
+        if version != DATA_TYPES.version:
+            self._compute_datatype_id()
+            datatype_id, _ = self._datatype_id
+
+        return datatype_id
+
     def __repr__(self) -> str:
         return (
             f"{self.__class__.__name__}("
@@ -132,23 +132,22 @@ class NodeDescriptor(t.Struct):
         reserved = None
 
         if byte1 is not None:
-            bits, _ = t.Bits.deserialize(bytes([byte1]))
-            logical_type, bits = LogicalType.from_bits(bits)
-            complex_descriptor_available, bits = t.uint1_t.from_bits(bits)
-            user_descriptor_available, bits = t.uint1_t.from_bits(bits)
-            reserved, bits = t.uint3_t.from_bits(bits)
-
-            assert not bits
+            (
+                logical_type,
+                complex_descriptor_available,
+                user_descriptor_available,
+                reserved,
+            ) = t.unpack_bitfields(
+                [LogicalType, t.uint1_t, t.uint1_t, t.uint3_t], bytes([byte1])
+            )
 
         aps_flags = None
         frequency_band = None
 
         if byte2 is not None:
-            bits, _ = t.Bits.deserialize(bytes([byte2]))
-            aps_flags, bits = t.uint3_t.from_bits(bits)
-            frequency_band, bits = cls.FrequencyBand.from_bits(bits)
-
-            assert not bits
+            aps_flags, frequency_band = t.unpack_bitfields(
+                [t.uint3_t, cls.FrequencyBand], bytes([byte2])
+            )
 
         return cls(  # type:ignore[operator]
             logical_type=logical_type,